@@ -0,0 +1,12 @@
+#!/usr/bin/python
+"""
+Benchmark XNB loading
+"""
+
+from __future__ import print_function
+
+from xnb_parse.benchmark import main
+
+
+if __name__ == '__main__':
+    main()
@@ -5,25 +5,10 @@ echo *** Essentials.pak and Other.pak not found in Content
 goto music
 
 :content
-echo Checking for XNA runtime
-call xna_native.bat 2>NUL
-if errorlevel 1 goto no_xna
-
 echo Decompressing Essentials.pak, Other.pak and Updates.pak...
 call fez_decomp.bat Content out
 if errorlevel 1 goto error
-goto convert
-
-:no_xna
-echo Unpacking Essentials.pak, Other.pak and Updates.pak...
-call fez_unpack.bat Content out_c
-if errorlevel 1 goto error
-
-echo Decompressing XNBs...
-call xnb_decomp_net.bat out_c out
-if errorlevel 1 goto error
 
-:convert
 echo Converting XNBs...
 call read_xnb_dir.bat out export
 if errorlevel 1 goto error
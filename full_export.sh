@@ -6,28 +6,10 @@ then
     exit 1
 fi
 
-if ! python xna_native.py 2>/dev/null
-then
-    if ! command -v mono 2>&1 >/dev/null
-    then
-        echo "*** mono required"
-        exit 1
-    fi
-fi
-
 if [ -e "Content/Essentials.pak" -a -e "Content/Other.pak" ]
 then
-    if python xna_native.py 2>/dev/null
-    then
-        echo "Decompressing Essentials.pak, Other.pak and Updates.pak..."
-        python fez_decomp.py Content out || exit 1
-    else
-        echo "Unpacking Essentials.pak, Other.pak and Updates.pak..."
-        python fez_unpack.py Content out_c || exit 1
-
-        echo "Decompressing XNBs..."
-        mono bin/xnbdecomp.exe out_c out || exit 1
-    fi
+    echo "Decompressing Essentials.pak, Other.pak and Updates.pak..."
+    python fez_decomp.py Content out || exit 1
 
     echo "Converting XNBs..."
     python read_xnb_dir.py out export || exit 1
@@ -0,0 +1,90 @@
+"""
+helpers for building XNB files in tests
+"""
+
+from __future__ import print_function
+
+import struct
+
+from xnb_parse.binstream import BinaryStream, BufferSlice, view_bytes
+from xnb_parse.type_reader import generic_reader_name
+from xnb_parse.type_readers.xna_primitive import StringReader
+from xnb_parse.type_readers.xna_system import EnumReader
+
+
+def xnb_content(reader_names, body, shared_count=0):
+    """
+    XNB content with a type reader table of reader_names ahead of body
+    """
+    stream = BinaryStream()
+    stream.write_7bit_encoded_int(len(reader_names))
+    for reader_name in reader_names:
+        stream.write_string(reader_name)
+        stream.write_int32(0)
+    stream.write_7bit_encoded_int(shared_count)
+    stream.write(body)
+    return stream.getvalue()
+
+
+def xnb_file(content, platform=b'w', version=5):
+    """
+    uncompressed XNB file around content
+    """
+    return struct.pack('<3s c B B I', b'XNB', platform, version, 0, len(content) + 10) + content
+
+
+class ContentWriter(object):
+    """
+    XNB content written value by value, with the type reader table built as objects are written
+    """
+
+    def __init__(self):
+        self.reader_names = []
+        self.stream = BinaryStream()
+
+    def obj(self, reader, type_params=None):
+        if reader is None:
+            self.stream.write_7bit_encoded_int(0)
+            return self.stream
+        if reader.is_enum_type:
+            name = generic_reader_name(EnumReader, [reader])
+        elif type_params:
+            name = generic_reader_name(reader, type_params)
+        else:
+            name = reader.reader_name
+        if name not in self.reader_names:
+            self.reader_names.append(name)
+        self.stream.write_7bit_encoded_int(self.reader_names.index(name) + 1)
+        return self.stream
+
+    def string(self, value):
+        self.obj(StringReader).write_string(value)
+
+    def xnb(self, platform=b'w', version=5):
+        return xnb_file(xnb_content(self.reader_names, self.stream.getvalue()), platform=platform, version=version)
+
+
+def dump_value(value, seen=None):
+    """
+    comparable plain values for an asset and everything in it. an object that was already dumped, such as a
+    reference back to its parent, is dumped as the order it was first seen in
+    """
+    if seen is None:
+        seen = {}
+    if isinstance(value, (BufferSlice, memoryview)):
+        return view_bytes(value.data if isinstance(value, BufferSlice) else value)
+    if isinstance(value, dict):
+        return [(dump_value(key, seen), dump_value(item, seen)) for key, item in value.items()]
+    if isinstance(value, (list, tuple)):
+        return [dump_value(item, seen) for item in value]
+    attrs = dict(getattr(value, '__dict__', {}))
+    for cls in type(value).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if hasattr(value, name):
+                attrs[name] = getattr(value, name)
+    if not attrs:
+        return repr(value)
+    if id(value) in seen:
+        return ['seen', seen[id(value)]]
+    seen[id(value)] = len(seen)
+    return [type(value).__name__] + [(name, dump_value(attrs[name], seen)) for name in sorted(attrs)]
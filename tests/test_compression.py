@@ -0,0 +1,114 @@
+"""
+LZX and LZ4 compression round trips
+"""
+
+from __future__ import print_function
+
+import random
+import unittest
+
+from xnb_parse.binstream import BinaryStream
+from xnb_parse.file_formats import lz4, lzx
+from xnb_parse.type_reader import ReaderError
+
+
+def sample_data(size, seed=0):
+    """
+    mix of noise, repeated words, runs of zeros and x86 call opcodes for the LZX E8 translation
+    """
+    rnd = random.Random(seed)
+    words = [bytearray(rnd.randrange(256) for _ in range(rnd.randrange(3, 40))) for _ in range(50)]
+    data = bytearray()
+    while len(data) < size:
+        kind = rnd.randrange(4)
+        if kind == 0:
+            data += bytearray(rnd.randrange(256) for _ in range(rnd.randrange(1, 200)))
+        elif kind == 1:
+            data += rnd.choice(words)
+        elif kind == 2:
+            data += bytearray(rnd.randrange(1, 300))
+        else:
+            data += bytearray([0xe8]) + bytearray(rnd.randrange(256) for _ in range(4))
+    return bytes(data[:size])
+
+
+class TestLzx(unittest.TestCase):
+    sizes = [0, 1, 17, lzx.LZX_FRAME_SIZE - 1, lzx.LZX_FRAME_SIZE, lzx.LZX_FRAME_SIZE + 1,
+             lzx.LZX_FRAME_SIZE * 3 + 123]
+    levels = [0, 1, lzx.LZX_DEFAULT_LEVEL, len(lzx.LZX_LEVELS) - 1]
+
+    def round_trip(self, data, level):
+        compressed = b''.join(lzx.compress_frames(data, level))
+        self.assertEqual(bytes(lzx.decompress(compressed, len(data))), data)
+        frames = lzx.iter_decompress(BinaryStream(data=compressed), len(compressed), len(data))
+        self.assertEqual(b''.join(bytes(frame) for frame in frames), data)
+        return compressed
+
+    def test_sizes(self):
+        for size in self.sizes:
+            data = sample_data(size, size)
+            for level in self.levels:
+                self.round_trip(data, level)
+
+    def test_levels(self):
+        data = sample_data(lzx.LZX_FRAME_SIZE + 1000)
+        for level in range(len(lzx.LZX_LEVELS)):
+            compressed = self.round_trip(data, level)
+            if level:
+                self.assertLess(len(compressed), len(data))
+
+    def test_repeated(self):
+        for data in [b'\x00' * 100000, b'abc' * 30000]:
+            self.assertLess(len(self.round_trip(data, lzx.LZX_DEFAULT_LEVEL)), len(data) // 50)
+
+    def test_truncated(self):
+        data = sample_data(5000)
+        compressed = b''.join(lzx.compress_frames(data))
+        self.assertRaises(ReaderError, lzx.decompress, compressed[:-10], len(data))
+        self.assertRaises(ReaderError, lzx.decompress, compressed, len(data) + 1)
+
+
+class TestLz4(unittest.TestCase):
+    sizes = [0, 1, 12, 13, 100, lz4.LZ4_FRAME_SIZE + 1, lz4.LZ4_MAX_OFFSET * 3]
+    levels = [0, 1, lz4.LZ4_DEFAULT_LEVEL, len(lz4.LZ4_LEVELS) - 1]
+
+    def round_trip(self, data, level):
+        compressed = b''.join(lz4.compress_frames(data, level))
+        self.assertEqual(bytes(lz4.decompress(compressed, len(data))), data)
+        frames = lz4.iter_decompress(BinaryStream(data=compressed), len(compressed), len(data), read_size=100)
+        self.assertEqual(b''.join(bytes(frame) for frame in frames), data)
+        return compressed
+
+    def test_sizes(self):
+        for size in self.sizes:
+            data = sample_data(size, size)
+            for level in self.levels:
+                self.round_trip(data, level)
+
+    def test_levels(self):
+        data = sample_data(lz4.LZ4_FRAME_SIZE + 1000)
+        for level in range(len(lz4.LZ4_LEVELS)):
+            compressed = self.round_trip(data, level)
+            if level:
+                self.assertLess(len(compressed), len(data))
+
+    def test_far_matches(self):
+        # repeats further back than a match can reach
+        block = sample_data(lz4.LZ4_MAX_OFFSET + 100, 1)
+        self.round_trip(block * 3, lz4.LZ4_DEFAULT_LEVEL)
+
+    def test_repeated(self):
+        for data in [b'\x00' * 100000, b'abc' * 30000]:
+            self.assertLess(len(self.round_trip(data, lz4.LZ4_DEFAULT_LEVEL)), len(data) // 50)
+
+    def test_bad_level(self):
+        self.assertRaises(ReaderError, lambda: list(lz4.compress_frames(b'data', len(lz4.LZ4_LEVELS))))
+
+    def test_truncated(self):
+        data = sample_data(5000)
+        compressed = b''.join(lz4.compress_frames(data))
+        self.assertRaises(ReaderError, lz4.decompress, compressed[:-10], len(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
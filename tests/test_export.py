@@ -0,0 +1,161 @@
+"""
+export manifest and journal, and incremental and resumed export runs
+"""
+
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from xnb_parse.export_journal import ExportJournal, JOURNAL_FILENAME
+from xnb_parse.export_manifest import ExportManifest
+from xnb_parse.export_pipeline import ExportPipeline
+from xnb_parse.type_readers.xna_media import SongReader
+from xnb_parse.xna_content_manager import ContentManager, STAGING_PREFIX
+
+from tests.helpers import ContentWriter
+
+
+def song_xnb(filename, duration):
+    out = ContentWriter()
+    out.obj(SongReader).write_string(filename)
+    out.stream.write_int32(duration)
+    return out.xnb()
+
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.temp_dir, 'content')
+        self.export_dir = os.path.join(self.temp_dir, 'export')
+        os.makedirs(self.content_dir)
+        os.makedirs(self.export_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_asset(self, asset_name, duration):
+        filename = os.path.join(self.content_dir, asset_name + '.xnb')
+        with open(filename, 'wb') as asset_file:
+            asset_file.write(song_xnb(asset_name, duration))
+        # the stamp has to change even when the file is rewritten within the mtime resolution
+        os.utime(filename, (duration, duration))
+
+    def write_output(self, output):
+        with open(os.path.join(self.export_dir, output), 'w') as output_file:
+            output_file.write(output)
+
+    def exported(self):
+        return sorted(name for name in os.listdir(self.export_dir) if not name.startswith('.'))
+
+
+class TestExportJournal(ExportTest):
+    def test_resume(self):
+        filename = os.path.join(self.export_dir, JOURNAL_FILENAME)
+        journal = ExportJournal(filename, self.export_dir)
+        for asset_name in ['a', 'b', 'c']:
+            self.write_output(asset_name + '.xml')
+            journal.record(asset_name, [asset_name + '.xml'], stamp=[1, 2])
+        journal.close()
+        # a killed run can leave half a line behind
+        with open(filename, 'a') as journal_file:
+            journal_file.write('{"asset":"d","out')
+        os.remove(os.path.join(self.export_dir, 'b.xml'))
+        journal = ExportJournal(filename, self.export_dir, resume=True)
+        self.assertEqual([journal.is_done(asset_name) for asset_name in ['a', 'b', 'c', 'd']],
+                         [True, False, True, False])
+        self.assertEqual(journal.entries['a']['stamp'], [1, 2])
+        journal.clear()
+        self.assertFalse(os.path.exists(filename))
+        self.assertFalse(ExportJournal(filename, self.export_dir, resume=True).is_done('a'))
+
+    def test_without_resume(self):
+        filename = os.path.join(self.export_dir, JOURNAL_FILENAME)
+        journal = ExportJournal(filename, self.export_dir)
+        self.write_output('a.xml')
+        journal.record('a', ['a.xml'])
+        journal.close()
+        self.assertFalse(ExportJournal(filename, self.export_dir).is_done('a'))
+        self.assertFalse(os.path.exists(filename))
+
+
+class TestExportManifest(ExportTest):
+    def test_unchanged(self):
+        manifest = ExportManifest(self.export_dir)
+        self.write_output('a.xml')
+        data_hash = manifest.data_hash(b'data')
+        manifest.update('a', [1, 2], data_hash, ['a.xml'])
+        manifest.save()
+        manifest = ExportManifest(self.export_dir)
+        self.assertTrue(manifest.stamp_unchanged('a', [1, 2]))
+        self.assertFalse(manifest.stamp_unchanged('a', [1, 3]))
+        self.assertFalse(manifest.hash_unchanged('a', [1, 3], manifest.data_hash(b'other')))
+        # touched but the same data, the new stamp is kept
+        self.assertTrue(manifest.hash_unchanged('a', [1, 3], data_hash))
+        self.assertTrue(manifest.stamp_unchanged('a', [1, 3]))
+        os.remove(os.path.join(self.export_dir, 'a.xml'))
+        self.assertFalse(manifest.stamp_unchanged('a', [1, 3]))
+
+    def test_outputs_removed(self):
+        manifest = ExportManifest(self.export_dir)
+        for output in ['a.xml', 'a.png', 'b.xml', 'c.xml']:
+            self.write_output(output)
+        manifest.update('a', [1], 'hash', ['a.xml', 'a.png'])
+        manifest.update('b', [1], 'hash', ['b.xml'])
+        manifest.update('c', [1], 'hash', ['c.xml'])
+        # written again without one of its outputs
+        manifest.update('a', [2], 'hash', ['a.xml'])
+        self.assertEqual(self.exported(), ['a.xml', 'b.xml', 'c.xml'])
+        manifest.discard('b')
+        self.assertEqual(self.exported(), ['a.xml', 'c.xml'])
+        self.assertEqual(manifest.remove_stale(['a']), ['c'])
+        self.assertEqual(self.exported(), ['a.xml'])
+
+
+class TestExportPipeline(ExportTest):
+    def run_export(self, journal=None):
+        content_manager = ContentManager(self.content_dir)
+        manifest = ExportManifest(self.export_dir)
+        pipeline = ExportPipeline(content_manager, self.export_dir, workers=1, manifest=manifest, journal=journal)
+        results = list(pipeline.run(sorted(content_manager.assets)))
+        self.assertEqual([error for _, error in results], [None] * len(results))
+        return sorted(asset_name for asset_name, _ in results)
+
+    def test_incremental(self):
+        for index, asset_name in enumerate(['a', 'b', 'c']):
+            self.write_asset(asset_name, 1000 + index)
+        self.assertEqual(self.run_export(), ['a', 'b', 'c'])
+        self.assertEqual(self.exported(), ['a.xml', 'b.xml', 'c.xml'])
+        self.assertEqual(self.run_export(), [])
+        self.write_asset('b', 2000)
+        os.remove(os.path.join(self.content_dir, 'c.xnb'))
+        self.assertEqual(self.run_export(), ['b'])
+        self.assertEqual(self.exported(), ['a.xml', 'b.xml'])
+        with open(os.path.join(self.export_dir, 'b.xml')) as output_file:
+            self.assertIn('2000', output_file.read())
+
+    def test_resume(self):
+        for index, asset_name in enumerate(['a', 'b', 'c']):
+            self.write_asset(asset_name, 1000 + index)
+        # a run killed after finishing a, before the manifest was saved, and the staging directory it left
+        content_manager = ContentManager(self.content_dir)
+        journal_filename = os.path.join(self.export_dir, JOURNAL_FILENAME)
+        journal = ExportJournal(journal_filename, self.export_dir)
+        stamp = content_manager.asset_stamp('a')
+        outputs = ContentManager.export(content_manager.load('a'), 'a', self.export_dir)
+        journal.record('a', outputs, stamp=stamp, hash=ExportManifest.data_hash(content_manager.asset_data('a')))
+        journal.close()
+        os.makedirs(os.path.join(self.export_dir, STAGING_PREFIX + 'killed', 'b'))
+        journal = ExportJournal(journal_filename, self.export_dir, resume=True)
+        self.assertEqual(self.run_export(journal), ['b', 'c'])
+        self.assertEqual(os.listdir(self.export_dir).count(STAGING_PREFIX + 'killed'), 0)
+        self.assertFalse(os.path.exists(journal_filename))
+        # the journal was merged into the manifest
+        self.assertEqual(self.run_export(), [])
+        self.assertEqual(self.exported(), ['a.xml', 'b.xml', 'c.xml'])
+
+
+if __name__ == '__main__':
+    unittest.main()
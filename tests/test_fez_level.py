@@ -0,0 +1,161 @@
+"""
+FEZ level readers give the same values read by hand, compiled from fields and skipped over
+"""
+
+from __future__ import print_function
+
+import random
+import struct
+import unittest
+
+from xnb_parse.binstream import BinaryStream
+from xnb_parse.file_formats.xml_utils import ET
+from xnb_parse.type_reader import generic_reader_name
+from xnb_parse.type_readers.fez import fez_level
+from xnb_parse.type_readers.fez.fez_graphics import ShaderInstancedIndexedPrimitivesReader
+from xnb_parse.type_readers.xna_graphics import Texture2DReader
+from xnb_parse.type_readers.xna_primitive import StringReader, Int32Reader, BooleanReader
+from xnb_parse.type_readers.xna_system import ListReader, ArrayReader, DictionaryReader, EnumReader, TimeSpanReader
+from xnb_parse.type_reader import FIELD_FORMATS
+from xnb_parse.xnb_reader import XNBReader
+
+from tests.helpers import dump_value, xnb_content, xnb_file
+
+
+# left null, their content isn't part of the level layout
+_NULL_READERS = (ShaderInstancedIndexedPrimitivesReader, Texture2DReader)
+_ROOTS = [fez_level.LevelReader, fez_level.TrileSetReader, fez_level.SkyReader, fez_level.MapTreeReader]
+
+
+class LevelBuilder(object):
+    """
+    random content for a FEZ reader, laid out as its fields describe
+    """
+
+    def __init__(self, seed):
+        self.rnd = random.Random(seed)
+        self.reader_names = []
+        self.stream = BinaryStream()
+        self.depth = 0
+
+    def build(self, reader):
+        self.stream.write_7bit_encoded_int(self.type_id(reader))
+        self.content(reader)
+        return xnb_file(xnb_content(self.reader_names, self.stream.getvalue()))
+
+    def type_id(self, reader, type_params=None):
+        if reader.is_enum_type:
+            name = generic_reader_name(EnumReader, [reader])
+        elif type_params:
+            name = generic_reader_name(reader, type_params)
+        else:
+            name = reader.reader_name
+        if name not in self.reader_names:
+            self.reader_names.append(name)
+        return self.reader_names.index(name) + 1
+
+    def fixed(self, kind):
+        fmt = FIELD_FORMATS[kind]
+        count = struct.calcsize('<' + fmt) // struct.calcsize('<' + fmt[-1])
+        if fmt[-1] == 'f':
+            values = [self.rnd.uniform(-100, 100) for _ in range(count)]
+        elif fmt[-1] == '?':
+            values = [self.rnd.choice([False, True])]
+        elif fmt[-1] == 'B':
+            values = [self.rnd.randrange(256) for _ in range(count)]
+        else:
+            values = [self.rnd.randrange(-1000, 1000) for _ in range(count)]
+        self.stream.write(struct.pack('<' + fmt, *values))
+
+    def string(self):
+        self.stream.write_string(u''.join(self.rnd.choice(u'abcxyz_') for _ in range(self.rnd.randrange(12))))
+
+    def object(self, reader, type_params=None):
+        if reader in _NULL_READERS or self.rnd.random() < 0.2 or self.depth > 5:
+            self.stream.write_7bit_encoded_int(0)
+            return
+        self.stream.write_7bit_encoded_int(self.type_id(reader, type_params))
+        self.content(reader, type_params)
+
+    def optional(self, reader):
+        # a boolean and the object if it's set
+        present = self.rnd.random() < 0.5
+        self.stream.write_boolean(present)
+        if present:
+            self.object(reader)
+
+    def element(self, reader):
+        if reader.is_value_type:
+            self.content(reader)
+        else:
+            self.object(reader)
+
+    def content(self, reader, type_params=None):
+        self.depth += 1
+        stream = self.stream
+        if reader.is_enum_type:
+            stream.write_int32(0)
+        elif reader is StringReader:
+            self.string()
+        elif reader is Int32Reader:
+            stream.write_int32(self.rnd.randrange(100))
+        elif reader is BooleanReader:
+            stream.write_boolean(True)
+        elif reader is TimeSpanReader:
+            stream.write_int64(self.rnd.randrange(10 ** 9))
+        elif reader is fez_level.TrileEmplacementReader:
+            stream.pack('3i', *[self.rnd.randrange(50) for _ in range(3)])
+        elif reader in (ListReader, ArrayReader, DictionaryReader):
+            count = self.rnd.randrange(4)
+            stream.write_int32(count)
+            for _ in range(count):
+                for element_reader in type_params:
+                    self.element(element_reader)
+        elif reader is fez_level.TrileInstanceReader:
+            stream.pack('3f i B', 1.0, 2.0, 3.0, self.rnd.randrange(100), self.rnd.randrange(4))
+            self.optional(fez_level.InstanceActorSettingsReader)
+            self.object(ListReader, [fez_level.TrileInstanceReader])
+        elif reader is fez_level.PathSegmentReader:
+            self.fixed('vector3')
+            for _ in range(3):
+                self.object(TimeSpanReader)
+            for kind in ['single', 'single', 'single', 'quaternion']:
+                self.fixed(kind)
+            self.optional(fez_level.CameraNodeDataReader)
+        else:
+            for field in reader().fields():
+                kind = field[1]
+                if kind in FIELD_FORMATS:
+                    self.fixed(kind)
+                elif kind == 'string':
+                    self.string()
+                else:
+                    self.object(kind, field[2] if len(field) > 2 else None)
+        self.depth -= 1
+
+
+class FezLevelTest(unittest.TestCase):
+    def test_compiled_matches_read(self):
+        for reader in _ROOTS:
+            for seed in range(20):
+                data = LevelBuilder(seed).build(reader)
+                asset = XNBReader.load(data=data).content
+                compiled_asset = XNBReader.load(data=data, compiled=True).content
+                self.assertEqual(dump_value(compiled_asset), dump_value(asset),
+                                 '{} seed {}'.format(reader.__name__, seed))
+                self.assertEqual(ET.tostring(compiled_asset.xml()), ET.tostring(asset.xml()))
+
+    def test_skipped_fields(self):
+        # projecting only the last field skips every field before it
+        for reader in _ROOTS:
+            names = [field[0] for field in reader().fields()]
+            for seed in range(20):
+                data = LevelBuilder(seed).build(reader)
+                values = XNBReader.load(data=data, fields=names).content
+                projected = XNBReader.load(data=data, fields=names[-1:]).content
+                self.assertEqual(dump_value(projected), dump_value({names[-1]: values[names[-1]]}),
+                                 '{} seed {}'.format(reader.__name__, seed))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,281 @@
+"""
+type readers skip values without reading them, and end up where reading them would
+"""
+
+from __future__ import print_function
+
+import unittest
+
+from xnb_parse.binstream import BinaryStream
+from xnb_parse.type_reader import BaseTypeReader, TypeReaderPlugin
+from xnb_parse.type_reader_manager import TypeReaderManager
+from xnb_parse.type_readers.fez.fez_basic import NpcActionReader, ActorTypeReader
+from xnb_parse.type_readers.fez.fez_graphics import (ArtObjectReader, ShaderInstancedIndexedPrimitivesReader,
+                                                     VertexPositionNormalTextureInstanceReader, NpcMetadataReader,
+                                                     AnimatedTextureReader, FrameReader)
+from xnb_parse.type_readers.fez.fez_music import (TrackedSongReader, LoopReader, ShardNotesReader,
+                                                  AssembleChordsReader)
+from xnb_parse.type_readers.mercury.emitters import CircleEmitterReader
+from xnb_parse.type_readers.mercury.modifiers import (ModifierCollectionReader, OpacityModifierReader,
+                                                      HueShiftModifierReader)
+from xnb_parse.type_readers.mercury.particle import ParticleEffectReader
+from xnb_parse.type_readers.xTile.xTile_graphics import XtileMapReader
+from xnb_parse.type_readers.xna_graphics import (Texture2DReader, SpriteFontReader, BasicEffectReader,
+                                                 EffectMaterialReader, ModelReader, PrimitiveTypeReader)
+from xnb_parse.type_readers.xna_math import MatrixReader, RectangleReader, Vector3Reader
+from xnb_parse.type_readers.xna_media import SongReader, VideoReader
+from xnb_parse.type_readers.xna_primitive import (CharReader, StringReader, Int32Reader, SingleReader, UInt16Reader,
+                                                  ObjectReader)
+from xnb_parse.type_readers.xna_system import ListReader, ArrayReader, DictionaryReader, TimeSpanReader
+from xnb_parse.xnb_reader import XNBReader
+
+from tests.helpers import ContentWriter
+
+
+def sprite_font(out):
+    out.obj(SpriteFontReader)
+    out.obj(Texture2DReader).pack('4i', 0, 2, 2, 1)
+    out.stream.write_int32(16)
+    out.stream.write(b'\xff' * 16)
+    for _ in range(2):
+        out.obj(ListReader, [RectangleReader]).write_int32(3)
+        out.stream.pack('12i', *range(12))
+    out.obj(ListReader, [CharReader]).write_int32(3)
+    for char in [u'a', u'\xe9', u'\u20ac']:
+        out.stream.write_char(char)
+    out.stream.pack('i f', 2, 1.5)
+    out.obj(ListReader, [Vector3Reader]).write_int32(3)
+    out.stream.pack('9f', *range(9))
+    out.stream.write_boolean(True)
+    out.stream.write_char(u'\u20ac')
+
+
+def basic_effect(out):
+    out.obj(BasicEffectReader).write_string('textures/stone')
+    out.stream.pack('9f f f ?', *(list(range(11)) + [True]))
+
+
+def effect_material(out):
+    out.obj(EffectMaterialReader).write_string('effects/glow')
+    out.obj(DictionaryReader, [StringReader, ObjectReader]).write_int32(2)
+    out.string('Power')
+    out.obj(SingleReader).write_single(2.0)
+    out.string('Count')
+    out.obj(Int32Reader).write_int32(3)
+
+
+def song(out):
+    out.obj(SongReader).write_string('music/title.wma')
+    out.stream.write_int32(180000)
+
+
+def video(out):
+    out.obj(VideoReader)
+    out.string('video/intro.wmv')
+    for value in [60000, 1280, 720]:
+        out.obj(Int32Reader).write_int32(value)
+    out.obj(SingleReader).write_single(30.0)
+    out.obj(Int32Reader).write_int32(1)
+
+
+def tracked_song(out):
+    out.obj(TrackedSongReader)
+    out.obj(ListReader, [LoopReader]).write_int32(2)
+    for name in ['bass', 'lead']:
+        out.obj(LoopReader).pack('3i', 8, 1, 2)
+        out.stream.write_string(name)
+        out.stream.pack('3i 7?', 0, 4, 0, True, False, True, False, True, False, True)
+    out.stream.write_string('Song')
+    out.stream.pack('2i', 120, 4)
+    out.obj(ArrayReader, [ShardNotesReader]).write_int32(2)
+    out.stream.pack('2i', 0, 1)
+    out.obj(AssembleChordsReader).write_int32(0)
+    out.stream.write_boolean(False)
+    out.obj(ArrayReader, [Int32Reader]).write_int32(2)
+    out.stream.pack('2i', 1, 0)
+
+
+def npc_metadata(out):
+    out.obj(NpcMetadataReader).pack('f ?', 1.5, True)
+    out.string('npc/owl')
+    out.obj(ListReader, [NpcActionReader]).write_int32(2)
+    out.stream.pack('2i', 0, 1)
+
+
+def geometry(out):
+    out.obj(ShaderInstancedIndexedPrimitivesReader, [VertexPositionNormalTextureInstanceReader, MatrixReader])
+    out.obj(PrimitiveTypeReader).write_int32(0)
+    out.obj(ArrayReader, [VertexPositionNormalTextureInstanceReader]).write_int32(2)
+    out.stream.pack('3f B 2f 3f B 2f', *range(12))
+    out.obj(ArrayReader, [UInt16Reader]).write_int32(3)
+    out.stream.pack('3H', 0, 1, 1)
+
+
+def art_object_pc(out):
+    out.obj(ArtObjectReader).write_string('bench')
+    out.obj(None)
+    out.stream.pack('3f', 1.0, 2.0, 1.0)
+    geometry(out)
+    out.obj(ActorTypeReader).write_int32(0)
+    out.stream.write_boolean(True)
+
+
+def art_object(out):
+    out.obj(ArtObjectReader).write_string('bench')
+    out.stream.write_string('art objects/bench')
+    out.stream.pack('3f', 1.0, 2.0, 1.0)
+    geometry(out)
+    out.obj(ActorTypeReader).write_int32(0)
+    out.stream.write_boolean(False)
+    out.obj(None)
+
+
+def animated_texture_pc(out):
+    out.obj(AnimatedTextureReader).pack('4i', 16, 16, 14, 14)
+    out.stream.write_uint32(8)
+    out.stream.write(b'\x01' * 8)
+    out.obj(ListReader, [FrameReader]).write_int32(2)
+    for index in range(2):
+        out.obj(FrameReader)
+        out.obj(TimeSpanReader).write_int64(1000000)
+        out.obj(RectangleReader).pack('4i', index * 16, 0, 16, 16)
+
+
+def animated_texture(out):
+    out.obj(AnimatedTextureReader).pack('4i', 16, 16, 14, 14)
+    out.obj(ListReader, [FrameReader]).write_int32(2)
+    for _ in range(2):
+        out.obj(FrameReader)
+        out.obj(TimeSpanReader).write_int64(1000000)
+        out.stream.write_7bit_encoded_int(300)
+        out.stream.write_uint32(3)
+        out.stream.write(b'\x02' * 12)
+
+
+def model(bone_count):
+    def write(out):
+        bone_ref = 'B' if bone_count < 255 else 'I'
+        out.obj(ModelReader).write_uint32(bone_count)
+        for index in range(bone_count):
+            out.string('bone{}'.format(index))
+            out.stream.pack('16f', *range(16))
+        # every other bone is a child of the first
+        for index in range(bone_count):
+            children = list(range(2, bone_count + 1)) if index == 0 else []
+            out.stream.pack(bone_ref, 1 if index else 0)
+            out.stream.write_uint32(len(children))
+            for child in children:
+                out.stream.pack(bone_ref, child)
+        out.stream.write_uint32(1)
+        out.string('mesh')
+        out.stream.pack(bone_ref, 1)
+        out.stream.pack('3f f', 0.0, 0.0, 0.0, 1.0)
+        out.obj(None)
+        out.stream.write_uint32(2)
+        for _ in range(2):
+            out.stream.pack('4i', 0, 3, 0, 1)
+            out.obj(Int32Reader).write_int32(7)
+            for _ in range(3):
+                out.stream.write_7bit_encoded_int(0)
+        out.stream.pack(bone_ref, 1)
+        out.string('tag')
+    return write
+
+
+def particle_effect(out):
+    out.obj(ParticleEffectReader).write_int32(1)
+    out.obj(CircleEmitterReader)
+    out.string('sparks')
+    out.stream.pack('i f i ?', 100, 1.0, 5, True)
+    out.stream.pack('2f 6f 2f 2f 2f 2f', *range(16))
+    out.string('particles/spark')
+    out.obj(ModifierCollectionReader).write_int32(2)
+    out.obj(OpacityModifierReader).pack('2f', 1.0, 0.0)
+    out.obj(HueShiftModifierReader).write_single(0.5)
+    out.stream.pack('i 2f f', 0, 0.0, 0.0, 0.1)
+    out.stream.pack('f ? ?', 10.0, True, False)
+    for value in ['Sparks', 'someone', 'a shower of sparks']:
+        out.string(value)
+
+
+def xtile_map(out):
+    data = BinaryStream()
+    data.write(b'tBIN10')
+    for value in [b'Town', b'']:
+        data.write_int32(len(value))
+        data.write(value)
+    data.pack('3i', 0, 0, 0)
+    out.obj(XtileMapReader).write_int32(len(data.getvalue()))
+    out.stream.write(data.getvalue())
+
+
+SAMPLES = [
+    ('SpriteFont', sprite_font, b'w'),
+    ('BasicEffect', basic_effect, b'w'),
+    ('EffectMaterial', effect_material, b'w'),
+    ('Song', song, b'w'),
+    ('Video', video, b'w'),
+    ('TrackedSong', tracked_song, b'w'),
+    ('NpcMetadata', npc_metadata, b'w'),
+    ('ArtObject PC', art_object_pc, b'w'),
+    ('ArtObject', art_object, b'x'),
+    ('AnimatedTexture PC', animated_texture_pc, b'w'),
+    ('AnimatedTexture', animated_texture, b'x'),
+    ('Model', model(3), b'w'),
+    ('Model wide bone ids', model(300), b'w'),
+    ('ParticleEffect', particle_effect, b'w'),
+    ('xTile Map', xtile_map, b'w'),
+]
+
+
+def _function(method):
+    # unbound methods on Python 2
+    return getattr(method, '__func__', method)
+
+
+def read_and_skip(data):
+    """
+    position after reading the asset and after skipping it
+    """
+    xnb = XNBReader.load(data, parse=False)
+    plan = xnb._read_parse_plan()
+    try:
+        xnb.read_7bit_encoded_int()
+        start = xnb.tell()
+        xnb.read_object()
+        read_end = xnb.tell()
+        xnb.seek(start)
+        xnb.skip_object()
+        return read_end, xnb.tell(), len(xnb.read())
+    finally:
+        xnb.release_parse_plan(plan)
+
+
+class TestSkip(unittest.TestCase):
+    def test_skip_ends_where_read_ends(self):
+        for name, write, platform in SAMPLES:
+            out = ContentWriter()
+            write(out)
+            read_end, skip_end, remaining = read_and_skip(out.xnb(platform))
+            self.assertEqual(read_end, skip_end, name)
+            self.assertEqual(remaining, 0, name)
+
+    def test_readers_skip_without_reading(self):
+        TypeReaderManager().import_all_readers()
+        readers = set()
+        pending = [TypeReaderPlugin]
+        while pending:
+            for class_ in pending.pop().__subclasses__():
+                if class_ not in readers:
+                    readers.add(class_)
+                    pending.append(class_)
+        # BaseTypeReader.skip only falls back to read for readers that describe neither their layout nor a skip
+        reading = sorted(class_.__name__ for class_ in readers
+                         if _function(class_.skip) is _function(BaseTypeReader.skip)
+                         and _function(class_.fields) is _function(BaseTypeReader.fields)
+                         and class_.fixed_size is None and class_.array_fmt is None)
+        self.assertEqual(reading, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
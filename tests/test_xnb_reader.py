@@ -0,0 +1,210 @@
+"""
+BinaryStream reads, XNB save and load, and the values readers give for hand built content
+"""
+
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from xnb_parse.binstream import BinaryStream, WindowedBinaryStream, BufferSlice, map_file, view_bytes
+from xnb_parse.type_readers.xna_graphics import Texture2DReader, IndexBufferReader, VertexBufferReader
+from xnb_parse.type_readers.xna_primitive import StringReader, Int32Reader
+from xnb_parse.type_readers.xna_system import ListReader, DictionaryReader
+from xnb_parse.xna_types.xna_graphics import get_surface_format, VertexElementFormat, VertexElementUsage
+from xnb_parse.xna_types.xna_media import VideoSoundtrackType
+from xnb_parse.xnb_reader import XNBReader, COMPRESSION_LZX, COMPRESSION_LZ4, VERSION_31, VERSION_40
+
+from tests.helpers import ContentWriter, dump_value
+from tests.test_skip import SAMPLES, sprite_font, song, video
+
+
+class TestBinaryStream(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_values(self, stream):
+        for value in [0, 1, 127, 128, 16383, 16384, 2 ** 21, 2 ** 31 - 1]:
+            stream.write_7bit_encoded_int(value)
+        stream.write_string(u'caf\xe9 \u20ac')
+        for char in [u'a', u'\xe9', u'\u20ac', u'\U0001f600']:
+            stream.write_char(char)
+        stream.pack('i I h q f d ?', -5, 5, -2, 2 ** 40, 1.5, -0.25, True)
+
+    def check_values(self, stream):
+        self.assertEqual([stream.read_7bit_encoded_int() for _ in range(8)],
+                         [0, 1, 127, 128, 16383, 16384, 2 ** 21, 2 ** 31 - 1])
+        self.assertEqual(stream.read_string(), u'caf\xe9 \u20ac')
+        self.assertEqual([stream.read_char() for _ in range(3)], [u'a', u'\xe9', u'\u20ac'])
+        stream.skip_char()
+        self.assertEqual(stream.unpack('i I h q f d ?'), (-5, 5, -2, 2 ** 40, 1.5, -0.25, True))
+
+    def test_round_trip(self):
+        for big_endian in [False, True]:
+            out = BinaryStream(big_endian=big_endian)
+            self.write_values(out)
+            self.check_values(BinaryStream(data=out.getvalue(), big_endian=big_endian))
+            self.check_values(BinaryStream(data=bytearray(out.getvalue()), big_endian=big_endian))
+            self.check_values(BinaryStream(data=memoryview(out.getvalue()), big_endian=big_endian))
+
+    def test_filename(self):
+        out = BinaryStream()
+        self.write_values(out)
+        filename = os.path.join(self.temp_dir, 'values')
+        with open(filename, 'wb') as out_file:
+            out_file.write(out.getvalue())
+        self.check_values(BinaryStream(filename=filename))
+        self.check_values(BinaryStream(data=map_file(filename)))
+        # the file is only mapped or read, it can be replaced while the stream is still in use
+        stream = BinaryStream(filename=filename)
+        os.remove(filename)
+        self.check_values(stream)
+        empty_filename = os.path.join(self.temp_dir, 'empty')
+        open(empty_filename, 'wb').close()
+        self.assertEqual(view_bytes(map_file(empty_filename)), b'')
+
+    def test_windowed(self):
+        data = bytes(bytearray(range(256)) * 40)
+        filename = os.path.join(self.temp_dir, 'windowed')
+        with open(filename, 'wb') as out_file:
+            out_file.write(data)
+        expected = BinaryStream(data=data)
+        with WindowedBinaryStream(filename=filename, read_ahead=64) as stream:
+            self.assertEqual(stream.length(), len(data))
+            # reads that cross the window, bypass it and move back before it
+            for count in [3, 61, 64, 65, 200, 1000, 7]:
+                self.assertEqual(stream.peek(4), expected.peek(4))
+                self.assertEqual(view_bytes(stream.read(count)), view_bytes(expected.read(count)))
+                self.assertEqual(stream.read_int32(), expected.read_int32())
+                self.assertEqual(stream.tell(), expected.tell())
+            stream.seek(10)
+            expected.seek(10)
+            stream.skip(500)
+            expected.skip(500)
+            self.assertEqual(view_bytes(stream.read_slice(100).data), view_bytes(expected.read_slice(100).data))
+            self.assertEqual(stream.read_uint32(), expected.read_uint32())
+
+    def test_read_slice(self):
+        stream = BinaryStream(data=b'0123456789')
+        stream.skip(2)
+        data_slice = stream.read_slice(5)
+        self.assertIsInstance(data_slice, BufferSlice)
+        self.assertEqual(len(data_slice), 5)
+        self.assertIsNotNone(data_slice.source)
+        self.assertEqual(data_slice.data, b'23456')
+        # copied out once used, the slice no longer keeps the buffer alive
+        self.assertIsNone(data_slice.source)
+        self.assertEqual(stream.read(), b'789')
+
+
+class TestXNB(unittest.TestCase):
+    def test_save_load(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            for platform, write in [(b'w', sprite_font), (b'x', video)]:
+                out = ContentWriter()
+                write(out)
+                xnb = XNBReader.load(data=out.xnb(platform))
+                for compress in [False, COMPRESSION_LZX, COMPRESSION_LZ4]:
+                    saved = XNBReader.load(data=xnb.save(compress=compress))
+                    self.assertEqual(saved.file_platform, platform)
+                    self.assertEqual(saved.compressed, compress)
+                    self.assertEqual(view_bytes(saved.getvalue()), view_bytes(xnb.getvalue()))
+                    self.assertEqual(dump_value(saved.content), dump_value(xnb.content))
+                    filename = os.path.join(temp_dir, 'saved', str(compress))
+                    xnb.save(filename=filename, compress=compress)
+                    loaded = XNBReader.load(filename=filename + '.xnb')
+                    self.assertEqual(dump_value(loaded.content), dump_value(xnb.content))
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_compiled_matches_read(self):
+        for name, write, platform in SAMPLES:
+            out = ContentWriter()
+            write(out)
+            data = out.xnb(platform)
+            self.assertEqual(dump_value(XNBReader.load(data=data, compiled=True).content),
+                             dump_value(XNBReader.load(data=data).content), name)
+
+    def test_media(self):
+        out = ContentWriter()
+        song(out)
+        asset = XNBReader.load(data=out.xnb()).content
+        self.assertEqual((asset.filename, asset.duration), ('music/title.wma', 180000))
+        out = ContentWriter()
+        video(out)
+        asset = XNBReader.load(data=out.xnb()).content
+        self.assertEqual((asset.filename, asset.duration, asset.width, asset.height, asset.fps),
+                         ('video/intro.wmv', 60000, 1280, 720, 30.0))
+        self.assertEqual(repr(asset.video_soundtrack_type), repr(VideoSoundtrackType(1)))
+
+    def test_sprite_font(self):
+        out = ContentWriter()
+        sprite_font(out)
+        asset = XNBReader.load(data=out.xnb()).content
+        self.assertEqual(repr(asset.texture.surface_format), repr(get_surface_format(VERSION_40, 0)))
+        self.assertEqual((asset.texture.width, asset.texture.height), (2, 2))
+        self.assertEqual(asset.texture.mip_levels, [b'\xff' * 16])
+        self.assertEqual([tuple(glyph) for glyph in asset.glyphs], [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9, 10, 11)])
+        self.assertEqual(list(asset.char_map), [u'a', u'\xe9', u'\u20ac'])
+        self.assertEqual((asset.v_space, asset.h_space, asset.default_char), (2, 1.5, u'\u20ac'))
+        self.assertEqual([tuple(kerning) for kerning in asset.kerning], [(0, 1, 2), (3, 4, 5), (6, 7, 8)])
+
+    def test_collections(self):
+        out = ContentWriter()
+        out.obj(ListReader, [Int32Reader]).write_int32(3)
+        out.stream.pack('3i', 7, -1, 0)
+        self.assertEqual(list(XNBReader.load(data=out.xnb()).content), [7, -1, 0])
+        out = ContentWriter()
+        out.obj(DictionaryReader, [StringReader, Int32Reader]).write_int32(2)
+        for key, value in [('one', 1), ('two', 2)]:
+            out.string(key)
+            out.stream.write_int32(value)
+        self.assertEqual(list(XNBReader.load(data=out.xnb()).content.items()), [('one', 1), ('two', 2)])
+
+    def test_buffers(self):
+        out = ContentWriter()
+        out.obj(IndexBufferReader).write_boolean(True)
+        out.stream.write_int32(6)
+        out.stream.pack('3H', 0, 1, 2)
+        asset = XNBReader.load(data=out.xnb()).content
+        self.assertEqual((asset.index_16, asset.index_data), (True, b'\x00\x00\x01\x00\x02\x00'))
+        vertices = bytes(bytearray(range(40)))
+        out = ContentWriter()
+        out.obj(VertexBufferReader).write_uint32(20)
+        out.stream.write_uint32(2)
+        out.stream.pack('4i 4i', 0, 2, 0, 0, 12, 1, 2, 0)
+        out.stream.write_uint32(2)
+        out.stream.write(vertices)
+        asset = XNBReader.load(data=out.xnb()).content
+        self.assertEqual((asset.vertex_data, asset.vertex_count), (vertices, 2))
+        self.assertEqual(asset.declaration.vertex_stride, 20)
+        elements = [(0, VertexElementFormat(2), VertexElementUsage(0), 0),
+                    (12, VertexElementFormat(1), VertexElementUsage(2), 0)]
+        self.assertEqual(repr(asset.declaration.elements), repr(elements))
+        # before XNA 4.0 only the vertex data is stored
+        out = ContentWriter()
+        out.obj(VertexBufferReader).write_int32(len(vertices))
+        out.stream.write(vertices)
+        asset = XNBReader.load(data=out.xnb(version=VERSION_31)).content
+        self.assertEqual((asset.vertex_data, asset.declaration), (vertices, None))
+
+    def test_fields(self):
+        out = ContentWriter()
+        out.obj(Texture2DReader).pack('4i', 0, 4, 8, 2)
+        for size in [128, 32]:
+            out.stream.write_int32(size)
+            out.stream.write(b'\x01' * size)
+        data = out.xnb()
+        self.assertEqual(XNBReader.load(data=data, fields=['width', 'height']).content, {'width': 4, 'height': 8})
+        levels = XNBReader.load(data=data, fields=['mip_levels']).content['mip_levels']
+        self.assertEqual([view_bytes(level) for level in levels], [b'\x01' * 128, b'\x01' * 32])
+
+
+if __name__ == '__main__':
+    unittest.main()
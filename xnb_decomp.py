@@ -1,7 +1,6 @@
 #!/usr/bin/python
 """
 Decompress XNB files.
-Requires win32
 """
 
 from __future__ import print_function
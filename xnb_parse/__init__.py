@@ -3,3 +3,5 @@ MS XNB file parser
 """
 
 from __future__ import print_function
+
+__version__ = '0.1.0'
@@ -0,0 +1,142 @@
+"""
+memory budgeted cache of parsed assets
+"""
+
+from __future__ import print_function
+
+import sys
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+
+from xnb_parse.binstream import BufferSlice
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'evictions', 'count', 'size', 'budget'])
+
+_ATOMIC_TYPES = (int, float, bool, complex, type(None), str, bytes, bytearray)
+# a cached asset can be None
+_MISSING = object()
+
+
+def estimate_size(value, drop_raw=False):
+    """
+    approximate bytes used by a parsed asset. a BufferSlice still reading from the raw XNB buffer counts the whole
+    buffer once, with drop_raw the slices are copied out so the buffer can be freed
+    """
+    size = 0
+    seen = set()
+    pending = [value]
+    while pending:
+        cur_value = pending.pop()
+        if id(cur_value) in seen:
+            continue
+        seen.add(id(cur_value))
+        if isinstance(cur_value, BufferSlice):
+            if drop_raw:
+                cur_value.data
+            source = cur_value.source
+            if source is None:
+                size += len(cur_value)
+            elif id(source) not in seen:
+                seen.add(id(source))
+                size += len(source)
+            continue
+        size += sys.getsizeof(cur_value)
+        if isinstance(cur_value, _ATOMIC_TYPES):
+            continue
+        if isinstance(cur_value, memoryview):
+            size += len(cur_value) * cur_value.itemsize
+            continue
+        if isinstance(cur_value, array):
+            # getsizeof already includes the items
+            continue
+        if numpy is not None and isinstance(cur_value, numpy.ndarray):
+            if cur_value.base is not None:
+                size += cur_value.nbytes
+            continue
+        if isinstance(cur_value, dict):
+            pending.extend(cur_value.keys())
+            pending.extend(cur_value.values())
+        elif isinstance(cur_value, (list, tuple, set, frozenset)):
+            pending.extend(cur_value)
+        if hasattr(cur_value, '__dict__'):
+            pending.append(vars(cur_value))
+        for slot in getattr(type(cur_value), '__slots__', ()):
+            if hasattr(cur_value, slot):
+                pending.append(getattr(cur_value, slot))
+    return size
+
+
+class AssetCache(object):
+    """
+    least recently used parsed assets, evicted once their estimated size goes over budget bytes.
+    cached assets are shared by every caller that loads them.
+
+    with drop_raw the BufferSlices of a cached asset are copied out of the buffer they were read from, so the cache
+    never keeps a whole XNB buffer or memory map alive for them
+    """
+
+    def __init__(self, budget, drop_raw=True):
+        self.budget = budget
+        self.drop_raw = drop_raw
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._assets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, load):
+        """
+        cached asset for key, calling load to read it on a miss
+        """
+        value = self.lookup(key, _MISSING)
+        if value is _MISSING:
+            value = load()
+            self.put(key, value)
+        return value
+
+    def lookup(self, key, default=None):
+        """
+        cached asset for key, or default on a miss. for callers that load the asset themselves and put it
+        """
+        with self._lock:
+            entry = self._assets.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            # move to the most recently used end
+            del self._assets[key]
+            self._assets[key] = entry
+            return entry[0]
+
+    def put(self, key, value):
+        size = estimate_size(value, self.drop_raw)
+        if size > self.budget:
+            return
+        with self._lock:
+            old_entry = self._assets.pop(key, None)
+            if old_entry is not None:
+                self.size -= old_entry[1]
+            self._assets[key] = (value, size)
+            self.size += size
+            while self.size > self.budget:
+                _, (_, evicted_size) = self._assets.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._assets.clear()
+            self.size = 0
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions, len(self._assets), self.size, self.budget)
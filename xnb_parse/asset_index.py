@@ -0,0 +1,141 @@
+"""
+persistent index of the assets under a content root
+"""
+
+from __future__ import print_function
+
+import json
+import os
+
+from xnb_parse.binstream import replace_file
+from xnb_parse.xnb_reader import XNBHeader
+
+
+INDEX_VERSION = 1
+
+
+class AssetIndex(object):
+    """
+    directory listings, .pak tables of contents and XNB header summaries saved between runs.
+
+    a directory is only listed again when its mtime changes and a .pak is only read again when its mtime or size
+    changes, headers are kept with the mtime and size of the data they were read from
+    """
+
+    def __init__(self, filename, root_dir):
+        self.filename = os.path.normpath(filename)
+        self.root_dir = os.path.abspath(root_dir)
+        self.dirty = False
+        self._dirs = {}
+        self._paks = {}
+        self._headers = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.filename, 'r') as index_file:
+                data = json.load(index_file)
+        except (IOError, OSError, ValueError):
+            self.dirty = True
+            return
+        if not isinstance(data, dict) or data.get('version') != INDEX_VERSION or data.get('root_dir') != self.root_dir:
+            self.dirty = True
+            return
+        self._dirs = data['dirs']
+        self._paks = data['paks']
+        self._headers = data['headers']
+
+    def save(self):
+        """
+        write the index if anything changed, a reader never sees a half written file
+        """
+        if not self.dirty:
+            return
+        data = {'version': INDEX_VERSION, 'root_dir': self.root_dir, 'dirs': self._dirs, 'paks': self._paks,
+                'headers': self._headers}
+        temp_filename = self.filename + '.tmp'
+        with open(temp_filename, 'w') as index_file:
+            json.dump(data, index_file, separators=(',', ':'))
+        replace_file(temp_filename, self.filename)
+        self.dirty = False
+
+    def walk(self):
+        """
+        os.walk(root_dir, followlinks=True) using the saved listing of every directory whose mtime hasn't changed
+        """
+        dirs = {}
+        pending = ['.']
+        while pending:
+            sub_dir = pending.pop()
+            path = os.path.normpath(os.path.join(self.root_dir, sub_dir))
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            entry = self._dirs.get(sub_dir)
+            if entry is None or entry[0] != mtime:
+                entry = self._list_dir(path, mtime)
+                self.dirty = True
+            dirs[sub_dir] = entry
+            _, dirnames, filenames = entry
+            yield path, dirnames, filenames
+            pending.extend(os.path.join(sub_dir, dirname) if sub_dir != '.' else dirname
+                           for dirname in reversed(dirnames))
+        if len(dirs) != len(self._dirs):
+            self.dirty = True
+        self._dirs = dirs
+
+    @staticmethod
+    def _list_dir(path, mtime):
+        dirnames = []
+        filenames = []
+        try:
+            names = sorted(os.listdir(path))
+        except OSError:
+            names = []
+        for name in names:
+            if os.path.isdir(os.path.join(path, name)):
+                dirnames.append(name)
+            else:
+                filenames.append(name)
+        return [mtime, dirnames, filenames]
+
+    def get_pak(self, pak_name, stamp):
+        """
+        saved (asset_name, offset, size) entries of a .pak, None if it changed since they were saved
+        """
+        entry = self._paks.get(pak_name)
+        if entry is None or entry[0] != stamp:
+            return None
+        return [tuple(asset) for asset in entry[1]]
+
+    def set_pak(self, pak_name, stamp, assets):
+        self._paks[pak_name] = [stamp, [list(asset) for asset in assets]]
+        self.dirty = True
+
+    def get_header(self, asset_name, stamp):
+        """
+        saved XNBHeader of an asset, None if its data changed since it was saved
+        """
+        entry = self._headers.get(asset_name)
+        if entry is None or entry[0] != stamp:
+            return None
+        platform, version, profile, compressed, size, uncompressed_size, type_readers = entry[1]
+        return XNBHeader(platform.encode('latin-1'), version, profile, compressed, size, uncompressed_size,
+                         [tuple(type_reader) for type_reader in type_readers])
+
+    def set_header(self, asset_name, stamp, header):
+        values = list(header)
+        values[0] = header.platform.decode('latin-1')
+        self._headers[asset_name] = [stamp, values]
+        self.dirty = True
+
+    def prune_headers(self, asset_names):
+        """
+        drop the headers of assets that aren't in asset_names any more
+        """
+        stale = [asset_name for asset_name in self._headers if asset_name not in asset_names]
+        for asset_name in stale:
+            del self._headers[asset_name]
+        if stale:
+            self.dirty = True
@@ -0,0 +1,111 @@
+"""
+asyncio ContentManager
+"""
+
+from __future__ import print_function
+
+import asyncio
+import collections
+
+from xnb_parse.type_reader import ReaderError
+from xnb_parse.xnb_reader import XNBReader
+
+
+# a cached asset can be None
+_MISSING = object()
+
+
+class AsyncContentManager(object):
+    """
+    loads assets of a ContentManager without blocking the event loop. the asset data is read in io_executor and
+    decompressed and parsed in executor, both default to the loop's thread pool. with a ProcessPoolExecutor use
+    init_worker as its initializer.
+
+    loads of an asset that is already being loaded wait for that load instead of starting another. whole assets go
+    through the ContentManager's cache when it has one
+    """
+
+    def __init__(self, content_manager, executor=None, io_executor=None):
+        self.content_manager = content_manager
+        self.executor = executor
+        self.io_executor = io_executor
+        self._loading = {}
+
+    async def load(self, asset_name, expected_type=None, fields=None):
+        """
+        load an asset, with fields only a dict of the named fields is returned as for ContentManager.load
+        """
+        asset_name = asset_name.replace('\\', '/')
+        asset_name = asset_name.lower()
+        key = (asset_name, expected_type, tuple(fields) if fields is not None else None)
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(asset_name, expected_type, fields))
+            self._loading[key] = task
+            task.add_done_callback(lambda done: self._load_done(key, done))
+        # a cancelled caller doesn't cancel the load for the others waiting on it
+        return await asyncio.shield(task)
+
+    def _load_done(self, key, task):
+        self._loading.pop(key, None)
+        if not task.cancelled():
+            # every caller may have gone, don't log the error as never retrieved
+            task.exception()
+
+    async def _load(self, asset_name, expected_type, fields):
+        loop = asyncio.get_running_loop()
+        # field loads are never cached, as for ContentManager.load
+        cache = self.content_manager.cache if fields is None else None
+        if cache is not None:
+            asset = cache.lookup((asset_name, expected_type), _MISSING)
+            if asset is not _MISSING:
+                return asset
+        # copied so the data can be sent to a process executor
+        data = await loop.run_in_executor(self.io_executor, _read_asset, self.content_manager, asset_name)
+        asset = await loop.run_in_executor(self.executor, _parse_asset, data, expected_type, fields,
+                                           self.content_manager.compiled)
+        if cache is not None:
+            cache.put((asset_name, expected_type), asset)
+        return asset
+
+    async def load_many(self, asset_names, expected_type=None, fields=None, concurrency=8):
+        """
+        async iterator of (asset_name, asset, error) in the order of asset_names with up to concurrency loads
+        running at once, error is a FAILED line for assets that couldn't be read
+        """
+        pending = collections.deque()
+        asset_names = iter(asset_names)
+        try:
+            while True:
+                for asset_name in asset_names:
+                    pending.append((asset_name, asyncio.ensure_future(self.load(asset_name, expected_type, fields))))
+                    if len(pending) >= concurrency:
+                        break
+                if not pending:
+                    return
+                asset_name, task = pending.popleft()
+                try:
+                    asset = await task
+                except (ReaderError, KeyError) as ex:
+                    yield asset_name, None, "FAILED: '{}' {}: {}".format(asset_name, type(ex).__name__, ex)
+                else:
+                    yield asset_name, asset, None
+        finally:
+            # the iteration was stopped early
+            for _, task in pending:
+                task.cancel()
+
+
+def init_worker():
+    """
+    import every reader module once when an executor process starts
+    """
+    XNBReader.get_type_reader_manager().import_all_readers()
+
+
+def _read_asset(content_manager, asset_name):
+    return bytes(content_manager.asset_data(asset_name))
+
+
+def _parse_asset(data, expected_type, fields, compiled):
+    return XNBReader.load(data=data, expected_type=expected_type, compiled=compiled, fields=fields).content
@@ -0,0 +1,212 @@
+"""
+Benchmark XNB loading
+"""
+
+from __future__ import print_function
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from xnb_parse.binstream import BinaryStream
+from xnb_parse.file_formats.xml_utils import ET
+from xnb_parse.type_reader import ReaderError
+from xnb_parse.xna_content_manager import ContentManager
+from xnb_parse.xnb_reader import XNBReader, _COMPRESS_MASK
+
+
+_MONO_XNBDECOMP = os.path.realpath(os.path.join(os.path.dirname(__file__), '../bin/xnbdecomp.exe'))
+
+
+def _report(name, total_bytes, total_time):
+    rate = total_bytes / total_time / (1024 * 1024) if total_time else 0.0
+    print('{:<12} {:>12} bytes {:>8.2f} s {:>8.2f} MiB/s'.format(name, total_bytes, total_time, rate))
+
+
+def find_compressed(in_dir):
+    content_manager = ContentManager(in_dir)
+    for asset_name in content_manager.assets:
+        filename = os.path.join(content_manager.root_dir, content_manager._asset_dict[asset_name])
+        with open(filename, 'rb') as file_handle:
+            header = bytearray(file_handle.read(6))
+        if header[:3] == b'XNB' and header[5] & _COMPRESS_MASK:
+            yield filename
+
+
+def bench_lzx(in_dir):
+    filenames = list(find_compressed(in_dir))
+    if not filenames:
+        print("No compressed XNBs found in '{}'".format(in_dir), file=sys.stderr)
+        return
+    print('{} compressed XNBs'.format(len(filenames)))
+
+    total_bytes = 0
+    start_time = time.time()
+    for filename in filenames:
+        xnb = XNBReader.load(filename=filename, parse=False)
+        total_bytes += xnb.length()
+    _report('lzx', total_bytes, time.time() - start_time)
+
+    try:
+        subprocess.check_call(['mono', '--version'], stdout=subprocess.PIPE)
+    except (OSError, subprocess.CalledProcessError):
+        print('mono not found, skipping xnbdecomp.exe round-trip', file=sys.stderr)
+        return
+    out_dir = tempfile.mkdtemp()
+    try:
+        mono_bytes = 0
+        start_time = time.time()
+        subprocess.check_call(['mono', _MONO_XNBDECOMP, in_dir, out_dir], stdout=subprocess.PIPE)
+        for filename in filenames:
+            out_file = os.path.join(out_dir, os.path.relpath(filename, in_dir))
+            xnb = XNBReader.load(filename=out_file, parse=False)
+            mono_bytes += xnb.length()
+        _report('mono', mono_bytes, time.time() - start_time)
+    finally:
+        shutil.rmtree(out_dir)
+
+
+def _read_7bit_encoded_int_bytewise(stream):
+    # reference implementation reading one byte at a time
+    value = 0
+    shift = 0
+    while shift < 32:
+        val = stream.read_byte()
+        value |= (val & 0x7F) << shift
+        if val & 128 == 0:
+            return value
+        shift += 7
+    raise ValueError("Shift out of range")
+
+
+def _read_cstring_bytewise(stream, encoding='utf-8'):
+    raw_value = bytearray()
+    cur_byte = stream.read(1)
+    while cur_byte != b'\x00' and cur_byte != b'':
+        raw_value += cur_byte
+        cur_byte = stream.read(1)
+    return raw_value.decode(encoding)
+
+
+def _load_all(xnbs):
+    for data in xnbs:
+        try:
+            XNBReader.load(data)
+        except ReaderError:
+            pass
+
+
+def bench_binstream(in_dir):
+    content_manager = ContentManager(in_dir)
+    xnbs = []
+    for asset_name in content_manager.assets:
+        filename = os.path.join(content_manager.root_dir, content_manager._asset_dict[asset_name])
+        # decompress up front so only parsing is timed
+        xnb = XNBReader.load(filename=filename, parse=False)
+        xnbs.append(xnb.save())
+    print('{} XNBs'.format(len(xnbs)))
+
+    # mostly single byte values like type ids, with some longer lengths
+    varint_count = 200000
+    varints = BinaryStream()
+    for index in range(varint_count):
+        varints.write_7bit_encoded_int(index % 200 if index % 10 else index * 31)
+    cstrings = BinaryStream()
+    for index in range(50000):
+        cstrings.write_cstring('cue_name_{}'.format(index))
+
+    fast_7bit = BinaryStream.read_7bit_encoded_int
+    fast_cstring = BinaryStream.read_cstring
+    for name, read_7bit, read_cstring in [('bytewise', _read_7bit_encoded_int_bytewise, _read_cstring_bytewise),
+                                          ('buffer', fast_7bit, fast_cstring)]:
+        BinaryStream.read_7bit_encoded_int = read_7bit
+        BinaryStream.read_cstring = read_cstring
+        try:
+            stream = BinaryStream(varints.getbuffer())
+            start_time = time.time()
+            for _ in range(varint_count):
+                stream.read_7bit_encoded_int()
+            varint_time = time.time() - start_time
+            stream = BinaryStream(cstrings.getbuffer())
+            start_time = time.time()
+            for _ in range(50000):
+                stream.read_cstring()
+            cstring_time = time.time() - start_time
+            start_time = time.time()
+            _load_all(xnbs)
+            parse_time = time.time() - start_time
+        finally:
+            BinaryStream.read_7bit_encoded_int = fast_7bit
+            BinaryStream.read_cstring = fast_cstring
+        print('{:<12} varint {:>8.3f} s  cstring {:>8.3f} s  parse {:>8.2f} s'.format(name, varint_time, cstring_time,
+                                                                                       parse_time))
+
+
+def _content_key(content):
+    if hasattr(content, 'xml'):
+        return ET.tostring(content.xml())
+    return repr(content)
+
+
+def bench_compiled(in_dir, repeat=3):
+    content_manager = ContentManager(in_dir)
+    xnbs = []
+    for asset_name in content_manager.assets:
+        filename = os.path.join(content_manager.root_dir, content_manager._asset_dict[asset_name])
+        xnb = XNBReader.load(filename=filename, parse=False)
+        xnbs.append((asset_name, xnb.save()))
+    print('{} XNBs'.format(len(xnbs)))
+
+    results = {}
+    for compiled in [False, True]:
+        name = 'compiled' if compiled else 'readers'
+        contents = {}
+        best_time = None
+        # first pass builds the parse plans, keep the best of the repeats
+        for _ in range(repeat):
+            start_time = time.time()
+            for asset_name, data in xnbs:
+                try:
+                    contents[asset_name] = XNBReader.load(data, compiled=compiled).content
+                except ReaderError as ex:
+                    contents[asset_name] = ex
+            run_time = time.time() - start_time
+            if best_time is None or run_time < best_time:
+                best_time = run_time
+        results[compiled] = contents
+        print('{:<12} parse {:>8.2f} s'.format(name, best_time))
+
+    mismatches = 0
+    for asset_name, _ in xnbs:
+        expected = results[False][asset_name]
+        actual = results[True][asset_name]
+        if isinstance(expected, ReaderError) or isinstance(actual, ReaderError):
+            same = str(expected) == str(actual)
+        else:
+            same = _content_key(expected) == _content_key(actual)
+        if not same:
+            mismatches += 1
+            print("MISMATCH: '{}'".format(asset_name), file=sys.stderr)
+    print('{} mismatches'.format(mismatches))
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == 'lzx':
+        totaltime = time.time()
+        bench_lzx(os.path.normpath(sys.argv[2]))
+        print('> Done in {:.2f} seconds'.format(time.time() - totaltime))
+    elif len(sys.argv) == 3 and sys.argv[1] == 'binstream':
+        totaltime = time.time()
+        bench_binstream(os.path.normpath(sys.argv[2]))
+        print('> Done in {:.2f} seconds'.format(time.time() - totaltime))
+    elif len(sys.argv) == 3 and sys.argv[1] == 'compiled':
+        totaltime = time.time()
+        bench_compiled(os.path.normpath(sys.argv[2]))
+        print('> Done in {:.2f} seconds'.format(time.time() - totaltime))
+    else:
+        print('benchmark.py lzx xnb_dir', file=sys.stderr)
+        print('benchmark.py binstream xnb_dir', file=sys.stderr)
+        print('benchmark.py compiled xnb_dir', file=sys.stderr)
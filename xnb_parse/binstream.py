@@ -4,20 +4,152 @@
 
 from __future__ import print_function
 
+import mmap
+import os
 import struct
 import sys
-from io import BytesIO, SEEK_END
+from array import array
+from io import SEEK_SET, SEEK_CUR, SEEK_END
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from os import replace as replace_file
+except ImportError:
+    # no atomic replace before Python 3.3
+    from os import rename as replace_file
 
 
 _TYPE_FMT = ['Q', 'q', 'I', 'i', 'H', 'h', 'B', 'b', 'f', 'd', '?']
 
 
-class BinaryStream(BytesIO):
+def _array_typecodes():
+    # array typecode sizes are platform dependent, match them to the struct standard sizes
+    typecodes = {}
+    for fmt, candidates in [('b', 'b'), ('B', 'B'), ('h', 'h'), ('H', 'H'), ('i', 'il'), ('I', 'IL'), ('q', 'qlL'),
+                            ('Q', 'QL'), ('f', 'f'), ('d', 'd')]:
+        size = struct.calcsize('<' + fmt)
+        for typecode in candidates:
+            try:
+                if array(typecode).itemsize == size:
+                    typecodes[fmt] = typecode
+                    break
+            except ValueError:
+                pass
+    return typecodes
+
+
+_ARRAY_TYPECODES = _array_typecodes()
+_NATIVE_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+def view_bytes(data):
+    """
+    copy of the bytes in a buffer, bytes() of a memoryview is its repr on Python 2
+    """
+    if isinstance(data, memoryview):
+        return data.tobytes()
+    return bytes(data)
+
+
+class BufferSlice(object):
+    """
+    length bytes at offset in a buffer, only copied out the first time data is used
+    """
+    __slots__ = ('_source', '_offset', '_length', '_data')
+
+    def __init__(self, source, offset, length):
+        self._source = source
+        self._offset = offset
+        self._length = length
+        self._data = None
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = view_bytes(self._source[self._offset:self._offset + self._length])
+            # the slice no longer keeps the whole buffer alive
+            self._source = None
+        return self._data
+
+    @property
+    def source(self):
+        """
+        buffer the data will be copied from, None once it has been
+        """
+        return self._source
+
+    def __reduce__(self):
+        return BufferSlice, (self.data, 0, self._length)
+
+
+def slice_data(value):
+    """
+    bytes for a BufferSlice, anything else is returned unchanged
+    """
+    if isinstance(value, BufferSlice):
+        return value.data
+    return value
+
+
+def map_file(filename):
+    """
+    read only memory map of a file, its pages are only read when used. on Python 2 the file is read instead as an
+    mmap there can't back a memoryview.
+
+    the map holds a file descriptor until it and every view of it are released, so only map files that are shared
+    by many reads
+    """
+    with open(filename, 'rb') as file_handle:
+        # empty files can not be mapped
+        if sys.version < '3' or not os.fstat(file_handle.fileno()).st_size:
+            return file_handle.read()
+        return mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def write_file(filename, data):
+    """
+    write data to a temporary file next to filename then rename it over filename, so filename is never left
+    partly written
+    """
+    temp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+    try:
+        with open(temp_filename, 'wb') as file_handle:
+            if callable(data):
+                data(file_handle)
+            else:
+                file_handle.write(data)
+        replace_file(temp_filename, filename)
+    finally:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+
+
+class BinaryStream(object):
+    """
+    binary reader/writer over a memoryview with its own cursor
+
+    data may be bytes, bytearray, memoryview or mmap and is not copied until the stream is written to, a filename
+    is read into memory so the stream and anything sliced from it don't keep the file open
+    """
+
     def __init__(self, data=None, filename=None, big_endian=False):
         if filename is not None:
             with open(filename, 'rb') as file_handle:
                 data = file_handle.read()
-        BytesIO.__init__(self, data)
+        if data is None:
+            self._buffer = bytearray()
+        elif isinstance(data, bytearray):
+            self._buffer = data
+        else:
+            self._buffer = memoryview(data)
+        self._pos = 0
         self._types = {k: None for k in _TYPE_FMT}
         self.set_endian(big_endian)
 
@@ -29,6 +161,89 @@ class BinaryStream(BytesIO):
             self._fmt_end = '<'
         self._types = {k: struct.Struct(self._fmt_end + k) for k, v in self._types.items()}
 
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=SEEK_SET):
+        if whence == SEEK_SET:
+            pos = offset
+        elif whence == SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == SEEK_END:
+            pos = len(self._buffer) + offset
+        else:
+            raise ValueError("Invalid whence: {}".format(whence))
+        if pos < 0:
+            raise ValueError("Negative seek position: {}".format(pos))
+        self._pos = pos
+        return pos
+
+    def read_view(self, count=-1):
+        """
+        read count bytes as a memoryview into the underlying buffer without copying
+        """
+        pos = self._pos
+        size = len(self._buffer)
+        if count is None or count < 0:
+            end = size
+        else:
+            end = min(pos + count, size)
+        if end <= pos:
+            return memoryview(b'')
+        self._pos = end
+        return memoryview(self._buffer)[pos:end]
+
+    def read(self, count=-1):
+        pos = self._pos
+        size = len(self._buffer)
+        if count is None or count < 0:
+            end = size
+        else:
+            end = min(pos + count, size)
+        if end <= pos:
+            return b''
+        self._pos = end
+        return view_bytes(self._buffer[pos:end])
+
+    def read_slice(self, count=-1):
+        """
+        read count bytes as a BufferSlice, nothing is copied until the slice data is used
+        """
+        pos = self._pos
+        size = len(self._buffer)
+        if count is None or count < 0:
+            end = size
+        else:
+            end = min(pos + count, size)
+        end = max(end, pos)
+        self._pos = end
+        return BufferSlice(self._buffer, pos, end - pos)
+
+    def write(self, data):
+        buf = self._buffer
+        if not isinstance(buf, bytearray):
+            # copy on first write
+            buf = self._buffer = bytearray(buf)
+        pos = self._pos
+        size = len(data)
+        if pos > len(buf):
+            buf.extend(b'\x00' * (pos - len(buf)))
+        buf[pos:pos + size] = data
+        self._pos = pos + size
+        return size
+
+    def getvalue(self):
+        return view_bytes(self._buffer)
+
+    def getbuffer(self):
+        return memoryview(self._buffer)
+
+    def skip(self, count):
+        """
+        advance count bytes without reading them, stops at the end of the stream
+        """
+        self._pos = min(self._pos + count, len(self._buffer))
+
     def peek(self, count):
         cur_pos = self.tell()
         value = self.read(count)
@@ -37,23 +252,36 @@ class BinaryStream(BytesIO):
 
     def write_file(self, filename):
         with open(filename, 'wb') as file_handle:
-            file_handle.write(self.getvalue())
+            file_handle.write(self._buffer)
 
     def length(self):
-        cur_pos = self.tell()
-        cur_len = self.seek(0, SEEK_END)
-        self.seek(cur_pos)
-        return cur_len
+        return len(self._buffer)
 
     def read_7bit_encoded_int(self):
-        value = 0
-        shift = 0
-        while shift < 32:
-            val = self._types['B'].unpack(self.read(1))[0]
+        buf = self._buffer
+        pos = self._pos
+        if pos >= len(buf):
+            raise struct.error("read_7bit_encoded_int past end of stream")
+        # indexing a memoryview gives a str on Python 2
+        read_byte = self._types['B'].unpack_from
+        val = read_byte(buf, pos)[0]
+        if val < 0x80:
+            self._pos = pos + 1
+            return val
+        value = val & 0x7F
+        shift = 7
+        end = min(pos + 5, len(buf))
+        pos += 1
+        while pos < end:
+            val = read_byte(buf, pos)[0]
             value |= (val & 0x7F) << shift
-            if val & 128 == 0:
+            pos += 1
+            if val < 0x80:
+                self._pos = pos
                 return value
             shift += 7
+        if pos == len(buf) and shift < 35:
+            raise struct.error("read_7bit_encoded_int past end of stream")
         raise ValueError("Shift out of range")
 
     def write_7bit_encoded_int(self, value):
@@ -68,20 +296,29 @@ class BinaryStream(BytesIO):
         return bytes_written
 
     def read_char(self):
-        raw_value = self._types['B'].unpack(self.read(1))[0]
+        raw_value = self.read_byte()
         byte_count = 0
         while raw_value & (0x80 >> byte_count):
             byte_count += 1
         raw_value &= (1 << (8 - byte_count)) - 1
         while byte_count > 1:
             raw_value <<= 6
-            raw_value |= self._types['B'].unpack(self.read(1))[0] & 0x3f
+            raw_value |= self.read_byte() & 0x3f
             byte_count -= 1
         if sys.version < '3':
             return unichr(raw_value)
         else:
             return chr(raw_value)
 
+    def skip_char(self):
+        # the lead byte gives the length of the utf-8 sequence
+        lead_byte = self.read_byte()
+        byte_count = 0
+        while lead_byte & (0x80 >> byte_count):
+            byte_count += 1
+        if byte_count > 1:
+            self.skip(byte_count - 1)
+
     def write_char(self, value):
         return self.write(value.encode('utf-8'))
 
@@ -90,6 +327,9 @@ class BinaryStream(BytesIO):
         raw_value = self.read(size)
         return raw_value.decode('utf-8')
 
+    def skip_string(self):
+        self.skip(self.read_7bit_encoded_int())
+
     def write_string(self, value):
         raw_value = value.encode('utf-8')
         bytes_written = self.write_7bit_encoded_int(len(raw_value))
@@ -101,6 +341,9 @@ class BinaryStream(BytesIO):
         raw_value = self.read(size)
         return raw_value.decode('utf-8')
 
+    def skip_long_string(self):
+        self.skip(self.read_int32())
+
     def write_long_string(self, value):
         raw_value = value.encode('utf-8')
         bytes_written = self.write_int32(len(raw_value))
@@ -108,12 +351,22 @@ class BinaryStream(BytesIO):
         return bytes_written
 
     def read_cstring(self, encoding='utf-8'):
-        raw_value = bytearray()
-        cur_byte = self.read(1)
-        while cur_byte != b'\x00' and cur_byte != b'':
-            raw_value += cur_byte
-            cur_byte = self.read(1)
-        return raw_value.decode(encoding)
+        buf = self._buffer
+        start = pos = self._pos
+        size = len(buf)
+        chunk = 64
+        stop = size
+        # search for the terminator in growing chunks rather than one byte at a time
+        while pos < size:
+            end = min(pos + chunk, size)
+            found = view_bytes(buf[pos:end]).find(b'\x00')
+            if found >= 0:
+                stop = pos + found
+                break
+            pos = end
+            chunk *= 4
+        self._pos = min(stop + 1, size)
+        return view_bytes(buf[start:stop]).decode(encoding)
 
     def write_cstring(self, value, encoding='utf-8'):
         raw_value = value.encode(encoding)
@@ -124,7 +377,55 @@ class BinaryStream(BytesIO):
     def unpack(self, fmt):
         if fmt not in self._types:
             self._types[fmt] = struct.Struct(self._fmt_end + fmt)
-        return self._types[fmt].unpack(self.read(self._types[fmt].size))
+        fmt_struct = self._types[fmt]
+        values = fmt_struct.unpack_from(self._buffer, self._pos)
+        self._pos += fmt_struct.size
+        return values
+
+    def unpack_array(self, fmt, count):
+        """
+        unpack count consecutive records of fmt in one pass, returns a list of tuples
+        """
+        if fmt not in self._types:
+            self._types[fmt] = struct.Struct(self._fmt_end + fmt)
+        fmt_struct = self._types[fmt]
+        size = fmt_struct.size * count
+        if self._pos + size > len(self._buffer):
+            raise struct.error("unpack_array requires {} bytes".format(size))
+        view = self.read_view(size)
+        if not size:
+            return []
+        if sys.version < '3':
+            return [fmt_struct.unpack_from(view, offset) for offset in range(0, size, fmt_struct.size)]
+        return list(fmt_struct.iter_unpack(view))
+
+    def read_array(self, fmt, count, use_numpy=False):
+        """
+        read count values of a single type code as an array.array, byte swapped in bulk if required
+
+        with use_numpy set and numpy available a numpy array sharing the stream buffer is returned instead
+        """
+        try:
+            typecode = _ARRAY_TYPECODES[fmt]
+        except KeyError:
+            raise ValueError("Unsupported array format: '{}'".format(fmt))
+        size = self.calc_size(fmt) * count
+        if self._pos + size > len(self._buffer):
+            raise struct.error("read_array requires {} bytes".format(size))
+        view = self.read_view(size)
+        if use_numpy and numpy is not None:
+            if sys.version < '3':
+                # numpy on Python 2 only takes old style buffers
+                view = view.tobytes()
+            return numpy.frombuffer(view, dtype=numpy.dtype(self._fmt_end + fmt), count=count)
+        values = array(typecode)
+        if sys.version < '3':
+            values.fromstring(view.tobytes())
+        else:
+            values.frombytes(view)
+        if self.big_endian != _NATIVE_BIG_ENDIAN:
+            values.byteswap()
+        return values
 
     def pack(self, fmt, *values):
         if fmt not in self._types:
@@ -137,67 +438,227 @@ class BinaryStream(BytesIO):
         return self._types[fmt].size
 
     def read_byte(self):
-        return self._types['B'].unpack(self.read(1))[0]
+        value = self._types['B'].unpack_from(self._buffer, self._pos)[0]
+        self._pos += 1
+        return value
 
     def write_byte(self, value):
         return self.write(self._types['B'].pack(value))
 
     def read_sbyte(self):
-        return self._types['b'].unpack(self.read(1))[0]
+        value = self._types['b'].unpack_from(self._buffer, self._pos)[0]
+        self._pos += 1
+        return value
 
     def write_sbyte(self, value):
         return self.write(self._types['b'].pack(value))
 
     def read_int16(self):
-        return self._types['h'].unpack(self.read(2))[0]
+        value = self._types['h'].unpack_from(self._buffer, self._pos)[0]
+        self._pos += 2
+        return value
 
     def write_int16(self, value):
         return self.write(self._types['h'].pack(value))
 
     def read_uint16(self):
-        return self._types['H'].unpack(self.read(2))[0]
+        value = self._types['H'].unpack_from(self._buffer, self._pos)[0]
+        self._pos += 2
+        return value
 
     def write_uint16(self, value):
         return self.write(self._types['H'].pack(value))
 
     def read_int32(self):
-        return self._types['i'].unpack(self.read(4))[0]
+        value = self._types['i'].unpack_from(self._buffer, self._pos)[0]
+        self._pos += 4
+        return value
 
     def write_int32(self, value):
         return self.write(self._types['i'].pack(value))
 
     def read_uint32(self):
-        return self._types['I'].unpack(self.read(4))[0]
+        value = self._types['I'].unpack_from(self._buffer, self._pos)[0]
+        self._pos += 4
+        return value
 
     def write_uint32(self, value):
         return self.write(self._types['I'].pack(value))
 
     def read_int64(self):
-        return self._types['q'].unpack(self.read(8))[0]
+        value = self._types['q'].unpack_from(self._buffer, self._pos)[0]
+        self._pos += 8
+        return value
 
     def write_int64(self, value):
         return self.write(self._types['q'].pack(value))
 
     def read_uint64(self):
-        return self._types['Q'].unpack(self.read(8))[0]
+        value = self._types['Q'].unpack_from(self._buffer, self._pos)[0]
+        self._pos += 8
+        return value
 
     def write_uint64(self, value):
         return self.write(self._types['Q'].pack(value))
 
     def read_boolean(self):
-        return self._types['?'].unpack(self.read(1))[0]
+        value = self._types['?'].unpack_from(self._buffer, self._pos)[0]
+        self._pos += 1
+        return value
 
     def write_boolean(self, value):
         return self.write(self._types['?'].pack(value))
 
     def read_single(self):
-        return self._types['f'].unpack(self.read(4))[0]
+        value = self._types['f'].unpack_from(self._buffer, self._pos)[0]
+        self._pos += 4
+        return value
 
     def write_single(self, value):
         return self.write(self._types['f'].pack(value))
 
     def read_double(self):
-        return self._types['d'].unpack(self.read(8))[0]
+        value = self._types['d'].unpack_from(self._buffer, self._pos)[0]
+        self._pos += 8
+        return value
 
     def write_double(self, value):
         return self.write(self._types['d'].pack(value))
+
+
+class WindowedBinaryStream(BinaryStream):
+    """
+    read only BinaryStream over an open file, only a bounded window of the file around the cursor is held in memory
+
+    reads larger than read_ahead go straight to the file and bypass the window
+    """
+
+    def __init__(self, filename=None, file_handle=None, big_endian=False, read_ahead=0x10000):
+        if file_handle is None:
+            file_handle = open(filename, 'rb')
+        self._file = file_handle
+        self._file.seek(0, SEEK_END)
+        self._size = self._file.tell()
+        self._read_ahead = read_ahead
+        self._start = 0
+        BinaryStream.__init__(self, data=b'', big_endian=big_endian)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._buffer = memoryview(b'')
+        self._file.close()
+
+    def _fill(self, count):
+        # make sure count bytes from the cursor are in the window, unless the file ends first
+        if self._pos + count <= len(self._buffer):
+            return
+        start = self._start + self._pos
+        self._file.seek(start)
+        self._buffer = memoryview(self._file.read(max(count, self._read_ahead)))
+        self._start = start
+        self._pos = 0
+
+    def tell(self):
+        return self._start + self._pos
+
+    def seek(self, offset, whence=SEEK_SET):
+        if whence == SEEK_SET:
+            pos = offset
+        elif whence == SEEK_CUR:
+            pos = self.tell() + offset
+        elif whence == SEEK_END:
+            pos = self._size + offset
+        else:
+            raise ValueError("Invalid whence: {}".format(whence))
+        if pos < 0:
+            raise ValueError("Negative seek position: {}".format(pos))
+        if self._start <= pos <= self._start + len(self._buffer):
+            self._pos = pos - self._start
+        else:
+            self._buffer = memoryview(b'')
+            self._start = pos
+            self._pos = 0
+        return pos
+
+    def length(self):
+        return self._size
+
+    def skip(self, count):
+        self.seek(min(self.tell() + count, self._size))
+
+    def read(self, count=-1):
+        if count is None or count < 0:
+            count = max(self._size - self.tell(), 0)
+        if count > self._read_ahead:
+            pos = self.tell()
+            self._file.seek(pos)
+            data = self._file.read(count)
+            self.seek(pos + len(data))
+            return data
+        self._fill(count)
+        return BinaryStream.read(self, count)
+
+    def read_view(self, count=-1):
+        if count is None or count < 0 or count > self._read_ahead:
+            return memoryview(self.read(count))
+        self._fill(count)
+        return BinaryStream.read_view(self, count)
+
+    def read_slice(self, count=-1):
+        # the window moves on, slices have to own their data
+        data = self.read(count)
+        return BufferSlice(data, 0, len(data))
+
+    def write(self, data):
+        raise IOError("WindowedBinaryStream is read only")
+
+    def getvalue(self):
+        raise IOError("WindowedBinaryStream does not hold the whole file")
+
+    def getbuffer(self):
+        raise IOError("WindowedBinaryStream does not hold the whole file")
+
+    def unpack(self, fmt):
+        self._fill(self.calc_size(fmt))
+        return BinaryStream.unpack(self, fmt)
+
+    def unpack_array(self, fmt, count):
+        self._fill(self.calc_size(fmt) * count)
+        return BinaryStream.unpack_array(self, fmt, count)
+
+    def read_array(self, fmt, count, use_numpy=False):
+        self._fill(self.calc_size(fmt) * count)
+        return BinaryStream.read_array(self, fmt, count, use_numpy)
+
+    def read_7bit_encoded_int(self):
+        self._fill(5)
+        return BinaryStream.read_7bit_encoded_int(self)
+
+    def read_cstring(self, encoding='utf-8'):
+        count = 64
+        while True:
+            self._fill(count)
+            window_end = self._start + len(self._buffer)
+            if view_bytes(self._buffer[self._pos:]).find(b'\x00') >= 0 or window_end >= self._size:
+                return BinaryStream.read_cstring(self, encoding)
+            count *= 4
+
+
+def _windowed_read(method, size):
+    def windowed_read(self):
+        self._fill(size)
+        return method(self)
+    windowed_read.__name__ = method.__name__
+    return windowed_read
+
+
+for _name, _size in [('read_byte', 1), ('read_sbyte', 1), ('read_boolean', 1), ('read_int16', 2), ('read_uint16', 2),
+                     ('read_int32', 4), ('read_uint32', 4), ('read_single', 4), ('read_int64', 8),
+                     ('read_uint64', 8), ('read_double', 8)]:
+    setattr(WindowedBinaryStream, _name, _windowed_read(getattr(BinaryStream, _name), _size))
+del _name, _size
@@ -0,0 +1,83 @@
+"""
+append only journal of finished assets for resuming export runs
+"""
+
+from __future__ import print_function
+
+import json
+import os
+import threading
+
+
+JOURNAL_FILENAME = '.export_journal'
+
+
+class ExportJournal(object):
+    """
+    one line per finished asset with its outputs relative to out_dir, each line is flushed to disk as it's written
+    so a run that is killed can be resumed. without resume the journal of an earlier run is discarded
+    """
+
+    def __init__(self, filename, out_dir, resume=False):
+        self.filename = filename
+        self.out_dir = out_dir
+        self.entries = {}
+        self._lock = threading.Lock()
+        if resume:
+            self._load()
+        elif os.path.exists(filename):
+            os.remove(filename)
+        self._file = None
+
+    def _load(self):
+        try:
+            with open(self.filename, 'r') as journal_file:
+                lines = journal_file.readlines()
+        except (IOError, OSError):
+            return
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # the last line of a killed run may be incomplete
+                continue
+            self.entries[entry['asset']] = entry
+
+    def is_done(self, asset_name):
+        """
+        True if the asset finished in the run being resumed and its outputs are still there
+        """
+        entry = self.entries.get(asset_name)
+        return entry is not None and all(os.path.isfile(os.path.join(self.out_dir, os.path.normpath(output)))
+                                         for output in entry['outputs'])
+
+    def record(self, asset_name, outputs, **values):
+        entry = dict(values)
+        entry['asset'] = asset_name
+        entry['outputs'] = outputs
+        line = json.dumps(entry, separators=(',', ':'), sort_keys=True) + '\n'
+        with self._lock:
+            self.entries[asset_name] = entry
+            if self._file is None:
+                dirname = os.path.dirname(self.filename)
+                if dirname and not os.path.isdir(dirname):
+                    os.makedirs(dirname)
+                self._file = open(self.filename, 'a')
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def clear(self):
+        """
+        discard the journal once everything in it has been recorded elsewhere
+        """
+        with self._lock:
+            self.close()
+            self.entries = {}
+            if os.path.exists(self.filename):
+                os.remove(self.filename)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,116 @@
+"""
+manifest of exported assets for incremental exports
+"""
+
+from __future__ import print_function
+
+import hashlib
+import json
+import os
+import threading
+
+from xnb_parse import __version__
+from xnb_parse.binstream import replace_file
+
+
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = '.export_manifest.json'
+
+
+class ExportManifest(object):
+    """
+    the source stamp and hash, and the outputs, of every asset exported to a directory.
+
+    an asset is unchanged while its stamp (mtime and size) is, or when its stamp changed but the hash of its data
+    didn't. a manifest from another xnb_parse version is ignored so everything is exported again
+    """
+
+    def __init__(self, export_dir, filename=None):
+        self.export_dir = export_dir
+        if filename is None:
+            filename = os.path.join(export_dir, MANIFEST_FILENAME)
+        self.filename = filename
+        self._assets = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.filename, 'r') as manifest_file:
+                data = json.load(manifest_file)
+        except (IOError, OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION or \
+                data.get('xnb_parse') != __version__:
+            return
+        self._assets = data['assets']
+
+    def save(self):
+        with self._lock:
+            data = {'version': MANIFEST_VERSION, 'xnb_parse': __version__, 'assets': self._assets}
+            temp_filename = self.filename + '.tmp'
+            with open(temp_filename, 'w') as manifest_file:
+                json.dump(data, manifest_file, separators=(',', ':'), sort_keys=True)
+            replace_file(temp_filename, self.filename)
+
+    @staticmethod
+    def data_hash(data):
+        return hashlib.sha1(data).hexdigest()
+
+    def stamp_unchanged(self, asset_name, stamp):
+        entry = self._assets.get(asset_name)
+        return entry is not None and entry['stamp'] == stamp and self._outputs_exist(entry)
+
+    def hash_unchanged(self, asset_name, stamp, data_hash):
+        """
+        True if the data is the same as when the asset was exported, the stamp is updated so the data isn't
+        hashed again next time
+        """
+        with self._lock:
+            entry = self._assets.get(asset_name)
+            if entry is None or entry['hash'] != data_hash or not self._outputs_exist(entry):
+                return False
+            entry['stamp'] = stamp
+            return True
+
+    def _outputs_exist(self, entry):
+        return all(os.path.isfile(os.path.join(self.export_dir, os.path.normpath(output)))
+                   for output in entry['outputs'])
+
+    def update(self, asset_name, stamp, data_hash, outputs):
+        """
+        record a fresh export of an asset, outputs of the previous export that it didn't write again are removed
+        """
+        with self._lock:
+            entry = self._assets.get(asset_name)
+            self._assets[asset_name] = {'stamp': stamp, 'hash': data_hash, 'outputs': outputs}
+        if entry is not None:
+            self._remove_outputs(set(entry['outputs']) - set(outputs))
+
+    def discard(self, asset_name):
+        """
+        forget an asset that failed to export so it's tried again, along with its outputs from an older source
+        """
+        with self._lock:
+            entry = self._assets.pop(asset_name, None)
+        if entry is not None:
+            self._remove_outputs(entry['outputs'])
+
+    def remove_stale(self, asset_names):
+        """
+        remove the outputs of assets that are no longer in the content, returns their names
+        """
+        asset_names = set(asset_names)
+        with self._lock:
+            stale = [asset_name for asset_name in self._assets if asset_name not in asset_names]
+            entries = [self._assets.pop(asset_name) for asset_name in stale]
+        for entry in entries:
+            self._remove_outputs(entry['outputs'])
+        return stale
+
+    def _remove_outputs(self, outputs):
+        for output in outputs:
+            try:
+                os.remove(os.path.join(self.export_dir, os.path.normpath(output)))
+            except OSError:
+                pass
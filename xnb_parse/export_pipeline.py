@@ -0,0 +1,216 @@
+"""
+staged export of assets with bounded queues between the stages
+"""
+
+from __future__ import print_function
+
+import threading
+from multiprocessing import Pool, cpu_count
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from xnb_parse.binstream import view_bytes
+from xnb_parse.xnb_reader import XNBReader
+from xnb_parse.xna_content_manager import ContentManager, remove_staging_dirs
+
+
+# how often blocked stages check whether the pipeline was stopped
+_POLL_INTERVAL = 0.1
+
+
+class ExportPipeline(object):
+    """
+    export assets in stages: reader threads read the stored asset data, worker processes decompress, parse, decode,
+    encode and write each asset, and run yields the results.
+
+    decoding, encoding and writing stay in the worker that parsed the asset rather than being a stage of their own.
+    a parsed asset is several times the size of its XNB data, sending it back to be encoded would cost more than
+    the encoding gains from running separately. any error exporting an asset fails only that asset.
+
+    at most read_depth assets are waiting for a worker and at most parse_depth are being processed or waiting to be
+    yielded, so memory use depends on the queue depths rather than on the number of assets
+    """
+
+    def __init__(self, content_manager, export_dir, readers=2, workers=None, read_depth=8, parse_depth=None,
+                 export_file=True, export_xml=True, manifest=None, journal=None):
+        """
+        with an ExportManifest for export_dir only assets that changed since the last run are exported, and the
+        outputs of assets that were removed from the content or are no longer written are deleted.
+
+        with an ExportJournal each finished asset is recorded as it finishes, assets the journal has as done are
+        skipped. with both the journal is merged into the manifest and cleared once the manifest is saved
+        """
+        self.content_manager = content_manager
+        self.export_dir = export_dir
+        self.manifest = manifest
+        self.journal = journal
+        self.readers = max(readers, 1)
+        if workers is None:
+            workers = cpu_count()
+        self.workers = max(workers, 1)
+        self.read_depth = max(read_depth, 1)
+        if parse_depth is None:
+            parse_depth = self.workers * 2
+        self.parse_depth = max(parse_depth, 1)
+        self.export_file = export_file
+        self.export_xml = export_xml
+
+    def run(self, asset_names, largest_first=False):
+        """
+        yields (asset_name, error) as assets finish, in the order they were read. error is a FAILED line for
+        assets that couldn't be read or exported
+        """
+        asset_names = list(asset_names)
+        if self.export_dir is not None:
+            remove_staging_dirs(self.export_dir)
+        if self.manifest is not None:
+            # asset_names may be a subset, only assets gone from the content are stale
+            self.manifest.remove_stale(self.content_manager.assets)
+            if self.journal is not None:
+                # assets finished by an interrupted run
+                current = set(asset_names)
+                for asset_name, entry in self.journal.entries.items():
+                    if asset_name in current and self.journal.is_done(asset_name):
+                        self.manifest.update(asset_name, entry['stamp'], entry['hash'], entry['outputs'])
+        if largest_first:
+            sizes = {asset_name: self.content_manager.asset_size(asset_name) for asset_name in asset_names}
+            asset_names.sort(key=lambda asset_name: -sizes[asset_name])
+        names = queue.Queue()
+        for asset_name in asset_names:
+            names.put(asset_name)
+        raw = queue.Queue(self.read_depth)
+        slots = queue.Queue(self.parse_depth)
+        results = queue.Queue()
+        stop = threading.Event()
+        pool = Pool(self.workers, initializer=_init_worker)
+        threads = [threading.Thread(target=self._read_stage, args=(names, raw, results, stop))
+                   for _ in range(self.readers)]
+        threads.append(threading.Thread(target=self._parse_stage, args=(pool, raw, slots, results, stop)))
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        try:
+            while True:
+                result = results.get()
+                if result is None:
+                    break
+                if isinstance(result, tuple):
+                    # failed to read
+                    if self.manifest is not None:
+                        self.manifest.discard(result[0])
+                    yield result
+                    continue
+                # raises anything the worker didn't handle
+                asset_name, error, stamp, data_hash, outputs = result.get()
+                slots.get()
+                if error is None and self.journal is not None:
+                    self.journal.record(asset_name, outputs, stamp=stamp, hash=data_hash)
+                if self.manifest is not None:
+                    if error is None:
+                        self.manifest.update(asset_name, stamp, data_hash, outputs)
+                    else:
+                        self.manifest.discard(asset_name)
+                yield asset_name, error
+            pool.close()
+        finally:
+            if self.manifest is not None:
+                self.manifest.save()
+                if self.journal is not None:
+                    self.journal.clear()
+            elif self.journal is not None:
+                self.journal.close()
+            stop.set()
+            # the stages notice the stop within a poll interval, the pool must outlive the parse stage
+            for thread in threads:
+                thread.join()
+            pool.terminate()
+            pool.join()
+
+    def _read_stage(self, names, raw, results, stop):
+        while not stop.is_set():
+            try:
+                asset_name = names.get_nowait()
+            except queue.Empty:
+                break
+            if self.journal is not None and self.manifest is None and self.journal.is_done(asset_name):
+                continue
+            stamp = data_hash = None
+            try:
+                if self.manifest is not None:
+                    stamp = self.content_manager.asset_stamp(asset_name)
+                    if self.manifest.stamp_unchanged(asset_name, stamp):
+                        continue
+                # copied so it can be sent to a worker, for .pak assets this is where the pages are read
+                data = view_bytes(self.content_manager.asset_data(asset_name))
+            except Exception as ex:
+                # a reader thread that died would stall the pipeline
+                results.put(_failed(asset_name, ex))
+                continue
+            if self.manifest is not None:
+                data_hash = self.manifest.data_hash(data)
+                if self.manifest.hash_unchanged(asset_name, stamp, data_hash):
+                    continue
+            if not _put(raw, (asset_name, data, stamp, data_hash), stop):
+                return
+        _put(raw, None, stop)
+
+    def _parse_stage(self, pool, raw, slots, results, stop):
+        finished = 0
+        while finished < self.readers:
+            item = _get(raw, stop)
+            if item is None:
+                if stop.is_set():
+                    return
+                finished += 1
+                continue
+            if not _put(slots, True, stop):
+                return
+            asset_name, data, stamp, data_hash = item
+            task = (asset_name, data, stamp, data_hash, self.export_dir, self.export_file, self.export_xml,
+                    self.content_manager.compiled)
+            results.put(pool.apply_async(_export_data, (task,)))
+        results.put(None)
+
+
+def _put(stage_queue, item, stop):
+    # blocks while the next stage is full, gives up if the pipeline is stopped
+    while not stop.is_set():
+        try:
+            stage_queue.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(stage_queue, stop):
+    while not stop.is_set():
+        try:
+            return stage_queue.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            pass
+    return None
+
+
+def _failed(asset_name, ex):
+    return asset_name, "FAILED: '{}' {}: {}".format(asset_name, type(ex).__name__, ex)
+
+
+def _init_worker():
+    XNBReader.get_type_reader_manager().import_all_readers()
+
+
+def _export_data(task):
+    asset_name, data, stamp, data_hash, export_dir, export_file, export_xml, compiled = task
+    outputs = []
+    try:
+        asset = XNBReader.load(data=data, compiled=compiled).content
+        if export_dir is not None:
+            outputs = ContentManager.export(asset, asset_name, export_dir, export_file=export_file,
+                                            export_xml=export_xml)
+    except Exception as ex:
+        return _failed(asset_name, ex) + (stamp, data_hash, outputs)
+    return asset_name, None, stamp, data_hash, outputs
@@ -5,41 +5,125 @@ Fez ContentManager
 from __future__ import print_function
 
 import os
+import threading
 
 from xnb_parse.identify import identify_buffer
-from xnb_parse.xna_content_manager import ContentManager
+from xnb_parse.xna_content_manager import ContentManager, make_dirs
 from xnb_parse.xnb_reader import XNBReader
-from xnb_parse.binstream import BinaryStream
+from xnb_parse.binstream import BinaryStream, map_file, write_file
 
 
 class FezContentManager(ContentManager):
     content_pak_files = ['Essentials.pak', 'Updates.pak', 'Other.pak']
 
+    def __init__(self, root_dir, compiled=False, index_file=None, cache_size=0, drop_raw=True):
+        # .pak memory maps, mapped on first use, asset data is sliced out of them without copying
+        self._pak_views = {}
+        self._pak_lock = threading.Lock()
+        super(FezContentManager, self).__init__(root_dir, compiled=compiled, index_file=index_file,
+                                                cache_size=cache_size, drop_raw=drop_raw)
+
+    def __getstate__(self):
+        state = super(FezContentManager, self).__getstate__()
+        del state['_pak_views']
+        del state['_pak_lock']
+        return state
+
+    def __setstate__(self, state):
+        super(FezContentManager, self).__setstate__(state)
+        self._pak_views = {}
+        self._pak_lock = threading.Lock()
+
     def find_assets(self):
         for pak_file in self.content_pak_files:
             filename = os.path.join(self.root_dir, pak_file)
             if os.path.isfile(filename):
-                stream = BinaryStream(filename=filename)
-                capacity = stream.read_int32()
-                for _ in range(capacity):
-                    asset_name = stream.read_string()
-                    asset_size = stream.read_int32()
-                    asset_data = stream.read(asset_size)
-                    asset_name = asset_name.replace('\\', '/')
-                    asset_name = asset_name.lower()
-                    yield asset_name, asset_data
-
-    def xnb(self, asset_name, expected_type=None, parse=True):
+                for asset_name, asset_offset, asset_size in self.pak_entries(pak_file):
+                    yield asset_name, (pak_file, asset_offset, asset_size)
+
+    def pak_entries(self, pak_file):
+        """
+        (asset_name, offset, size) of each asset in a .pak, from the index while the .pak is unchanged
+        """
+        if self.index is None:
+            return self.read_pak_entries(self.pak_view(pak_file))
+        stamp = self.file_stamp(os.path.join(self.root_dir, pak_file))
+        entries = self.index.get_pak(pak_file, stamp)
+        if entries is None:
+            entries = self.read_pak_entries(self.pak_view(pak_file))
+            self.index.set_pak(pak_file, stamp, entries)
+        return entries
+
+    @staticmethod
+    def read_pak_entries(data):
+        """
+        read the table of contents of a .pak, the asset data is skipped
+        """
+        stream = BinaryStream(data=data)
+        entries = []
+        capacity = stream.read_int32()
+        for _ in range(capacity):
+            asset_name = stream.read_string()
+            asset_size = stream.read_int32()
+            asset_name = asset_name.replace('\\', '/')
+            asset_name = asset_name.lower()
+            entries.append((asset_name, stream.tell(), asset_size))
+            stream.skip(asset_size)
+        return entries
+
+    @staticmethod
+    def file_stamp(filename):
+        stat = os.stat(filename)
+        return [stat.st_mtime, stat.st_size]
+
+    def pak_view(self, pak_file):
+        view = self._pak_views.get(pak_file)
+        if view is None:
+            with self._pak_lock:
+                view = self._pak_views.get(pak_file)
+                if view is None:
+                    view = memoryview(map_file(os.path.join(self.root_dir, pak_file)))
+                    self._pak_views[pak_file] = view
+        return view
+
+    def asset_data(self, asset_name):
+        """
+        memoryview of the asset in its .pak, only the pages used are read
+        """
+        pak_file, asset_offset, asset_size = self._asset_dict[asset_name]
+        return self.pak_view(pak_file)[asset_offset:asset_offset + asset_size]
+
+    def close(self):
+        """
+        drop the .pak memory maps, they are mapped again if another asset is used. a map stays open while data
+        sliced from it is still referenced
+        """
+        with self._pak_lock:
+            self._pak_views = {}
+
+    def asset_head(self, asset_name, size):
+        pak_file, asset_offset, asset_size = self._asset_dict[asset_name]
+        return self.pak_view(pak_file)[asset_offset:asset_offset + min(size, asset_size)]
+
+    def data_size(self, asset_name):
+        return self._asset_dict[asset_name][2]
+
+    def asset_stamp(self, asset_name):
+        pak_file, asset_offset, _ = self._asset_dict[asset_name]
+        return self.file_stamp(os.path.join(self.root_dir, pak_file)) + [asset_offset]
+
+    def scan_header(self, asset_name):
+        return XNBReader.scan_header(data=self.asset_data(asset_name))
+
+    def xnb(self, asset_name, expected_type=None, parse=True, fields=None):
         asset_name = asset_name.replace('\\', '/')
         asset_name = asset_name.lower()
-        return XNBReader.load(data=self._asset_dict[asset_name], expected_type=expected_type, parse=parse)
+        return XNBReader.load(data=self.asset_data(asset_name), expected_type=expected_type, parse=parse,
+                              compiled=self.compiled, fields=fields)
 
     def save(self, asset_name, out_dir):
-        asset_data = self._asset_dict[asset_name]
+        asset_data = self.asset_data(asset_name)
         extension = identify_buffer(asset_data)
         filename = os.path.join(out_dir, os.path.normpath(asset_name) + extension)
-        dirname = os.path.dirname(filename)
-        if not os.path.isdir(dirname):
-            os.makedirs(dirname)
-        with open(filename, 'wb') as out_file:
-            out_file.write(asset_data)
+        make_dirs(os.path.dirname(filename))
+        write_file(filename, asset_data)
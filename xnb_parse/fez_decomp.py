@@ -8,27 +8,47 @@ import sys
 import os
 import time
 
+from xnb_parse.export_journal import ExportJournal, JOURNAL_FILENAME
 from xnb_parse.fez_content_manager import FezContentManager
-from xnb_parse.type_reader import ReaderError
+from xnb_parse.xnb_reader import XNB_EXTENSION
 
 
-def unpack(content_dir, out_dir):
+def unpack(content_dir, out_dir, workers=None, resume=False):
     content_manager = FezContentManager(content_dir)
     out_dir = os.path.normpath(out_dir)
-    for asset_name in content_manager.assets:
-        print(asset_name)
-        try:
-            xnb = content_manager.xnb(asset_name, parse=False)
-            out_file = os.path.join(out_dir, os.path.normpath(asset_name))
-            xnb.save(filename=out_file)
-        except ReaderError as ex:
-            print("FAILED: '{}' {}: {}".format(asset_name, type(ex).__name__, ex), file=sys.stderr)
+    journal = ExportJournal(os.path.join(out_dir, JOURNAL_FILENAME), out_dir, resume=resume)
+    asset_names = [asset_name for asset_name in content_manager.assets if not journal.is_done(asset_name)]
+    try:
+        # largest first so the pool doesn't end up waiting on one big asset
+        for asset_name, error in content_manager.decompress_many(asset_names, out_dir, workers=workers,
+                                                                 largest_first=True):
+            print(asset_name)
+            if error is not None:
+                print(error, file=sys.stderr)
+            else:
+                journal.record(asset_name, [asset_name + XNB_EXTENSION])
+        # only an interrupted run is resumed, a later run must see assets that changed since this one
+        journal.clear()
+    finally:
+        journal.close()
 
 
 def main():
-    if len(sys.argv) == 3:
+    args = sys.argv[1:]
+    workers = None
+    resume = False
+    while args and args[0] in ('-j', '--resume'):
+        if args[0] == '--resume':
+            resume = True
+            args = args[1:]
+        elif len(args) > 1:
+            workers = int(args[1])
+            args = args[2:]
+        else:
+            break
+    if len(args) == 2:
         totaltime = time.time()
-        unpack(os.path.normpath(sys.argv[1]), os.path.normpath(sys.argv[2]))
+        unpack(os.path.normpath(args[0]), os.path.normpath(args[1]), workers, resume)
         print('> Done in {:.2f} seconds'.format(time.time() - totaltime))
     else:
-        print('fez_decomp.py Content out_dir', file=sys.stderr)
+        print('fez_decomp.py [-j workers] [--resume] Content out_dir', file=sys.stderr)
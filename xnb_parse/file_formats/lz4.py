@@ -0,0 +1,209 @@
+"""
+LZ4 block compression and decompression for MonoGame XNB content
+"""
+
+from __future__ import print_function
+
+import sys
+
+from xnb_parse.type_reader import ReaderError
+
+
+LZ4_MIN_MATCH = 4
+LZ4_MAX_OFFSET = 0xFFFF
+LZ4_FRAME_SIZE = 0x10000
+# the last match must start at least 12 bytes and end at least 5 bytes before the end of the block
+_LZ4_MF_LIMIT = 12
+_LZ4_LAST_LITERALS = 5
+# (max hash chain depth, insert positions inside matches) for each level, level 0 stores literals only
+LZ4_LEVELS = [None, (1, False), (4, False), (8, True), (16, True), (32, True), (64, True), (128, True), (256, True),
+              (512, True)]
+LZ4_DEFAULT_LEVEL = 4
+
+
+def decompress(in_buf, out_size, partial=False):
+    """
+    decompress an LZ4 block into a preallocated buffer of out_size bytes
+
+    if partial is set in_buf may be cut short, decoding stops at the last complete sequence and only the data
+    decompressed so far is returned
+    """
+    if sys.version < '3':
+        in_buf = bytearray(in_buf)
+    out = bytearray(out_size)
+    in_size = len(in_buf)
+    in_pos = 0
+    out_pos = 0
+    while in_pos < in_size:
+        token = in_buf[in_pos]
+        in_pos += 1
+        literal_length = token >> 4
+        if literal_length == 15:
+            while True:
+                if in_pos >= in_size:
+                    if partial:
+                        return out[:out_pos]
+                    raise ReaderError("LZ4 literal length truncated")
+                extra = in_buf[in_pos]
+                in_pos += 1
+                literal_length += extra
+                if extra != 255:
+                    break
+        if literal_length:
+            literal_end = in_pos + literal_length
+            if literal_end > in_size and partial:
+                return out[:out_pos]
+            if literal_end > in_size or out_pos + literal_length > out_size:
+                raise ReaderError("LZ4 literal run overflow")
+            out[out_pos:out_pos + literal_length] = in_buf[in_pos:literal_end]
+            in_pos = literal_end
+            out_pos += literal_length
+        if in_pos >= in_size:
+            # last sequence has no match
+            break
+        if in_pos + 2 > in_size:
+            if partial:
+                return out[:out_pos]
+            raise ReaderError("LZ4 match offset truncated")
+        offset = in_buf[in_pos] | (in_buf[in_pos + 1] << 8)
+        in_pos += 2
+        if offset == 0 or offset > out_pos:
+            raise ReaderError("LZ4 match offset out of range: {}".format(offset))
+        match_length = token & 15
+        if match_length == 15:
+            while True:
+                if in_pos >= in_size:
+                    if partial:
+                        return out[:out_pos]
+                    raise ReaderError("LZ4 match length truncated")
+                extra = in_buf[in_pos]
+                in_pos += 1
+                match_length += extra
+                if extra != 255:
+                    break
+        match_length += LZ4_MIN_MATCH
+        if out_pos + match_length > out_size:
+            raise ReaderError("LZ4 match overflow")
+        source = out_pos - offset
+        if offset >= match_length:
+            out[out_pos:out_pos + match_length] = out[source:source + match_length]
+        else:
+            pattern = out[source:out_pos]
+            out[out_pos:out_pos + match_length] = (pattern * (match_length // offset + 1))[:match_length]
+        out_pos += match_length
+    if partial:
+        return out[:out_pos]
+    if out_pos != out_size:
+        raise ReaderError("LZ4 decompressed size mismatch: {} != {}".format(out_pos, out_size))
+    return out
+
+
+def iter_decompress(stream, in_size, out_size, read_size=0x1000):
+    """
+    decompress an LZ4 block of in_size bytes read from stream in growing chunks, yields the newly decompressed data
+    after each chunk
+
+    the block has no frames to resume from so each chunk decodes the prefix again, use this to read the start of a block
+    """
+    in_buf = bytearray()
+    done = 0
+    while len(in_buf) < in_size:
+        data = stream.read(min(read_size, in_size - len(in_buf)))
+        if not data:
+            raise ReaderError("LZ4 block truncated: {} != {}".format(len(in_buf), in_size))
+        in_buf += data
+        read_size *= 2
+        out = decompress(in_buf, out_size, partial=len(in_buf) < in_size)
+        if len(out) > done:
+            yield out[done:]
+            done = len(out)
+
+
+def _write_length(out, length):
+    while length >= 255:
+        out.append(255)
+        length -= 255
+    out.append(length)
+
+
+def _write_sequence(out, data, literal_start, literal_end, offset, match_length):
+    literal_length = literal_end - literal_start
+    if match_length:
+        match_extra = match_length - LZ4_MIN_MATCH
+        out.append((min(literal_length, 15) << 4) | min(match_extra, 15))
+    else:
+        out.append(min(literal_length, 15) << 4)
+    if literal_length >= 15:
+        _write_length(out, literal_length - 15)
+    out += data[literal_start:literal_end]
+    if match_length:
+        out.append(offset & 0xFF)
+        out.append(offset >> 8)
+        if match_extra >= 15:
+            _write_length(out, match_extra - 15)
+
+
+def compress_frames(data, level=LZ4_DEFAULT_LEVEL):
+    """
+    compress data as a single LZ4 block, yields the encoded sequences in chunks of roughly LZ4_FRAME_SIZE bytes
+    """
+    if not 0 <= level < len(LZ4_LEVELS):
+        raise ReaderError("Invalid LZ4 compression level: {}".format(level))
+    if sys.version < '3':
+        data = bytearray(data)
+    data_size = len(data)
+    out = bytearray()
+    anchor = 0
+    pos = 0
+    if level:
+        max_chain, insert_all = LZ4_LEVELS[level]
+        head = {}
+        prev = {}
+        match_limit = data_size - _LZ4_MF_LIMIT
+        length_limit = data_size - _LZ4_LAST_LITERALS
+        while pos < match_limit:
+            key = data[pos] | (data[pos + 1] << 8) | (data[pos + 2] << 16) | (data[pos + 3] << 24)
+            candidate = head.get(key, -1)
+            prev[pos] = candidate
+            head[key] = pos
+            prev.pop(pos - LZ4_MAX_OFFSET - 1, None)
+            best_length = 0
+            best_offset = 0
+            max_length = length_limit - pos
+            min_pos = pos - LZ4_MAX_OFFSET
+            chain = max_chain
+            while candidate >= min_pos and candidate >= 0 and chain:
+                if best_length < max_length and data[candidate + best_length] == data[pos + best_length]:
+                    length = LZ4_MIN_MATCH
+                    while length + 16 <= max_length and \
+                            data[candidate + length:candidate + length + 16] == data[pos + length:pos + length + 16]:
+                        length += 16
+                    while length < max_length and data[candidate + length] == data[pos + length]:
+                        length += 1
+                    if length > best_length:
+                        best_length = length
+                        best_offset = pos - candidate
+                        if length == max_length:
+                            break
+                candidate = prev.get(candidate, -1)
+                chain -= 1
+            if best_length < LZ4_MIN_MATCH:
+                pos += 1
+                continue
+            _write_sequence(out, data, anchor, pos, best_offset, best_length)
+            match_end = pos + best_length
+            if insert_all:
+                insert_end = min(match_end, match_limit)
+                pos += 1
+                while pos < insert_end:
+                    key = data[pos] | (data[pos + 1] << 8) | (data[pos + 2] << 16) | (data[pos + 3] << 24)
+                    prev[pos] = head.get(key, -1)
+                    head[key] = pos
+                    prev.pop(pos - LZ4_MAX_OFFSET - 1, None)
+                    pos += 1
+            pos = anchor = match_end
+            if len(out) >= LZ4_FRAME_SIZE:
+                yield bytes(out)
+                out = bytearray()
+    _write_sequence(out, data, anchor, data_size, 0, 0)
+    yield bytes(out)
@@ -0,0 +1,863 @@
+"""
+LZX compression and decompression for XNB content
+"""
+
+from __future__ import print_function
+
+import heapq
+import struct
+import sys
+from bisect import bisect_right
+
+from xnb_parse.type_reader import ReaderError
+
+
+LZX_WINDOW_BITS = 16
+LZX_FRAME_SIZE = 0x8000
+
+BLOCKTYPE_VERBATIM = 1
+BLOCKTYPE_ALIGNED = 2
+BLOCKTYPE_UNCOMPRESSED = 3
+
+MIN_MATCH = 2
+NUM_CHARS = 256
+NUM_PRIMARY_LENGTHS = 7
+NUM_SECONDARY_LENGTHS = 249
+PRETREE_NUM_ELEMENTS = 20
+ALIGNED_NUM_ELEMENTS = 8
+POSITION_SLOTS = {15: 30, 16: 32, 17: 34, 18: 36, 19: 38, 20: 42, 21: 50}
+MAX_MATCH = MIN_MATCH + NUM_PRIMARY_LENGTHS + NUM_SECONDARY_LENGTHS - 1
+_MIN_HASH_MATCH = 3
+_MAIN_TREE_MAX_BITS = 16
+_PRETREE_MAX_BITS = 15
+_ALIGNED_MAX_BITS = 7
+# (max hash chain depth, lazy matching) for each compression level, level 0 stores frames uncompressed
+LZX_LEVELS = [None, (4, False), (8, False), (16, False), (32, False), (16, True), (32, True), (64, True),
+              (128, True), (256, True)]
+LZX_DEFAULT_LEVEL = 5
+
+_E8_MAX_FRAMES = 32768
+_E8_MIN_FRAME = 10
+
+
+def _build_extra_bits():
+    extra_bits = []
+    bits = 0
+    for i in range(0, 52, 2):
+        extra_bits.extend([bits, bits])
+        if i != 0 and bits < 17:
+            bits += 1
+    return extra_bits
+
+
+EXTRA_BITS = _build_extra_bits()
+POSITION_BASE = [0]
+for _bits in EXTRA_BITS[:-1]:
+    POSITION_BASE.append(POSITION_BASE[-1] + (1 << _bits))
+del _bits
+
+_UINT32_3 = struct.Struct('<3I')
+_INT32 = struct.Struct('<i')
+
+
+def make_decode_table(lengths):
+    """
+    build a flat lookup table for a canonical huffman code read MSB first
+
+    entries are (symbol << 5) | code_length, indexed by the next table_bits bits of input, unused entries are -1
+    """
+    table_bits = max(lengths) if lengths else 0
+    if not table_bits:
+        return [], 0
+    by_length = [[] for _ in range(table_bits + 1)]
+    for symbol, length in enumerate(lengths):
+        if length:
+            by_length[length].append(symbol)
+    table_size = 1 << table_bits
+    table = [-1] * table_size
+    pos = 0
+    for length in range(1, table_bits + 1):
+        fill = 1 << (table_bits - length)
+        for symbol in by_length[length]:
+            if pos + fill > table_size:
+                raise ReaderError("LZX huffman table overrun")
+            table[pos:pos + fill] = [(symbol << 5) | length] * fill
+            pos += fill
+    return table, table_bits
+
+
+class LzxDecoder(object):
+    """
+    LZX decoder state, window and trees persist across frames
+    """
+
+    def __init__(self, window_bits=LZX_WINDOW_BITS):
+        if window_bits not in POSITION_SLOTS:
+            raise ReaderError("Unsupported LZX window size: {}".format(window_bits))
+        self.window_size = 1 << window_bits
+        self.window = bytearray(self.window_size)
+        self.window_posn = 0
+        self.main_elements = NUM_CHARS + (POSITION_SLOTS[window_bits] << 3)
+        self.r0 = self.r1 = self.r2 = 1
+        self.header_read = False
+        self.block_type = None
+        self.block_length = 0
+        self.block_remaining = 0
+        self.main_lengths = [0] * self.main_elements
+        self.length_lengths = [0] * NUM_SECONDARY_LENGTHS
+        self.main_table = self.length_table = self.aligned_table = None
+        self.main_bits = self.length_bits = self.aligned_bits = 0
+        self.intel_started = False
+        self.intel_filesize = 0
+        self.intel_curpos = 0
+        self.frames_read = 0
+        # per frame bit reader state
+        self._data = None
+        self._start = 0
+        self._inpos = 0
+        self._end = 0
+        self._bitbuf = 0
+        self._bitsleft = 0
+
+    def _ensure_bits(self, count):
+        data = self._data
+        bitbuf = self._bitbuf
+        bitsleft = self._bitsleft
+        inpos = self._inpos
+        while bitsleft < count:
+            if inpos + 1 < self._end:
+                word = data[inpos] | (data[inpos + 1] << 8)
+            else:
+                word = 0
+            bitbuf = ((bitbuf & ((1 << bitsleft) - 1)) << 16) | word
+            inpos += 2
+            bitsleft += 16
+        self._bitbuf = bitbuf
+        self._bitsleft = bitsleft
+        self._inpos = inpos
+
+    def _read_bits(self, count):
+        self._ensure_bits(count)
+        self._bitsleft -= count
+        return (self._bitbuf >> self._bitsleft) & ((1 << count) - 1)
+
+    def _read_symbol(self, table, table_bits):
+        if not table_bits:
+            raise ReaderError("LZX symbol read from empty tree")
+        self._ensure_bits(table_bits)
+        entry = table[(self._bitbuf >> (self._bitsleft - table_bits)) & ((1 << table_bits) - 1)]
+        if entry < 0:
+            raise ReaderError("Invalid LZX huffman code")
+        self._bitsleft -= entry & 31
+        return entry >> 5
+
+    def _read_lengths(self, lengths, first, last):
+        # lengths are delta coded against the previous block's lengths
+        pretree_lengths = [self._read_bits(4) for _ in range(PRETREE_NUM_ELEMENTS)]
+        pretree, pretree_bits = make_decode_table(pretree_lengths)
+        size = len(lengths)
+        pos = first
+        while pos < last:
+            code = self._read_symbol(pretree, pretree_bits)
+            if code == 17:
+                run = self._read_bits(4) + 4
+                value = 0
+            elif code == 18:
+                run = self._read_bits(5) + 20
+                value = 0
+            elif code == 19:
+                run = self._read_bits(1) + 4
+                code = self._read_symbol(pretree, pretree_bits)
+                value = (lengths[pos] - code) % 17
+            else:
+                run = 1
+                value = (lengths[pos] - code) % 17
+            stop = min(pos + run, size)
+            lengths[pos:stop] = [value] * (stop - pos)
+            pos += run
+
+    def _reset_bits(self):
+        self._bitbuf = 0
+        self._bitsleft = 0
+
+    def _read_block_header(self):
+        if self.block_type == BLOCKTYPE_UNCOMPRESSED:
+            # realign bitstream to word after an uncompressed block
+            if self.block_length & 1:
+                self._inpos += 1
+            self._reset_bits()
+        self.block_type = self._read_bits(3)
+        block_hi = self._read_bits(16)
+        block_lo = self._read_bits(8)
+        self.block_remaining = self.block_length = (block_hi << 8) | block_lo
+        if self.block_type == BLOCKTYPE_ALIGNED:
+            aligned_lengths = [self._read_bits(3) for _ in range(ALIGNED_NUM_ELEMENTS)]
+            self.aligned_table, self.aligned_bits = make_decode_table(aligned_lengths)
+        if self.block_type == BLOCKTYPE_VERBATIM or self.block_type == BLOCKTYPE_ALIGNED:
+            self._read_lengths(self.main_lengths, 0, NUM_CHARS)
+            self._read_lengths(self.main_lengths, NUM_CHARS, self.main_elements)
+            self.main_table, self.main_bits = make_decode_table(self.main_lengths)
+            if self.main_lengths[0xE8]:
+                self.intel_started = True
+            self._read_lengths(self.length_lengths, 0, NUM_SECONDARY_LENGTHS)
+            self.length_table, self.length_bits = make_decode_table(self.length_lengths)
+        elif self.block_type == BLOCKTYPE_UNCOMPRESSED:
+            self.intel_started = True
+            # skip 1-16 bits to align to the next word, then switch to reading bytes
+            consumed = (self._inpos - self._start) * 8 - self._bitsleft
+            self._inpos = self._start + ((consumed >> 4) + 1) * 2
+            self._reset_bits()
+            if self._inpos + 12 > self._end:
+                raise ReaderError("LZX uncompressed block header truncated")
+            self.r0, self.r1, self.r2 = _UINT32_3.unpack_from(self._data, self._inpos)
+            self._inpos += 12
+        else:
+            raise ReaderError("Invalid LZX block type: {}".format(self.block_type))
+
+    def decompress_frame(self, data, in_pos, in_size, out, out_pos, frame_size):
+        """
+        decompress one frame of in_size bytes from data[in_pos:] into out[out_pos:out_pos + frame_size]
+        """
+        if sys.version < '3':
+            data = bytearray(data[in_pos:in_pos + in_size])
+            in_pos = 0
+        self._data = data
+        self._start = self._inpos = in_pos
+        self._end = in_pos + in_size
+        self._reset_bits()
+
+        if not self.header_read:
+            if self._read_bits(1):
+                intel_hi = self._read_bits(16)
+                intel_lo = self._read_bits(16)
+                self.intel_filesize = (intel_hi << 16) | intel_lo
+            self.header_read = True
+
+        frame_start = self.window_posn
+        if frame_start + frame_size > self.window_size:
+            raise ReaderError("LZX frame overruns window: {} + {} > {}".format(frame_start, frame_size,
+                                                                              self.window_size))
+        togo = frame_size
+        while togo > 0:
+            if self.block_remaining == 0:
+                self._read_block_header()
+            this_run = min(self.block_remaining, togo)
+            togo -= this_run
+            self.block_remaining -= this_run
+            if self.block_type == BLOCKTYPE_UNCOMPRESSED:
+                inpos = self._inpos
+                if inpos + this_run > self._end:
+                    raise ReaderError("LZX uncompressed block truncated")
+                window_posn = self.window_posn
+                self.window[window_posn:window_posn + this_run] = data[inpos:inpos + this_run]
+                self.window_posn = window_posn + this_run
+                self._inpos = inpos + this_run
+            else:
+                self._decode_run(this_run)
+        if self.window_posn - frame_start != frame_size:
+            raise ReaderError("LZX decode overran frame: {} != {}".format(self.window_posn - frame_start,
+                                                                          frame_size))
+
+        if self.intel_started and self.intel_filesize and self.frames_read < _E8_MAX_FRAMES and \
+                frame_size > _E8_MIN_FRAME:
+            frame = self.window[frame_start:frame_start + frame_size]
+            self._intel_e8(frame, frame_size)
+            out[out_pos:out_pos + frame_size] = frame
+        else:
+            out[out_pos:out_pos + frame_size] = memoryview(self.window)[frame_start:frame_start + frame_size]
+        self.frames_read += 1
+        self.intel_curpos += frame_size
+        if self.window_posn == self.window_size:
+            self.window_posn = 0
+        self._data = None
+        return frame_size
+
+    def _intel_e8(self, frame, frame_size):
+        curpos = self.intel_curpos
+        filesize = self.intel_filesize
+        end = frame_size - _E8_MIN_FRAME
+        pos = frame.find(b'\xe8', 0, end)
+        while pos >= 0:
+            abs_off = _INT32.unpack_from(frame, pos + 1)[0]
+            cur_off = curpos + pos
+            if -cur_off <= abs_off < filesize:
+                if abs_off >= 0:
+                    rel_off = abs_off - cur_off
+                else:
+                    rel_off = abs_off + filesize
+                _INT32.pack_into(frame, pos + 1, rel_off)
+            pos = frame.find(b'\xe8', pos + 5, end)
+
+    def _decode_run(self, this_run):
+        # hot loop, all state in locals
+        data = self._data
+        inpos = self._inpos
+        end = self._end
+        bitbuf = self._bitbuf
+        bitsleft = self._bitsleft
+        window = self.window
+        window_posn = self.window_posn
+        window_size = self.window_size
+        r0, r1, r2 = self.r0, self.r1, self.r2
+        main_table = self.main_table
+        main_bits = self.main_bits
+        main_mask = (1 << main_bits) - 1
+        length_table = self.length_table
+        length_bits = self.length_bits
+        length_mask = (1 << length_bits) - 1
+        aligned = self.block_type == BLOCKTYPE_ALIGNED
+        aligned_table = self.aligned_table
+        aligned_bits = self.aligned_bits
+        aligned_mask = (1 << aligned_bits) - 1
+        extra_bits_table = EXTRA_BITS
+        position_base = POSITION_BASE
+        if not main_bits:
+            raise ReaderError("LZX main tree empty")
+
+        while this_run > 0:
+            while bitsleft < 17:
+                if inpos + 1 < end:
+                    bitbuf = ((bitbuf & ((1 << bitsleft) - 1)) << 16) | data[inpos] | (data[inpos + 1] << 8)
+                else:
+                    bitbuf = (bitbuf & ((1 << bitsleft) - 1)) << 16
+                inpos += 2
+                bitsleft += 16
+            entry = main_table[(bitbuf >> (bitsleft - main_bits)) & main_mask]
+            if entry < 0:
+                raise ReaderError("Invalid LZX main tree code")
+            bitsleft -= entry & 31
+            main_element = entry >> 5
+            if main_element < NUM_CHARS:
+                window[window_posn] = main_element
+                window_posn += 1
+                this_run -= 1
+                continue
+
+            main_element -= NUM_CHARS
+            match_length = main_element & NUM_PRIMARY_LENGTHS
+            if match_length == NUM_PRIMARY_LENGTHS:
+                if not length_bits:
+                    raise ReaderError("LZX length tree empty")
+                while bitsleft < 17:
+                    if inpos + 1 < end:
+                        bitbuf = ((bitbuf & ((1 << bitsleft) - 1)) << 16) | data[inpos] | (data[inpos + 1] << 8)
+                    else:
+                        bitbuf = (bitbuf & ((1 << bitsleft) - 1)) << 16
+                    inpos += 2
+                    bitsleft += 16
+                entry = length_table[(bitbuf >> (bitsleft - length_bits)) & length_mask]
+                if entry < 0:
+                    raise ReaderError("Invalid LZX length tree code")
+                bitsleft -= entry & 31
+                match_length += entry >> 5
+            match_length += MIN_MATCH
+
+            match_offset = main_element >> 3
+            if match_offset > 2:
+                if match_offset == 3:
+                    match_offset = 1
+                else:
+                    extra = extra_bits_table[match_offset]
+                    match_offset = position_base[match_offset] - 2
+                    while bitsleft < 17:
+                        if inpos + 1 < end:
+                            bitbuf = ((bitbuf & ((1 << bitsleft) - 1)) << 16) | data[inpos] | (data[inpos + 1] << 8)
+                        else:
+                            bitbuf = (bitbuf & ((1 << bitsleft) - 1)) << 16
+                        inpos += 2
+                        bitsleft += 16
+                    if aligned and extra >= 3:
+                        extra -= 3
+                        if extra:
+                            bitsleft -= extra
+                            match_offset += ((bitbuf >> bitsleft) & ((1 << extra) - 1)) << 3
+                            while bitsleft < 17:
+                                if inpos + 1 < end:
+                                    bitbuf = (((bitbuf & ((1 << bitsleft) - 1)) << 16) | data[inpos] |
+                                              (data[inpos + 1] << 8))
+                                else:
+                                    bitbuf = (bitbuf & ((1 << bitsleft) - 1)) << 16
+                                inpos += 2
+                                bitsleft += 16
+                        if not aligned_bits:
+                            raise ReaderError("LZX aligned tree empty")
+                        entry = aligned_table[(bitbuf >> (bitsleft - aligned_bits)) & aligned_mask]
+                        if entry < 0:
+                            raise ReaderError("Invalid LZX aligned tree code")
+                        bitsleft -= entry & 31
+                        match_offset += entry >> 5
+                    else:
+                        bitsleft -= extra
+                        match_offset += (bitbuf >> bitsleft) & ((1 << extra) - 1)
+                r2 = r1
+                r1 = r0
+                r0 = match_offset
+            elif match_offset == 0:
+                match_offset = r0
+            elif match_offset == 1:
+                match_offset = r1
+                r1 = r0
+                r0 = match_offset
+            else:
+                match_offset = r2
+                r2 = r0
+                r0 = match_offset
+
+            if window_posn + match_length > window_size:
+                raise ReaderError("LZX match overran window")
+            source = window_posn - match_offset
+            if source >= 0:
+                if match_offset >= match_length:
+                    window[window_posn:window_posn + match_length] = window[source:source + match_length]
+                else:
+                    pattern = window[source:window_posn]
+                    window[window_posn:window_posn + match_length] = \
+                        (pattern * (match_length // match_offset + 1))[:match_length]
+            else:
+                if match_offset > window_size:
+                    raise ReaderError("LZX match offset out of range: {}".format(match_offset))
+                source += window_size
+                for i in range(match_length):
+                    window[window_posn + i] = window[(source + i) & (window_size - 1)]
+            window_posn += match_length
+            this_run -= match_length
+
+        if this_run < 0:
+            # match ran past the end of this run, take it from the rest of the block
+            if -this_run > self.block_remaining:
+                raise ReaderError("LZX match overran block")
+            self.block_remaining += this_run
+        self._inpos = inpos
+        self._bitbuf = bitbuf
+        self._bitsleft = bitsleft
+        self.window_posn = window_posn
+        self.r0, self.r1, self.r2 = r0, r1, r2
+
+
+def decompress(in_buf, out_size):
+    """
+    decompress XNB LZX payload, a series of frames each prefixed with its compressed and uncompressed sizes
+    """
+    decoder = LzxDecoder()
+    out = bytearray(out_size)
+    in_size = len(in_buf)
+    if sys.version < '3':
+        in_buf = bytearray(in_buf)
+    elif isinstance(in_buf, memoryview):
+        # indexing bytes is noticeably faster than indexing a memoryview in the bit reader
+        in_buf = in_buf.tobytes()
+    in_pos = 0
+    out_pos = 0
+    while in_pos < in_size and out_pos < out_size:
+        if in_pos + 2 > in_size:
+            raise ReaderError("LZX frame header truncated")
+        block_hi = in_buf[in_pos]
+        block_lo = in_buf[in_pos + 1]
+        block_size = (block_hi << 8) | block_lo
+        frame_size = LZX_FRAME_SIZE
+        if block_hi == 0xFF:
+            if in_pos + 5 > in_size:
+                raise ReaderError("LZX frame header truncated")
+            frame_size = (block_lo << 8) | in_buf[in_pos + 2]
+            block_size = (in_buf[in_pos + 3] << 8) | in_buf[in_pos + 4]
+            in_pos += 5
+        else:
+            in_pos += 2
+        if block_size == 0 or frame_size == 0:
+            break
+        if in_pos + block_size > in_size:
+            raise ReaderError("LZX frame truncated: {} > {}".format(in_pos + block_size, in_size))
+        frame_size = min(frame_size, out_size - out_pos)
+        decoder.decompress_frame(in_buf, in_pos, block_size, out, out_pos, frame_size)
+        in_pos += block_size
+        out_pos += frame_size
+    if out_pos != out_size:
+        raise ReaderError("LZX decompressed size mismatch: {} != {}".format(out_pos, out_size))
+    return out
+
+
+def iter_decompress(stream, in_size, out_size):
+    """
+    decompress XNB LZX payload of in_size bytes read from stream one frame at a time, yields each decompressed frame
+    """
+    decoder = LzxDecoder()
+    in_end = stream.tell() + in_size
+    out_pos = 0
+    while stream.tell() < in_end and out_pos < out_size:
+        header = bytearray(stream.read(2))
+        if len(header) != 2:
+            raise ReaderError("LZX frame header truncated")
+        block_size = (header[0] << 8) | header[1]
+        frame_size = LZX_FRAME_SIZE
+        if header[0] == 0xFF:
+            header = bytearray(stream.read(3))
+            if len(header) != 3:
+                raise ReaderError("LZX frame header truncated")
+            frame_size = (block_size & 0xFF) << 8 | header[0]
+            block_size = (header[1] << 8) | header[2]
+        if block_size == 0 or frame_size == 0:
+            break
+        data = stream.read(block_size)
+        if len(data) != block_size:
+            raise ReaderError("LZX frame truncated: {} != {}".format(len(data), block_size))
+        frame_size = min(frame_size, out_size - out_pos)
+        frame = bytearray(frame_size)
+        decoder.decompress_frame(data, 0, block_size, frame, 0, frame_size)
+        out_pos += frame_size
+        yield frame
+    if out_pos != out_size:
+        raise ReaderError("LZX decompressed size mismatch: {} != {}".format(out_pos, out_size))
+
+
+class _BitWriter(object):
+    def __init__(self):
+        self.out = bytearray()
+        self.bitbuf = 0
+        self.bitcount = 0
+
+    def write_bits(self, value, count):
+        bitbuf = (self.bitbuf << count) | value
+        bitcount = self.bitcount + count
+        while bitcount >= 16:
+            bitcount -= 16
+            word = (bitbuf >> bitcount) & 0xFFFF
+            self.out.append(word & 0xFF)
+            self.out.append(word >> 8)
+        self.bitbuf = bitbuf & ((1 << bitcount) - 1)
+        self.bitcount = bitcount
+
+    def align(self):
+        if self.bitcount:
+            self.write_bits(0, 16 - self.bitcount)
+
+
+def make_code_lengths(freqs, max_bits):
+    """
+    huffman code lengths for freqs, limited to max_bits, every used tree has at least two codes
+    """
+    lengths = [0] * len(freqs)
+    used = [symbol for symbol, freq in enumerate(freqs) if freq]
+    if not used:
+        return lengths
+    if len(used) == 1:
+        used.append(1 if used[0] == 0 else 0)
+        used.sort()
+        for symbol in used:
+            lengths[symbol] = 1
+        return lengths
+    weights = [freqs[symbol] for symbol in used]
+    count = len(used)
+    while True:
+        heap = [(weight, node) for node, weight in enumerate(weights)]
+        heapq.heapify(heap)
+        parent = [0] * (count * 2 - 1)
+        next_node = count
+        while len(heap) > 1:
+            weight_a, node_a = heapq.heappop(heap)
+            weight_b, node_b = heapq.heappop(heap)
+            parent[node_a] = parent[node_b] = next_node
+            heapq.heappush(heap, (weight_a + weight_b, next_node))
+            next_node += 1
+        depth = [0] * next_node
+        for node in range(next_node - 2, -1, -1):
+            depth[node] = depth[parent[node]] + 1
+        if max(depth[:count]) <= max_bits:
+            break
+        weights = [(weight >> 1) | 1 for weight in weights]
+    for node, symbol in enumerate(used):
+        lengths[symbol] = depth[node]
+    return lengths
+
+
+def make_codes(lengths):
+    codes = [0] * len(lengths)
+    code = 0
+    for length in range(1, max(lengths) + 1 if lengths else 1):
+        for symbol, symbol_length in enumerate(lengths):
+            if symbol_length == length:
+                codes[symbol] = code
+                code += 1
+        code <<= 1
+    return codes
+
+
+def _position_slot(formatted_offset):
+    return bisect_right(POSITION_BASE, formatted_offset) - 1
+
+
+class LzxEncoder(object):
+    """
+    LZX encoder producing one block per frame, window and tree state persist across frames like the decoder
+    """
+
+    def __init__(self, level=LZX_DEFAULT_LEVEL, window_bits=LZX_WINDOW_BITS):
+        if window_bits not in POSITION_SLOTS:
+            raise ReaderError("Unsupported LZX window size: {}".format(window_bits))
+        if not 0 <= level < len(LZX_LEVELS):
+            raise ReaderError("Invalid LZX compression level: {}".format(level))
+        self.level = level
+        self.window_size = 1 << window_bits
+        self.max_offset = self.window_size - 3
+        self.main_elements = NUM_CHARS + (POSITION_SLOTS[window_bits] << 3)
+        self.r0 = self.r1 = self.r2 = 1
+        self.main_lengths = [0] * self.main_elements
+        self.length_lengths = [0] * NUM_SECONDARY_LENGTHS
+        self.header_written = False
+        self._head = {}
+        self._prev = {}
+
+    def compress_frame(self, data, start, end):
+        """
+        compress data[start:end] as one frame, data must include the preceding window
+        """
+        bits = _BitWriter()
+        if not self.header_written:
+            # no E8 translation
+            bits.write_bits(0, 1)
+            self.header_written = True
+        if self.level == 0:
+            self._write_uncompressed(bits, data, start, end)
+            return bytes(bits.out)
+        saved = self.r0, self.r1, self.r2, list(self.main_lengths), list(self.length_lengths)
+        tokens = self._parse(data, start, end)
+        compressed = _BitWriter()
+        compressed.bitbuf, compressed.bitcount, compressed.out = bits.bitbuf, bits.bitcount, bytearray(bits.out)
+        self._write_compressed(compressed, tokens, end - start)
+        if len(compressed.out) < end - start + 16:
+            return bytes(compressed.out)
+        self.r0, self.r1, self.r2, self.main_lengths, self.length_lengths = saved
+        self._write_uncompressed(bits, data, start, end)
+        return bytes(bits.out)
+
+    def _write_uncompressed(self, bits, data, start, end):
+        size = end - start
+        bits.write_bits(BLOCKTYPE_UNCOMPRESSED, 3)
+        bits.write_bits(size >> 8, 16)
+        bits.write_bits(size & 0xFF, 8)
+        # decoder skips 1-16 bits to realign
+        if bits.bitcount:
+            bits.align()
+        else:
+            bits.write_bits(0, 16)
+        bits.out += _UINT32_3.pack(self.r0, self.r1, self.r2)
+        bits.out += data[start:end]
+
+    def _parse(self, data, start, end):
+        max_chain, lazy = LZX_LEVELS[self.level]
+        head = self._head
+        prev = self._prev
+        max_offset = self.max_offset
+        tokens = []
+        pos = start
+        hash_end = end - _MIN_HASH_MATCH + 1
+        pending = None
+        while pos < end:
+            if pos < hash_end:
+                key = (data[pos] << 16) | (data[pos + 1] << 8) | data[pos + 2]
+                candidate = head.get(key, -1)
+                prev[pos] = candidate
+                head[key] = pos
+                # trim chains that fell out of the window
+                prev.pop(pos - self.window_size, None)
+            else:
+                candidate = -1
+            best_length = 0
+            best_offset = 0
+            max_length = min(MAX_MATCH, end - pos)
+            min_pos = pos - max_offset
+            chain = max_chain
+            while candidate >= min_pos and candidate >= 0 and chain:
+                if data[candidate + best_length if best_length < max_length else candidate] == \
+                        data[pos + best_length if best_length < max_length else pos]:
+                    length = _MIN_HASH_MATCH
+                    while length + 16 <= max_length and \
+                            data[candidate + length:candidate + length + 16] == data[pos + length:pos + length + 16]:
+                        length += 16
+                    while length < max_length and data[candidate + length] == data[pos + length]:
+                        length += 1
+                    if length > best_length:
+                        best_length = length
+                        best_offset = pos - candidate
+                        if length == max_length:
+                            break
+                candidate = prev.get(candidate, -1)
+                chain -= 1
+            if pending is not None:
+                if best_length > pending[0]:
+                    tokens.append(data[pos - 1])
+                else:
+                    tokens.append(pending)
+                    skip_end = pos - 1 + pending[0]
+                    pos += 1
+                    while pos < skip_end:
+                        self._insert(data, pos, hash_end)
+                        pos += 1
+                    pending = None
+                    continue
+                pending = None
+            if best_length >= _MIN_HASH_MATCH:
+                if lazy and best_length < 32 and pos + 1 < end:
+                    pending = (best_length, best_offset)
+                    pos += 1
+                    continue
+                tokens.append((best_length, best_offset))
+                match_end = pos + best_length
+                pos += 1
+                while pos < match_end:
+                    self._insert(data, pos, hash_end)
+                    pos += 1
+            else:
+                tokens.append(data[pos])
+                pos += 1
+        if pending is not None:
+            tokens.append(pending)
+        return tokens
+
+    def _insert(self, data, pos, hash_end):
+        if pos < hash_end:
+            key = (data[pos] << 16) | (data[pos + 1] << 8) | data[pos + 2]
+            self._prev[pos] = self._head.get(key, -1)
+            self._head[key] = pos
+            self._prev.pop(pos - self.window_size, None)
+
+    def _write_compressed(self, bits, tokens, size):
+        main_freqs = [0] * self.main_elements
+        length_freqs = [0] * NUM_SECONDARY_LENGTHS
+        aligned_freqs = [0] * ALIGNED_NUM_ELEMENTS
+        r0, r1, r2 = self.r0, self.r1, self.r2
+        symbols = []
+        for token in tokens:
+            if not isinstance(token, tuple):
+                main_freqs[token] += 1
+                symbols.append(token)
+                continue
+            match_length, match_offset = token
+            if match_offset == r0:
+                slot = 0
+            elif match_offset == r1:
+                slot = 1
+                r1 = r0
+                r0 = match_offset
+            elif match_offset == r2:
+                slot = 2
+                r2 = r0
+                r0 = match_offset
+            else:
+                slot = _position_slot(match_offset + 2)
+                r2 = r1
+                r1 = r0
+                r0 = match_offset
+            length_header = min(match_length - MIN_MATCH, NUM_PRIMARY_LENGTHS)
+            main_element = NUM_CHARS + (slot << 3) + length_header
+            main_freqs[main_element] += 1
+            if length_header == NUM_PRIMARY_LENGTHS:
+                length_freqs[match_length - MIN_MATCH - NUM_PRIMARY_LENGTHS] += 1
+            footer = 0
+            if slot > 3:
+                footer = match_offset + 2 - POSITION_BASE[slot]
+                if EXTRA_BITS[slot] >= 3:
+                    aligned_freqs[footer & 7] += 1
+            symbols.append((main_element, match_length, slot, footer))
+        self.r0, self.r1, self.r2 = r0, r1, r2
+
+        aligned_lengths = make_code_lengths(aligned_freqs, _ALIGNED_MAX_BITS)
+        aligned_cost = sum(f * l for f, l in zip(aligned_freqs, aligned_lengths)) + 3 * ALIGNED_NUM_ELEMENTS
+        use_aligned = aligned_cost < 3 * sum(aligned_freqs)
+
+        main_lengths = make_code_lengths(main_freqs, _MAIN_TREE_MAX_BITS)
+        length_lengths = make_code_lengths(length_freqs, _MAIN_TREE_MAX_BITS)
+        main_codes = make_codes(main_lengths)
+        length_codes = make_codes(length_lengths)
+
+        if use_aligned:
+            bits.write_bits(BLOCKTYPE_ALIGNED, 3)
+        else:
+            bits.write_bits(BLOCKTYPE_VERBATIM, 3)
+        bits.write_bits(size >> 8, 16)
+        bits.write_bits(size & 0xFF, 8)
+        if use_aligned:
+            aligned_codes = make_codes(aligned_lengths)
+            for length in aligned_lengths:
+                bits.write_bits(length, 3)
+        self._write_lengths(bits, self.main_lengths, main_lengths, 0, NUM_CHARS)
+        self._write_lengths(bits, self.main_lengths, main_lengths, NUM_CHARS, self.main_elements)
+        self._write_lengths(bits, self.length_lengths, length_lengths, 0, NUM_SECONDARY_LENGTHS)
+        self.main_lengths = main_lengths
+        self.length_lengths = length_lengths
+
+        write_bits = bits.write_bits
+        for symbol in symbols:
+            if not isinstance(symbol, tuple):
+                write_bits(main_codes[symbol], main_lengths[symbol])
+                continue
+            main_element, match_length, slot, footer = symbol
+            write_bits(main_codes[main_element], main_lengths[main_element])
+            if main_element & 7 == NUM_PRIMARY_LENGTHS:
+                length_footer = match_length - MIN_MATCH - NUM_PRIMARY_LENGTHS
+                write_bits(length_codes[length_footer], length_lengths[length_footer])
+            if slot > 3:
+                extra = EXTRA_BITS[slot]
+                if use_aligned and extra >= 3:
+                    if extra > 3:
+                        write_bits(footer >> 3, extra - 3)
+                    write_bits(aligned_codes[footer & 7], aligned_lengths[footer & 7])
+                else:
+                    write_bits(footer, extra)
+        bits.align()
+
+    @staticmethod
+    def _write_lengths(bits, prev_lengths, lengths, first, last):
+        items = []
+        pos = first
+        while pos < last:
+            value = lengths[pos]
+            run = 1
+            while pos + run < last and lengths[pos + run] == value:
+                run += 1
+            if value == 0 and run >= 20:
+                run = min(run, 51)
+                items.append((18, run - 20, 5, None))
+            elif value == 0 and run >= 4:
+                run = min(run, 19)
+                items.append((17, run - 4, 4, None))
+            elif run >= 4:
+                run = min(run, 5)
+                items.append((19, run - 4, 1, (prev_lengths[pos] - value) % 17))
+            else:
+                run = 1
+                items.append(((prev_lengths[pos] - value) % 17, 0, 0, None))
+            pos += run
+        freqs = [0] * PRETREE_NUM_ELEMENTS
+        for code, _, _, code19 in items:
+            freqs[code] += 1
+            if code19 is not None:
+                freqs[code19] += 1
+        pretree_lengths = make_code_lengths(freqs, _PRETREE_MAX_BITS)
+        pretree_codes = make_codes(pretree_lengths)
+        for length in pretree_lengths:
+            bits.write_bits(length, 4)
+        for code, extra, extra_bits, code19 in items:
+            bits.write_bits(pretree_codes[code], pretree_lengths[code])
+            if extra_bits:
+                bits.write_bits(extra, extra_bits)
+            if code19 is not None:
+                bits.write_bits(pretree_codes[code19], pretree_lengths[code19])
+
+
+def compress_frames(data, level=LZX_DEFAULT_LEVEL):
+    """
+    compress data as XNB LZX frames, yields each frame with its size header
+    """
+    if sys.version < '3':
+        data = bytearray(data)
+    encoder = LzxEncoder(level)
+    data_size = len(data)
+    for start in range(0, data_size, LZX_FRAME_SIZE):
+        end = min(start + LZX_FRAME_SIZE, data_size)
+        frame = encoder.compress_frame(data, start, end)
+        frame_size = end - start
+        if frame_size == LZX_FRAME_SIZE:
+            header = bytearray([len(frame) >> 8, len(frame) & 0xFF])
+        else:
+            header = bytearray([0xFF, frame_size >> 8, frame_size & 0xFF, len(frame) >> 8, len(frame) & 0xFF])
+        yield bytes(header) + frame
@@ -23,10 +23,13 @@ def read_xact(in_xgs_file, in_xsb_file, in_xwb_file, out_dir=None):
     in_xwb_file = os.path.normpath(in_xwb_file)
     print(in_xwb_file)
     xwb = XWB(filename=in_xwb_file, audio_engine=xgs)
-    if out_dir is not None:
-        xgs.export(out_dir)
-        xsb.export(out_dir)
-        xwb.export(out_dir)
+    try:
+        if out_dir is not None:
+            xgs.export(out_dir)
+            xsb.export(out_dir)
+            xwb.export(out_dir)
+    finally:
+        xwb.close()
 
 
 def main():
@@ -4,33 +4,53 @@ Dump info from directory of XNBs
 
 from __future__ import print_function
 
+import os
 import sys
 import time
 
-from xnb_parse.type_reader import ReaderError
+from xnb_parse.export_journal import ExportJournal, JOURNAL_FILENAME
+from xnb_parse.export_manifest import ExportManifest
+from xnb_parse.export_pipeline import ExportPipeline
 from xnb_parse.xna_content_manager import ContentManager
 
 
-def read_xnb_dir(content_dir, export_dir=None):
+def read_xnb_dir(content_dir, export_dir=None, workers=None, resume=False):
     content_manager = ContentManager(content_dir)
-    for asset_name in content_manager.assets:
+    manifest = None
+    journal = None
+    if export_dir is not None:
+        # only export what changed since the last run into export_dir
+        manifest = ExportManifest(export_dir)
+        # with resume also skip what an interrupted run finished after the manifest was last saved
+        journal = ExportJournal(os.path.join(export_dir, JOURNAL_FILENAME), export_dir, resume=resume)
+    pipeline = ExportPipeline(content_manager, export_dir, workers=workers, manifest=manifest, journal=journal)
+    # largest first so the pool doesn't end up waiting on one big asset
+    for asset_name, error in pipeline.run(content_manager.assets, largest_first=True):
         print(asset_name)
-        try:
-            asset = content_manager.load(asset_name)
-            if export_dir is not None:
-                content_manager.export(asset, asset_name, export_dir)
-        except (ReaderError, KeyError) as ex:
-            print("FAILED: '{}' {}: {}".format(asset_name, type(ex).__name__, ex), file=sys.stderr)
+        if error is not None:
+            print(error, file=sys.stderr)
 
 
 def main():
-    if 1 < len(sys.argv) <= 3:
+    args = sys.argv[1:]
+    workers = None
+    resume = False
+    while args and args[0] in ('-j', '--resume'):
+        if args[0] == '--resume':
+            resume = True
+            args = args[1:]
+        elif len(args) > 1:
+            workers = int(args[1])
+            args = args[2:]
+        else:
+            break
+    if 1 <= len(args) <= 2:
         totaltime = time.time()
-        content_dir = sys.argv[1]
+        content_dir = args[0]
         export_dir = None
-        if len(sys.argv) > 2:
-            export_dir = sys.argv[2]
-        read_xnb_dir(content_dir, export_dir)
+        if len(args) > 1:
+            export_dir = args[1]
+        read_xnb_dir(content_dir, export_dir, workers, resume)
         print('> Done in {:.2f} seconds'.format(time.time() - totaltime))
     else:
-        print('read_xnb_dir.py content_dir [export_dir]', file=sys.stderr)
+        print('read_xnb_dir.py [-j workers] [--resume] content_dir [export_dir]', file=sys.stderr)
@@ -0,0 +1,259 @@
+"""
+compile resolved type reader trees into specialised read functions
+"""
+
+from __future__ import print_function
+
+import struct
+from types import MethodType
+
+from xnb_parse.type_reader import ReaderError, FIELD_FORMATS
+from xnb_parse.type_readers.xna_system import ListReader, ArrayReader, DictionaryReader
+from xnb_parse.xna_types.xna_math import Color, Vector2, Vector3, Vector4, Quaternion, Matrix
+from xnb_parse.xna_types.xna_system import XNAList, XNADict
+
+
+# expressions building fixed size field values from the unpacked values, plain values are used as they are
+_FIELD_BUILDS = {
+    'vector2': 'Vector2._make({})',
+    'vector3': 'Vector3._make({})',
+    'vector4': 'Vector4._make({})',
+    'quaternion': 'Quaternion._make({})',
+    'color': 'Color._make({})',
+    'matrix': 'Matrix(XNAList({}))',
+}
+# fixed size fields: struct format and the expression building the value from the unpacked values
+_FIXED_FIELDS = {kind: (fmt, _FIELD_BUILDS.get(kind)) for kind, fmt in FIELD_FORMATS.items()}
+_VARIABLE_FIELDS = {
+    'string': 'read_string',
+    'long_string': 'read_long_string',
+    'external_reference': 'read_external_reference',
+}
+_GLOBALS = {
+    'ReaderError': ReaderError,
+    'XNAList': XNAList,
+    'XNADict': XNADict,
+    'Color': Color,
+    'Vector2': Vector2,
+    'Vector3': Vector3,
+    'Vector4': Vector4,
+    'Quaternion': Quaternion,
+    'Matrix': Matrix,
+}
+
+# compiled functions keyed by source and namespace, shared by all plans
+_compiled = {}
+
+
+def check_type(stream, type_id, expected_type):
+    """
+    slow path for inlined read_object type checks, raises the same errors as XNBReader.read_object
+    """
+    try:
+        type_reader = stream.type_readers[type_id - 1]
+    except IndexError:
+        raise ReaderError("type id out of range: {} > {}".format(type_id, len(stream.type_readers)))
+    if expected_type not in stream.compatible_types[type_id - 1]:
+        raise ReaderError("Unexpected type: '{}' != '{}'".format(type_reader.target_type, expected_type))
+
+
+class _FunctionBuilder(object):
+    def __init__(self, stream):
+        self.stream = stream
+        self.lines = []
+        self.namespace = {}
+        self.hoisted = []
+        self.temp_count = 0
+
+    def temp(self, prefix):
+        self.temp_count += 1
+        return '{}_{}'.format(prefix, self.temp_count)
+
+    def constant(self, name, value):
+        self.namespace[name] = value
+        return name
+
+    def struct(self, fmt):
+        for name, existing in self.namespace.items():
+            if existing == fmt:
+                return name
+        return self.constant('_s{}'.format(len(self.namespace)), fmt)
+
+    def hoist(self, line):
+        if line not in self.hoisted:
+            self.hoisted.append(line)
+
+    def emit(self, indent, line):
+        self.lines.append('    ' * indent + line)
+
+    def fixed_run(self, indent, run):
+        """
+        read a run of consecutive fixed size fields with one unpack_from
+        """
+        self.hoist('buf = stream._buffer')
+        fmt = ''.join(_FIXED_FIELDS[kind][0] for _, kind in run)
+        struct_name = self.struct(self.stream._fmt_end + fmt)
+        size = struct.calcsize('<' + fmt)
+        self.emit(indent, 'pos = stream._pos')
+        if all(_FIXED_FIELDS[kind][1] is None for _, kind in run):
+            targets = ''.join(name + ', ' for name, _ in run)
+            self.emit(indent, '{}= {}.unpack_from(buf, pos)'.format(targets, struct_name))
+        else:
+            self.emit(indent, 'values = {}.unpack_from(buf, pos)'.format(struct_name))
+        self.emit(indent, 'stream._pos = pos + {}'.format(size))
+        if not all(_FIXED_FIELDS[kind][1] is None for _, kind in run):
+            index = 0
+            for name, kind in run:
+                field_fmt, build = _FIXED_FIELDS[kind]
+                count = struct.calcsize('<' + field_fmt) // struct.calcsize('<' + field_fmt[-1])
+                if build is None:
+                    self.emit(indent, '{} = values[{}]'.format(name, index))
+                else:
+                    self.emit(indent, '{} = {}'.format(name, build.format('values[{}:{}]'.format(index,
+                                                                                               index + count))))
+                index += count
+
+    def read_object(self, indent, target, expected_type):
+        """
+        inlined XNBReader.read_object with the expected type resolved at compile time
+        """
+        self.hoist('read_7bit_encoded_int = stream.read_7bit_encoded_int')
+        self.hoist('type_readers = stream.type_readers')
+        self.hoist('type_count = len(type_readers)')
+        type_id = self.temp('type_id')
+        self.emit(indent, '{} = read_7bit_encoded_int()'.format(type_id))
+        self.emit(indent, 'if {}:'.format(type_id))
+        if expected_type is None or expected_type == 'System.Object':
+            self.emit(indent + 1, 'if {} > type_count:'.format(type_id))
+        else:
+            self.hoist('compatible_types = stream.compatible_types')
+            self.emit(indent + 1, 'if {0} > type_count or {1!r} not in compatible_types[{0} - 1]:'.format(
+                type_id, expected_type))
+        self.emit(indent + 2, 'check_type(stream, {}, {!r})'.format(type_id, expected_type))
+        self.emit(indent + 1, '{} = type_readers[{} - 1].read()'.format(target, type_id))
+        self.emit(indent, 'else:')
+        self.emit(indent + 1, '{} = None'.format(target))
+
+    def read_element(self, indent, target, reader, reader_expr):
+        """
+        read a generic argument the way the container readers do, inlining single value reads
+        """
+        if reader.is_value_type:
+            if reader.array_fmt is not None and len(reader.array_fmt) == 1:
+                self.hoist('buf = stream._buffer')
+                struct_name = self.struct(self.stream._fmt_end + reader.array_fmt)
+                self.emit(indent, 'pos = stream._pos')
+                self.emit(indent, '{}, = {}.unpack_from(buf, pos)'.format(target, struct_name))
+                self.emit(indent, 'stream._pos = pos + {}'.format(struct.calcsize('<' + reader.array_fmt)))
+            else:
+                read_name = self.temp('read')
+                self.hoist('{} = {}.read'.format(read_name, reader_expr))
+                self.emit(indent, '{} = {}()'.format(target, read_name))
+        else:
+            self.read_object(indent, target, self.stream._expected_type(reader))
+
+    def build(self):
+        source = ['def read(self):', '    stream = self.stream']
+        source.extend('    ' + line for line in self.hoisted)
+        source.extend(self.lines)
+        source = '\n'.join(source) + '\n'
+        key = (source, tuple(sorted((name, value if isinstance(value, str) else id(value))
+                                    for name, value in self.namespace.items())))
+        try:
+            return _compiled[key]
+        except KeyError:
+            pass
+        namespace = dict(_GLOBALS)
+        namespace['check_type'] = check_type
+        for name, value in self.namespace.items():
+            if isinstance(value, str):
+                value = struct.Struct(value)
+            namespace[name] = value
+        code = compile(source, '<compiled reader>', 'exec')
+        exec(code, namespace)
+        function = namespace['read']
+        function.source = source
+        _compiled[key] = function
+        return function
+
+
+def _compile_fields(reader, fields):
+    builder = _FunctionBuilder(reader.stream)
+    run = []
+    names = []
+    for field in fields:
+        # prefix field names so they can't clash with the locals used by the generated code
+        name, kind = 'f_' + field[0], field[1]
+        names.append(name)
+        if kind in _FIXED_FIELDS:
+            run.append((name, kind))
+            continue
+        if run:
+            builder.fixed_run(1, run)
+            run = []
+        if kind in _VARIABLE_FIELDS:
+            method = _VARIABLE_FIELDS[kind]
+            builder.hoist('{0} = stream.{0}'.format(method))
+            builder.emit(1, '{} = {}()'.format(name, method))
+        else:
+            type_params = field[2] if len(field) > 2 else None
+            builder.read_object(1, name, reader.stream._expected_type(kind, type_params))
+    if run:
+        builder.fixed_run(1, run)
+    builder.emit(1, 'return {}({})'.format(builder.constant('field_class', reader.field_class), ', '.join(names)))
+    return builder.build()
+
+
+def _compile_list(reader):
+    element = reader.readers[0]
+    if element.is_value_type:
+        # already read in bulk by read_array
+        return None
+    builder = _FunctionBuilder(reader.stream)
+    builder.emit(1, 'elements = stream.read_int32()')
+    builder.emit(1, 'items = []')
+    builder.emit(1, 'append = items.append')
+    builder.emit(1, 'for _ in range(elements):')
+    builder.read_element(2, 'item', element, 'self.readers[0]')
+    builder.emit(2, 'append(item)')
+    builder.emit(1, 'return XNAList(items)')
+    return builder.build()
+
+
+def _compile_dictionary(reader):
+    builder = _FunctionBuilder(reader.stream)
+    builder.emit(1, 'elements = stream.read_int32()')
+    builder.emit(1, 'items = []')
+    builder.emit(1, 'append = items.append')
+    builder.emit(1, 'for _ in range(elements):')
+    builder.read_element(2, 'key', reader.readers[0], 'self.readers[0]')
+    builder.read_element(2, 'value', reader.readers[1], 'self.readers[1]')
+    builder.emit(2, 'append((key, value))')
+    builder.emit(1, 'return XNADict(items)')
+    return builder.build()
+
+
+def compile_reader(reader):
+    """
+    build a specialised read function for an initialised type reader, None if the reader can't be compiled
+    """
+    # readers built from generic readers are copies rather than subclasses, compare the generic names
+    generic_name = getattr(reader, 'generic_reader_name', None)
+    if generic_name in (ListReader.generic_reader_name, ArrayReader.generic_reader_name):
+        return _compile_list(reader)
+    if generic_name == DictionaryReader.generic_reader_name:
+        return _compile_dictionary(reader)
+    fields = reader.fields()
+    if fields is None or reader.field_class is None:
+        return None
+    return _compile_fields(reader, fields)
+
+
+def compile_readers(readers):
+    """
+    replace read on each reader instance with its compiled version where possible
+    """
+    for reader in readers:
+        function = compile_reader(reader)
+        if function is not None:
+            reader.read = MethodType(function, reader)
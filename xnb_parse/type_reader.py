@@ -4,9 +4,33 @@ Base type readers
 
 from __future__ import print_function
 
+import struct
+
 # avoid circular import
 VERSION_40 = 5
 
+# struct formats of the fixed size kinds used by fields
+FIELD_FORMATS = {
+    'boolean': '?',
+    'byte': 'B',
+    'sbyte': 'b',
+    'int16': 'h',
+    'uint16': 'H',
+    'int32': 'i',
+    'uint32': 'I',
+    'int64': 'q',
+    'uint64': 'Q',
+    'single': 'f',
+    'double': 'd',
+    'vector2': '2f',
+    'vector3': '3f',
+    'vector4': '4f',
+    'quaternion': '4f',
+    'color': '4B',
+    'matrix': '16f',
+}
+FIELD_SIZES = {kind: struct.calcsize('<' + fmt) for kind, fmt in FIELD_FORMATS.items()}
+
 
 class Error(Exception):
     pass
@@ -40,6 +64,14 @@ class BaseTypeReader(object):
     is_enum_type = False
     file_platform = None
     file_version = None
+    # single struct type code for readers whose values can be read in bulk with BinaryStream.read_array
+    array_fmt = None
+    # class built from the values described by fields
+    field_class = None
+    # size in bytes of every value for readers that can be skipped without looking at the data
+    fixed_size = None
+    # steps used by skip for readers described by fields, built on first use
+    _skip_steps = None
 
     def __init__(self, stream=None, version=None):
         self.stream = stream
@@ -51,6 +83,109 @@ class BaseTypeReader(object):
     def read(self):
         raise ReaderError("Unimplemented type reader: '{}'".format(self.reader_name))
 
+    def read_array(self, count):
+        if self.array_fmt is not None:
+            return self.stream.read_array(self.array_fmt, count).tolist()
+        return [self.read() for _ in range(count)]
+
+    def skip(self):
+        """
+        advance the stream past one value without building it
+        """
+        if self.fixed_size is not None:
+            self.stream.skip(self.fixed_size)
+            return
+        if self.array_fmt is not None:
+            self.stream.skip(self.stream.calc_size(self.array_fmt))
+            return
+        steps = self._skip_steps
+        if steps is None:
+            steps = self._build_skip_steps()
+        if steps is False:
+            # nothing describes the layout, the value has to be read to find its end. only readers from outside
+            # this package get here, see tests/test_skip.py
+            self.read()
+            return
+        stream = self.stream
+        for size, method, reader, type_params in steps:
+            if size:
+                stream.skip(size)
+            elif method:
+                getattr(stream, method)()
+            else:
+                stream.skip_object(reader, type_params)
+
+    def skip_array(self, count):
+        if self.fixed_size is not None:
+            self.stream.skip(self.fixed_size * count)
+        elif self.array_fmt is not None:
+            self.stream.skip(self.stream.calc_size(self.array_fmt) * count)
+        else:
+            for _ in range(count):
+                self.skip()
+
+    def _build_skip_steps(self):
+        fields = self.fields()
+        if fields is None:
+            self._skip_steps = False
+            return False
+        steps = []
+        for field in fields:
+            kind = field[1]
+            if kind in FIELD_SIZES:
+                # merge runs of fixed size fields into one skip
+                if steps and steps[-1][0]:
+                    steps[-1] = (steps[-1][0] + FIELD_SIZES[kind], None, None, None)
+                else:
+                    steps.append((FIELD_SIZES[kind], None, None, None))
+            elif isinstance(kind, str):
+                steps.append((0, 'skip_' + kind, None, None))
+            else:
+                steps.append((0, None, kind, field[2] if len(field) > 2 else None))
+        self._skip_steps = steps
+        return steps
+
+    def read_fields(self, names):
+        """
+        read only the named fields into a dict, skipping the rest. the stream is left after the last named field
+        """
+        fields = self.fields()
+        if fields is None:
+            raise ReaderError("Field projection not supported by type reader: '{}'".format(self.reader_name))
+        names = self.check_field_names(names, [field[0] for field in fields])
+        values = {}
+        for field in fields:
+            if len(values) == len(names):
+                break
+            name, kind = field[0], field[1]
+            if name in names:
+                if isinstance(kind, str):
+                    values[name] = getattr(self.stream, 'read_' + kind)()
+                else:
+                    values[name] = self.stream.read_object(kind, field[2] if len(field) > 2 else None)
+            elif kind in FIELD_SIZES:
+                self.stream.skip(FIELD_SIZES[kind])
+            elif isinstance(kind, str):
+                getattr(self.stream, 'skip_' + kind)()
+            else:
+                self.stream.skip_object(kind, field[2] if len(field) > 2 else None)
+        return values
+
+    def check_field_names(self, names, known):
+        names = set(names)
+        unknown = names.difference(known)
+        if unknown:
+            raise ReaderError("Unknown fields for '{}': {}".format(self.reader_name, ', '.join(sorted(unknown))))
+        return names
+
+    def fields(self):
+        """
+        describe read as an ordered list of (name, kind) or (name, reader, type_params) fields passed to field_class,
+        kind is a BinaryStream read method without the read_ prefix or a type reader read with read_object.
+        None if read can't be described this way
+        """
+        return None
+
     def init_reader(self, file_platform=None, file_version=None):
         self.file_platform = file_platform
         self.file_version = file_version
@@ -95,6 +230,7 @@ class EnumTypeReader(ValueTypeReader):
     is_enum_type = True
     enum_type = None
     enum_type4 = None
+    fixed_size = 4
 
     def read(self):
         value = self.stream.read_int32()
@@ -107,6 +243,17 @@ class EnumTypeReader(ValueTypeReader):
         else:
             return value
 
+    def read_array(self, count):
+        values = self.stream.read_array('i', count)
+        if self.file_version == VERSION_40 and self.enum_type4 is not None:
+            enum_type = self.enum_type4
+        else:
+            enum_type = self.enum_type
+        if callable(enum_type):
+            return [enum_type(value) for value in values]
+        else:
+            return values.tolist()
+
 
 def generic_reader_name(main_type, args=None):
     if args is None:
@@ -4,36 +4,105 @@ load and manage type readers
 
 from __future__ import print_function
 
+import threading
+from importlib import import_module
+
 from xnb_parse.type_spec import TypeSpec
 from xnb_parse.type_reader import TypeReaderPlugin, ReaderError, GenericTypeReader, BaseTypeReader
-
-# pull in all typereaders
-import xnb_parse.type_readers
+from xnb_parse.type_readers import manifest
 
 
 class TypeReaderManager(object):
+    """
+    lookups read the reader tables without locking, every change is made under the lock to a copy of the tables
+    that then replaces them, so a lookup always sees a complete snapshot
+    """
+
     def __init__(self):
         self.type_readers = {}
         self.type_readers_type = {}
         self.generic_type_readers = {}
         self.generic_type_readers_type = {}
-        for class_ in TypeReaderPlugin.__subclasses__():
-            if issubclass(class_, GenericTypeReader):
-                if class_.generic_reader_name in self.generic_type_readers:
-                    raise ReaderError("Duplicate generic type reader name: '{}'".format(class_.generic_reader_name))
-                self.generic_type_readers[class_.generic_reader_name] = class_
-                if class_.generic_target_type in self.generic_type_readers_type:
-                    raise ReaderError("Duplicate generic type reader type: '{}'".format(class_.generic_target_type))
-                self.generic_type_readers_type[class_.generic_target_type] = class_
-            elif issubclass(class_, BaseTypeReader):
-                if class_.reader_name in self.type_readers:
-                    raise ReaderError("Duplicate type reader name: '{}'".format(class_.reader_name))
-                self.type_readers[class_.reader_name] = class_
-                if class_.target_type in self.type_readers_type:
-                    raise ReaderError("Duplicate type reader type: '{}'".format(class_.target_type))
-                self.type_readers_type[class_.target_type] = class_
-            else:
-                raise ReaderError("Unknown base class for reader: '{!s}'".format(class_))
+        self._plugins = set()
+        self._imported_modules = set()
+        self._lock = threading.RLock()
+        # bumped whenever plugins are registered, tells a lookup that missed whether it's worth trying again
+        self._generation = 0
+        # readers from modules that are already imported, the rest are imported on first lookup
+        self._register_plugins()
+
+    def _register_plugins(self):
+        with self._lock:
+            type_readers = dict(self.type_readers)
+            type_readers_type = dict(self.type_readers_type)
+            generic_type_readers = dict(self.generic_type_readers)
+            generic_type_readers_type = dict(self.generic_type_readers_type)
+            plugins = set(self._plugins)
+            for class_ in TypeReaderPlugin.__subclasses__():
+                if class_ in plugins:
+                    continue
+                if getattr(class_, 'generic_params', None) is not None:
+                    # built from a generic reader by create_from_type, registered by the lookup that built it
+                    continue
+                plugins.add(class_)
+                if issubclass(class_, GenericTypeReader):
+                    if class_.generic_reader_name in generic_type_readers:
+                        raise ReaderError("Duplicate generic type reader name: '{}'".format(
+                            class_.generic_reader_name))
+                    generic_type_readers[class_.generic_reader_name] = class_
+                    if class_.generic_target_type in generic_type_readers_type:
+                        raise ReaderError("Duplicate generic type reader type: '{}'".format(
+                            class_.generic_target_type))
+                    generic_type_readers_type[class_.generic_target_type] = class_
+                elif issubclass(class_, BaseTypeReader):
+                    if class_.reader_name in type_readers:
+                        raise ReaderError("Duplicate type reader name: '{}'".format(class_.reader_name))
+                    type_readers[class_.reader_name] = class_
+                    if class_.target_type in type_readers_type:
+                        raise ReaderError("Duplicate type reader type: '{}'".format(class_.target_type))
+                    type_readers_type[class_.target_type] = class_
+                else:
+                    raise ReaderError("Unknown base class for reader: '{!s}'".format(class_))
+            self._plugins = plugins
+            self._generation += 1
+            self.generic_type_readers = generic_type_readers
+            self.generic_type_readers_type = generic_type_readers_type
+            self.type_readers_type = type_readers_type
+            self.type_readers = type_readers
+
+    def _import_reader_module(self, type_spec, readers, generic_readers, generation):
+        """
+        import the module the manifest gives for type_spec, or every reader module if it isn't listed there.
+        returns False once there is nothing left to import and nothing was registered since generation
+        """
+        module = readers.get(type_spec.full_name)
+        if module is None and type_spec.generic_params:
+            module = generic_readers.get(type_spec.name)
+        with self._lock:
+            if self._generation != generation:
+                # another thread registered readers since the lookup missed
+                return True
+            for modules in ([module] if module is not None else [], manifest.READER_MODULES):
+                pending = [name for name in modules if name not in self._imported_modules]
+                if pending:
+                    for name in pending:
+                        import_module(manifest.PACKAGE + name)
+                        self._imported_modules.add(name)
+                    self._register_plugins()
+                    return True
+        return False
+
+    def import_all_readers(self):
+        """
+        import and register every reader module now instead of on first lookup
+        """
+        with self._lock:
+            pending = [name for name in manifest.READER_MODULES if name not in self._imported_modules]
+            for name in pending:
+                import_module(manifest.PACKAGE + name)
+                self._imported_modules.add(name)
+            if pending:
+                self._register_plugins()
 
     def get_type_reader(self, type_reader):
         try:
@@ -43,24 +112,13 @@ class TypeReaderManager(object):
 
         type_spec = TypeSpec.parse(name)
 
-        if type_spec.full_name in self.type_readers:
-            return self.type_readers[type_spec.full_name]
-
-        if type_spec.generic_params:
-            if type_spec.name in self.generic_type_readers:
-                generic_type_class = self.generic_type_readers[type_spec.name]
-                generic_type_reader_class = generic_type_class.create_from_type(type_spec)
-                if generic_type_reader_class.reader_name in self.type_readers:
-                    raise ReaderError("Duplicate type reader name from generic: '{}' '{}'".format(
-                        generic_type_reader_class.reader_name, generic_type_class.generic_reader_name))
-                self.type_readers[generic_type_reader_class.reader_name] = generic_type_reader_class
-                if generic_type_reader_class.target_type in self.type_readers_type:
-                    raise ReaderError("Duplicate type reader type from generic: '{}' '{}'".format(
-                        generic_type_reader_class.target_type, generic_type_class.generic_target_type))
-                self.type_readers_type[generic_type_reader_class.target_type] = generic_type_reader_class
-                return generic_type_reader_class
-
-        raise ReaderError("Type reader not found: '{}'".format(type_spec.full_name))
+        while True:
+            generation = self._generation
+            reader = self._find_type_reader(type_spec)
+            if reader is not None:
+                return reader
+            if not self._import_reader_module(type_spec, manifest.READERS, manifest.GENERIC_READERS, generation):
+                raise ReaderError("Type reader not found: '{}'".format(type_spec.full_name))
 
     def get_type_reader_by_type(self, type_reader):
         try:
@@ -70,21 +128,59 @@ class TypeReaderManager(object):
 
         type_spec = TypeSpec.parse(reader_type)
 
-        if type_spec.full_name in self.type_readers_type:
-            return self.type_readers_type[type_spec.full_name]
+        while True:
+            generation = self._generation
+            reader = self._find_type_reader_by_type(type_spec)
+            if reader is not None:
+                return reader
+            if not self._import_reader_module(type_spec, manifest.TARGET_TYPES, manifest.GENERIC_TARGET_TYPES,
+                                              generation):
+                raise ReaderError("Type reader not found: '{}'".format(type_spec.full_name))
+
+    def _find_type_reader(self, type_spec):
+        reader = self.type_readers.get(type_spec.full_name)
+        if reader is not None:
+            return reader
+
+        if type_spec.generic_params:
+            generic_type_class = self.generic_type_readers.get(type_spec.name)
+            if generic_type_class is not None:
+                with self._lock:
+                    # another thread may have built it while we waited
+                    reader = self.type_readers.get(type_spec.full_name)
+                    if reader is not None:
+                        return reader
+                    return self._create_generic(generic_type_class, type_spec)
+        return None
+
+    def _find_type_reader_by_type(self, type_spec):
+        reader = self.type_readers_type.get(type_spec.full_name)
+        if reader is not None:
+            return reader
 
         if type_spec.generic_params:
-            if type_spec.name in self.generic_type_readers_type:
-                generic_type_class = self.generic_type_readers_type[type_spec.name]
-                generic_type_reader_class = generic_type_class.create_from_type(type_spec)
-                if generic_type_reader_class.reader_name in self.type_readers:
-                    raise ReaderError("Duplicate type reader name from generic: '{}' '{}'".format(
-                        generic_type_reader_class.reader_name, generic_type_class.generic_reader_name))
-                self.type_readers[generic_type_reader_class.reader_name] = generic_type_reader_class
-                if generic_type_reader_class.target_type in self.type_readers_type:
-                    raise ReaderError("Duplicate type reader type from generic: '{}' '{}'".format(
-                        generic_type_reader_class.target_type, generic_type_class.generic_target_type))
-                self.type_readers_type[generic_type_reader_class.target_type] = generic_type_reader_class
-                return generic_type_reader_class
-
-        raise ReaderError("Type reader not found: '{}'".format(type_spec.full_name))
+            generic_type_class = self.generic_type_readers_type.get(type_spec.name)
+            if generic_type_class is not None:
+                with self._lock:
+                    reader = self.type_readers_type.get(type_spec.full_name)
+                    if reader is not None:
+                        return reader
+                    return self._create_generic(generic_type_class, type_spec)
+        return None
+
+    def _create_generic(self, generic_type_class, type_spec):
+        # called with the lock held
+        generic_type_reader_class = generic_type_class.create_from_type(type_spec)
+        if generic_type_reader_class.reader_name in self.type_readers:
+            raise ReaderError("Duplicate type reader name from generic: '{}' '{}'".format(
+                generic_type_reader_class.reader_name, generic_type_class.generic_reader_name))
+        if generic_type_reader_class.target_type in self.type_readers_type:
+            raise ReaderError("Duplicate type reader type from generic: '{}' '{}'".format(
+                generic_type_reader_class.target_type, generic_type_class.generic_target_type))
+        type_readers = dict(self.type_readers)
+        type_readers[generic_type_reader_class.reader_name] = generic_type_reader_class
+        type_readers_type = dict(self.type_readers_type)
+        type_readers_type[generic_type_reader_class.target_type] = generic_type_reader_class
+        self.type_readers_type = type_readers_type
+        self.type_readers = type_readers
+        return generic_type_reader_class
@@ -1,14 +1,10 @@
 """
 all type readers
+
+reader modules are imported by TypeReaderManager when a reader is first looked up, see manifest
 """
 
 from __future__ import print_function
 
-from xnb_parse.type_readers import xna_graphics, xna_math, xna_media, xna_primitive, xna_system
-
-from xnb_parse.type_readers.fez import *
-from xnb_parse.type_readers.mercury import *
-
-from xnb_parse.type_readers.xTile import *  # pylint: disable-msg=W0401
 
-__all__ = ['xna_graphics', 'xna_math', 'xna_media', 'xna_primitive', 'xna_system']
+__all__ = ['xna_graphics', 'xna_math', 'xna_media', 'xna_primitive', 'xna_system', 'fez', 'mercury', 'xTile']
@@ -4,7 +4,5 @@ FEZ type readers!
 
 from __future__ import print_function
 
-from xnb_parse.type_readers.fez import fez_basic, fez_graphics, fez_level, fez_music
-
 
 __all__ = ['fez_basic', 'fez_graphics', 'fez_level', 'fez_music']
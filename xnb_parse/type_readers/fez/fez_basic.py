@@ -4,7 +4,7 @@ FEZ basic type readers
 
 from __future__ import print_function
 
-from xnb_parse.type_reader import TypeReaderPlugin, GenericTypeReader, EnumTypeReader
+from xnb_parse.type_reader import TypeReaderPlugin, GenericTypeReader, EnumTypeReader, ReaderError
 from xnb_parse.xna_types.xna_system import XNASet
 from xnb_parse.xna_types.fez.fez_basic import (FaceOrientation, LevelNodeType, CollisionType, Viewpoint, NpcAction,
                                                ActorType, SurfaceType, LiquidType, PathEndBehavior, ComparisonOperator,
@@ -86,6 +86,8 @@ class VibrationMotorReader(EnumTypeReader, TypeReaderPlugin):
 class SetReader(GenericTypeReader, TypeReaderPlugin):
     generic_target_type = 'Common.Set`1'
     generic_reader_name = 'FezEngine.SetReader`1'
+    # the elements aren't written, a set is always read empty
+    fixed_size = 0
 
     def read(self):
         return XNASet()
@@ -94,3 +96,7 @@ class SetReader(GenericTypeReader, TypeReaderPlugin):
 class IEqualityComparerReader(GenericTypeReader, TypeReaderPlugin):
     generic_target_type = 'System.Collections.Generic.IEqualityComparer`1'
     generic_reader_name = 'FezEngine.IEqualityComparerReader`1'
+
+    def skip(self):
+        # the layout is unknown, so there is nothing to skip past
+        raise ReaderError("Unimplemented type reader: '{}'".format(self.reader_name))
@@ -46,6 +46,20 @@ class ArtObjectReader(BaseTypeReader, TypeReaderPlugin):
                                                                                            [FaceOrientationReader])])
             return ArtObject(name, cubemap_path, size, geometry, actor_type, no_silhouette, laser_outlets)
 
+    def skip(self):
+        self.stream.skip_string()
+        if self.file_platform == PLATFORM_WINDOWS:
+            self.stream.skip_object(Texture2DReader)
+        else:
+            self.stream.skip_string()
+        self.stream.skip(12)
+        self.stream.skip_object(ShaderInstancedIndexedPrimitivesReader,
+                                [VertexPositionNormalTextureInstanceReader, MatrixReader])
+        self.stream.skip_object(ActorTypeReader)
+        self.stream.skip(1)
+        if self.file_platform != PLATFORM_WINDOWS:
+            self.stream.skip_object(ReflectiveReader, [generic_reader_type(SetReader, [FaceOrientationReader])])
+
 
 class ShaderInstancedIndexedPrimitivesReader(GenericTypeReader, TypeReaderPlugin):
     generic_target_type = 'FezEngine.Structure.Geometry.ShaderInstancedIndexedPrimitives`2'
@@ -57,10 +71,16 @@ class ShaderInstancedIndexedPrimitivesReader(GenericTypeReader, TypeReaderPlugin
         indices = self.stream.read_object(ArrayReader, [UInt16Reader])
         return ShaderInstancedIndexedPrimitives(primitive_type, vertices, indices)
 
+    def skip(self):
+        self.stream.skip_object(PrimitiveTypeReader)
+        self.stream.skip_object(ArrayReader, [self.readers[0]])
+        self.stream.skip_object(ArrayReader, [UInt16Reader])
+
 
 class VertexPositionNormalTextureInstanceReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Geometry.VertexPositionNormalTextureInstance'
     reader_name = 'FezEngine.Readers.VertexPositionNormalTextureInstanceReader'
+    fixed_size = 21
 
     def read(self):
         values = self.stream.unpack('3f B 2f')
@@ -69,6 +89,10 @@ class VertexPositionNormalTextureInstanceReader(ValueTypeReader, TypeReaderPlugi
         texture_coord = Vector2._make(values[4:6])
         return VertexPositionNormalTextureInstance(position, normal, texture_coord)
 
+    def read_array(self, count):
+        return [VertexPositionNormalTextureInstance(Vector3._make(values[0:3]), values[3], Vector2._make(values[4:6]))
+                for values in self.stream.unpack_array('3f B 2f', count)]
+
 
 class NpcMetadataReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.NpcMetadata'
@@ -81,6 +105,11 @@ class NpcMetadataReader(BaseTypeReader, TypeReaderPlugin):
         sound_actions = self.stream.read_object(ListReader, [NpcActionReader])
         return NpcMetadata(walk_speed, avoids_gomez, sound_path, sound_actions)
 
+    def skip(self):
+        self.stream.skip(5)
+        self.stream.skip_object(StringReader)
+        self.stream.skip_object(ListReader, [NpcActionReader])
+
 
 class AnimatedTextureReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.AnimatedTexture'
@@ -104,6 +133,12 @@ class AnimatedTextureReader(BaseTypeReader, TypeReaderPlugin):
             frames = self.stream.read_object(ListReader, [FrameReader])
             return AnimatedTexture(width, height, actual_width, actual_height, frames)
 
+    def skip(self):
+        self.stream.skip(16)
+        if self.file_platform == PLATFORM_WINDOWS:
+            self.stream.skip(self.stream.read_uint32())
+        self.stream.skip_object(ListReader, [FrameReader])
+
 
 class FrameReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Content.FrameContent'
@@ -120,3 +155,11 @@ class FrameReader(BaseTypeReader, TypeReaderPlugin):
             elements = self.stream.read_uint32()
             data = self.stream.read(elements * 4)
             return Frame(duration, data)
+
+    def skip(self):
+        self.stream.skip_object(TimeSpanReader)
+        if self.file_platform == PLATFORM_WINDOWS:
+            self.stream.skip_object(RectangleReader)
+        else:
+            self.stream.read_7bit_encoded_int()
+            self.stream.skip(self.stream.read_uint32() * 4)
@@ -28,6 +28,10 @@ from xnb_parse.xna_types.fez.fez_level import (MapTree, MapNode, MapNodeConnecti
 class MapTreeReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.MapTree'
     reader_name = 'FezEngine.Readers.MapTreeReader'
+    field_class = MapTree
+
+    def fields(self):
+        return [('root', MapNodeReader)]
 
     def read(self):
         root = self.stream.read_object(MapNodeReader)
@@ -37,6 +41,12 @@ class MapTreeReader(BaseTypeReader, TypeReaderPlugin):
 class MapNodeReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.MapNode'
     reader_name = 'FezEngine.Readers.MapNodeReader'
+    field_class = MapNode
+
+    def fields(self):
+        return [('level_name', 'string'), ('connections', ListReader, [MapNodeConnectionReader]),
+                ('node_type', LevelNodeTypeReader), ('conditions', WinConditionsReader),
+                ('has_lesser_gate', 'boolean'), ('has_warp_gate', 'boolean')]
 
     def read(self):
         level_name = self.stream.read_string()
@@ -51,6 +61,10 @@ class MapNodeReader(BaseTypeReader, TypeReaderPlugin):
 class MapNodeConnectionReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.MapNode+Connection'
     reader_name = 'FezEngine.Readers.MapNodeConnectionReader'
+    field_class = MapNodeConnection
+
+    def fields(self):
+        return [('face', FaceOrientationReader), ('node', MapNodeReader), ('branch_oversize', 'single')]
 
     def read(self):
         face = self.stream.read_object(FaceOrientationReader)
@@ -62,6 +76,12 @@ class MapNodeConnectionReader(BaseTypeReader, TypeReaderPlugin):
 class WinConditionsReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.WinConditions'
     reader_name = 'FezEngine.Readers.WinConditionsReader'
+    field_class = WinConditions
+
+    def fields(self):
+        return [('chest_count', 'int32'), ('locked_door_count', 'int32'), ('unlocked_door_count', 'int32'),
+                ('script_ids', ListReader, [Int32Reader]), ('cube_shard_count', 'int32'),
+                ('other_collectible_count', 'int32'), ('split_up_count', 'int32'), ('secret_count', 'int32')]
 
     def read(self):
         chest_count = self.stream.read_int32()
@@ -79,6 +99,19 @@ class WinConditionsReader(BaseTypeReader, TypeReaderPlugin):
 class SkyReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Sky'
     reader_name = 'FezEngine.Readers.SkyReader'
+    field_class = Sky
+
+    def fields(self):
+        return [('name', 'string'), ('background', 'string'), ('wind_speed', 'single'), ('density', 'single'),
+                ('fog_density', 'single'), ('layers', ListReader, [SkyLayerReader]),
+                ('clouds', ListReader, [StringReader]), ('shadows', StringReader), ('stars', StringReader),
+                ('cloud_tint', StringReader), ('vertical_tiling', 'boolean'), ('horizontal_scrolling', 'boolean'),
+                ('layer_base_height', 'single'), ('inter_layer_vertical_distance', 'single'),
+                ('inter_layer_horizontal_distance', 'single'), ('horizontal_distance', 'single'),
+                ('vertical_distance', 'single'), ('layer_base_spacing', 'single'), ('wind_parallax', 'single'),
+                ('wind_distance', 'single'), ('clouds_parallax', 'single'), ('shadow_opacity', 'single'),
+                ('foliage_shadows', 'boolean'), ('no_per_face_layer_x_offset', 'boolean'),
+                ('layer_base_x_offset', 'single')]
 
     def read(self):
         name = self.stream.read_string()
@@ -116,6 +149,10 @@ class SkyReader(BaseTypeReader, TypeReaderPlugin):
 class SkyLayerReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.SkyLayer'
     reader_name = 'FezEngine.Readers.SkyLayerReader'
+    field_class = SkyLayer
+
+    def fields(self):
+        return [('name', 'string'), ('in_front', 'boolean'), ('opacity', 'single'), ('fog_tint', 'single')]
 
     def read(self):
         name = self.stream.read_string()
@@ -128,6 +165,11 @@ class SkyLayerReader(BaseTypeReader, TypeReaderPlugin):
 class TrileSetReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.TrileSet'
     reader_name = 'FezEngine.Readers.TrileSetReader'
+    field_class = TrileSet
+
+    def fields(self):
+        return [('name', 'string'), ('triles', DictionaryReader, [Int32Reader, TrileReader]),
+                ('texture_atlas', Texture2DReader)]
 
     def read(self):
         name = self.stream.read_string()
@@ -139,6 +181,17 @@ class TrileSetReader(BaseTypeReader, TypeReaderPlugin):
 class TrileReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Trile'
     reader_name = 'FezEngine.Readers.TrileReader'
+    field_class = Trile
+
+    def fields(self):
+        return [('name', 'string'), ('cubemap_path', 'string'), ('size', 'vector3'), ('offset', 'vector3'),
+                ('immaterial', 'boolean'), ('see_through', 'boolean'), ('thin', 'boolean'),
+                ('force_hugging', 'boolean'),
+                ('faces', DictionaryReader, [FaceOrientationReader, CollisionTypeReader]),
+                ('geometry', ShaderInstancedIndexedPrimitivesReader,
+                 [VertexPositionNormalTextureInstanceReader, Vector4Reader]),
+                ('actor_settings_type', ActorTypeReader), ('actor_settings_face', FaceOrientationReader),
+                ('surface_type', SurfaceTypeReader), ('atlas_offset', 'vector2')]
 
     def read(self):
         name = self.stream.read_string()
@@ -163,6 +216,26 @@ class TrileReader(BaseTypeReader, TypeReaderPlugin):
 class LevelReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Level'
     reader_name = 'FezEngine.Readers.LevelReader'
+    field_class = Level
+
+    def fields(self):
+        return [('name', StringReader), ('size', 'vector3'), ('starting_position', TrileFaceReader),
+                ('sequence_samples_path', StringReader), ('flat', 'boolean'), ('skip_postprocess', 'boolean'),
+                ('base_diffuse', 'single'), ('base_ambient', 'single'), ('gomez_halo_name', StringReader),
+                ('halo_filtering', 'boolean'), ('blinking_alpha', 'boolean'), ('loops', 'boolean'),
+                ('water_type', LiquidTypeReader), ('water_height', 'single'), ('sky_name', 'string'),
+                ('trile_set_name', StringReader), ('volumes', DictionaryReader, [Int32Reader, VolumeReader]),
+                ('scripts', DictionaryReader, [Int32Reader, ScriptReader]), ('song_name', StringReader),
+                ('fap_fadeout_start', 'int32'), ('fap_fadeout_length', 'int32'),
+                ('triles', DictionaryReader, [TrileEmplacementReader, TrileInstanceReader]),
+                ('art_objects', DictionaryReader, [Int32Reader, ArtObjectInstanceReader]),
+                ('background_planes', DictionaryReader, [Int32Reader, BackgroundPlaneReader]),
+                ('groups', DictionaryReader, [Int32Reader, TrileGroupReader]),
+                ('nonplayer_characters', DictionaryReader, [Int32Reader, NpcInstanceReader]),
+                ('paths', DictionaryReader, [Int32Reader, MovementPathReader]), ('descending', 'boolean'),
+                ('rainy', 'boolean'), ('low_pass', 'boolean'), ('muted_loops', ListReader, [StringReader]),
+                ('ambience_tracks', ListReader, [AmbienceTrackReader]), ('node_type', LevelNodeTypeReader),
+                ('quantum', 'boolean')]
 
     def read(self):
         name = self.stream.read_object(StringReader)
@@ -209,6 +282,11 @@ class LevelReader(BaseTypeReader, TypeReaderPlugin):
 class VolumeReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Volume'
     reader_name = 'FezEngine.Readers.VolumeReader'
+    field_class = Volume
+
+    def fields(self):
+        return [('orientations', ArrayReader, [FaceOrientationReader]), ('v_from', 'vector3'), ('v_to', 'vector3'),
+                ('actor_settings', VolumeActorSettingsReader)]
 
     def read(self):
         orientations = self.stream.read_object(ArrayReader, [FaceOrientationReader])
@@ -221,6 +299,7 @@ class VolumeReader(BaseTypeReader, TypeReaderPlugin):
 class TrileEmplacementReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.TrileEmplacement'
     reader_name = 'FezEngine.Readers.TrileEmplacementReader'
+    fixed_size = 12
 
     def read(self):
         return TrileEmplacement._make(self.stream.unpack('3i'))
@@ -242,10 +321,21 @@ class TrileInstanceReader(BaseTypeReader, TypeReaderPlugin):
         overlapped_triles = self.stream.read_object(ListReader, [TrileInstanceReader])
         return TrileInstance(position, trile_id, orientation, actor_settings, overlapped_triles)
 
+    def skip(self):
+        self.stream.skip(17)
+        if self.stream.read_boolean():
+            self.stream.skip_object(InstanceActorSettingsReader)
+        self.stream.skip_object(ListReader, [TrileInstanceReader])
+
 
 class ArtObjectInstanceReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.ArtObjectInstance'
     reader_name = 'FezEngine.Readers.ArtObjectInstanceReader'
+    field_class = ArtObjectInstance
+
+    def fields(self):
+        return [('name', 'string'), ('position', 'vector3'), ('rotation', 'quaternion'), ('scale', 'vector3'),
+                ('actor_settings', ArtObjectActorSettingsReader)]
 
     def read(self):
         name = self.stream.read_string()
@@ -260,6 +350,17 @@ class ArtObjectInstanceReader(BaseTypeReader, TypeReaderPlugin):
 class BackgroundPlaneReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.BackgroundPlane'
     reader_name = 'FezEngine.Readers.BackgroundPlaneReader'
+    field_class = BackgroundPlane
+
+    def fields(self):
+        return [('position', 'vector3'), ('rotation', 'quaternion'), ('scale', 'vector3'), ('size', 'vector3'),
+                ('texture_name', 'string'), ('light_map', 'boolean'), ('allow_overbrightness', 'boolean'),
+                ('filter_', 'color'), ('animated', 'boolean'), ('doublesided', 'boolean'), ('opacity', 'single'),
+                ('attached_group', Int32Reader), ('billboard', 'boolean'), ('sync_with_samples', 'boolean'),
+                ('crosshatch', 'boolean'), ('unknown', 'boolean'), ('always_on_top', 'boolean'),
+                ('fullbright', 'boolean'), ('pixelated_lightmap', 'boolean'), ('x_texture_repeat', 'boolean'),
+                ('y_texture_repeat', 'boolean'), ('clamp_texture', 'boolean'), ('actor_type', ActorTypeReader),
+                ('attached_plane', Int32Reader), ('parallax_factor', 'single')]
 
     def read(self):
         position = self.stream.read_vector3()
@@ -296,6 +397,15 @@ class BackgroundPlaneReader(BaseTypeReader, TypeReaderPlugin):
 class TrileGroupReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.TrileGroup'
     reader_name = 'FezEngine.Readers.TrileGroupReader'
+    field_class = TrileGroup
+
+    def fields(self):
+        return [('triles', ListReader, [TrileInstanceReader]), ('path', MovementPathReader), ('heavy', 'boolean'),
+                ('actor_type', ActorTypeReader), ('geyser_offset', 'single'), ('geyser_pause_for', 'single'),
+                ('geyser_lift_for', 'single'), ('geyser_apex_height', 'single'), ('spin_center', 'vector3'),
+                ('spin_clockwise', 'boolean'), ('spin_frequency', 'single'), ('spin_needs_triggering', 'boolean'),
+                ('spin_180_degrees', 'boolean'), ('fall_on_rotate', 'boolean'), ('spin_offset', 'single'),
+                ('associated_sound', StringReader)]
 
     def read(self):
         triles = self.stream.read_object(ListReader, [TrileInstanceReader])
@@ -322,6 +432,10 @@ class TrileGroupReader(BaseTypeReader, TypeReaderPlugin):
 class TrileFaceReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.TrileFace'
     reader_name = 'FezEngine.Readers.TrileFaceReader'
+    field_class = TrileFace
+
+    def fields(self):
+        return [('trile_id', TrileEmplacementReader), ('face', FaceOrientationReader)]
 
     def read(self):
         trile_id = self.stream.read_object(TrileEmplacementReader)
@@ -332,6 +446,14 @@ class TrileFaceReader(BaseTypeReader, TypeReaderPlugin):
 class NpcInstanceReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.NpcInstance'
     reader_name = 'FezEngine.Readers.NpcInstanceReader'
+    field_class = NpcInstance
+
+    def fields(self):
+        return [('name', 'string'), ('position', 'vector3'), ('destination_offset', 'vector3'),
+                ('walk_speed', 'single'), ('randomize_speech', 'boolean'), ('say_first_speech_line_once', 'boolean'),
+                ('avoids_gomez', 'boolean'), ('actor_type', ActorTypeReader),
+                ('speech', ListReader, [SpeechLineReader]),
+                ('actions', DictionaryReader, [NpcActionReader, NpcActionContentReader])]
 
     def read(self):
         name = self.stream.read_string()
@@ -351,6 +473,12 @@ class NpcInstanceReader(BaseTypeReader, TypeReaderPlugin):
 class MovementPathReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.MovementPath'
     reader_name = 'FezEngine.Readers.MovementPathReader'
+    field_class = MovementPath
+
+    def fields(self):
+        return [('segments', ListReader, [PathSegmentReader]), ('needs_trigger', 'boolean'),
+                ('end_behavior', PathEndBehaviorReader), ('sound_name', StringReader), ('is_spline', 'boolean'),
+                ('offset_seconds', 'single'), ('save_trigger', 'boolean')]
 
     def read(self):
         segments = self.stream.read_object(ListReader, [PathSegmentReader])
@@ -366,6 +494,11 @@ class MovementPathReader(BaseTypeReader, TypeReaderPlugin):
 class AmbienceTrackReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.AmbienceTrack'
     reader_name = 'FezEngine.Readers.AmbienceTrackReader'
+    field_class = AmbienceTrack
+
+    def fields(self):
+        return [('name', StringReader), ('dawn', 'boolean'), ('day', 'boolean'), ('dusk', 'boolean'),
+                ('night', 'boolean')]
 
     def read(self):
         name = self.stream.read_object(StringReader)
@@ -379,6 +512,13 @@ class AmbienceTrackReader(BaseTypeReader, TypeReaderPlugin):
 class VolumeActorSettingsReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.VolumeActorSettings'
     reader_name = 'FezEngine.Readers.VolumeActorSettingsReader'
+    field_class = VolumeActorSettings
+
+    def fields(self):
+        return [('faraway_plane_offset', 'vector2'), ('is_point_of_interest', 'boolean'),
+                ('dot_dialogue', ListReader, [DotDialogueLineReader]), ('water_locked', 'boolean'),
+                ('code_pattern', ArrayReader, [CodeInputReader]), ('is_blackhole', 'boolean'),
+                ('needs_trigger', 'boolean'), ('is_secret_passage', 'boolean')]
 
     def read(self):
         faraway_plane_offset = self.stream.read_vector2()
@@ -396,6 +536,10 @@ class VolumeActorSettingsReader(BaseTypeReader, TypeReaderPlugin):
 class DotDialogueLineReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.DotDialogueLine'
     reader_name = 'FezEngine.Readers.DotDialogueLineReader'
+    field_class = DotDialogueLine
+
+    def fields(self):
+        return [('resource_text', StringReader), ('grouped', 'boolean')]
 
     def read(self):
         resource_text = self.stream.read_object(StringReader)
@@ -406,6 +550,13 @@ class DotDialogueLineReader(BaseTypeReader, TypeReaderPlugin):
 class ScriptReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Scripting.Script'
     reader_name = 'FezEngine.Readers.ScriptReader'
+    field_class = Script
+
+    def fields(self):
+        return [('name', 'string'), ('timeout', TimeSpanReader), ('triggers', ListReader, [ScriptTriggerReader]),
+                ('conditions', ListReader, [ScriptConditionReader]), ('actions', ListReader, [ScriptActionReader]),
+                ('one_time', 'boolean'), ('triggerless', 'boolean'), ('ignore_end_triggers', 'boolean'),
+                ('level_wide_one_time', 'boolean'), ('disabled', 'boolean'), ('is_win_condition', 'boolean')]
 
     def read(self):
         name = self.stream.read_string()
@@ -426,6 +577,10 @@ class ScriptReader(BaseTypeReader, TypeReaderPlugin):
 class ScriptTriggerReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Scripting.ScriptTrigger'
     reader_name = 'FezEngine.Readers.ScriptTriggerReader'
+    field_class = ScriptTrigger
+
+    def fields(self):
+        return [('entity', EntityReader), ('event', 'string')]
 
     def read(self):
         entity = self.stream.read_object(EntityReader)
@@ -436,6 +591,11 @@ class ScriptTriggerReader(BaseTypeReader, TypeReaderPlugin):
 class ScriptActionReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Scripting.ScriptAction'
     reader_name = 'FezEngine.Readers.ScriptActionReader'
+    field_class = ScriptAction
+
+    def fields(self):
+        return [('entity', EntityReader), ('operation', 'string'), ('arguments', ArrayReader, [StringReader]),
+                ('killswitch', 'boolean'), ('blocking', 'boolean')]
 
     def read(self):
         entity = self.stream.read_object(EntityReader)
@@ -449,6 +609,11 @@ class ScriptActionReader(BaseTypeReader, TypeReaderPlugin):
 class ScriptConditionReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Scripting.ScriptCondition'
     reader_name = 'FezEngine.Readers.ScriptConditionReader'
+    field_class = ScriptCondition
+
+    def fields(self):
+        return [('entity', EntityReader), ('operator', ComparisonOperatorReader), ('property_', 'string'),
+                ('value', 'string')]
 
     def read(self):
         entity = self.stream.read_object(EntityReader)
@@ -461,6 +626,10 @@ class ScriptConditionReader(BaseTypeReader, TypeReaderPlugin):
 class EntityReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Scripting.Entity'
     reader_name = 'FezEngine.Readers.EntityReader'
+    field_class = Entity
+
+    def fields(self):
+        return [('entity_type', 'string'), ('identifier', Int32Reader)]
 
     def read(self):
         entity_type = self.stream.read_string()
@@ -471,6 +640,12 @@ class EntityReader(BaseTypeReader, TypeReaderPlugin):
 class InstanceActorSettingsReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.InstanceActorSettings'
     reader_name = 'FezEngine.Readers.InstanceActorSettingsReader'
+    field_class = InstanceActorSettings
+
+    def fields(self):
+        return [('contained_trile', Int32Reader), ('sign_text', StringReader),
+                ('sequence', ArrayReader, [BooleanReader]), ('sequence_sample_name', StringReader),
+                ('sequence_alternate_sample_name', StringReader), ('host_volume', Int32Reader)]
 
     def read(self):
         contained_trile = self.stream.read_object(Int32Reader)
@@ -486,6 +661,16 @@ class InstanceActorSettingsReader(BaseTypeReader, TypeReaderPlugin):
 class ArtObjectActorSettingsReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.ArtObjectActorSettings'
     reader_name = 'FezEngine.Readers.ArtObjectActorSettingsReader'
+    field_class = ArtObjectActorSettings
+
+    def fields(self):
+        return [('inactive', 'boolean'), ('contained_trile', ActorTypeReader), ('attached_group', Int32Reader),
+                ('spin_view', ViewpointReader), ('spin_every', 'single'), ('spin_offset', 'single'),
+                ('off_center', 'boolean'), ('rotation_center', 'vector3'),
+                ('vibration_pattern', ArrayReader, [VibrationMotorReader]),
+                ('code_pattern', ArrayReader, [CodeInputReader]), ('segment', PathSegmentReader),
+                ('next_node', Int32Reader), ('destination_level', StringReader), ('treasure_map_name', StringReader),
+                ('invisible_sides', ArrayReader, [FaceOrientationReader]), ('timeswitch_wind_back_speed', 'single')]
 
     def read(self):
         inactive = self.stream.read_boolean()
@@ -529,10 +714,22 @@ class PathSegmentReader(BaseTypeReader, TypeReaderPlugin):
         return PathSegment(destination, duration, wait_time_on_start, wait_time_on_finish, acceleration, deceleration,
                            jitter_factor, orientation, custom_data)
 
+    def skip(self):
+        self.stream.skip(12)
+        for _ in range(3):
+            self.stream.skip_object(TimeSpanReader)
+        self.stream.skip(28)
+        if self.stream.read_boolean():
+            self.stream.skip_object(CameraNodeDataReader)
+
 
 class SpeechLineReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.SpeechLine'
     reader_name = 'FezEngine.Readers.SpeechLineReader'
+    field_class = SpeechLine
+
+    def fields(self):
+        return [('text', StringReader), ('override_content', NpcActionContentReader)]
 
     def read(self):
         text = self.stream.read_object(StringReader)
@@ -543,6 +740,10 @@ class SpeechLineReader(BaseTypeReader, TypeReaderPlugin):
 class NpcActionContentReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.NpcActionContent'
     reader_name = 'FezEngine.Readers.NpcActionContentReader'
+    field_class = NpcActionContent
+
+    def fields(self):
+        return [('animation_name', StringReader), ('sound_name', StringReader)]
 
     def read(self):
         animation_name = self.stream.read_object(StringReader)
@@ -553,6 +754,10 @@ class NpcActionContentReader(BaseTypeReader, TypeReaderPlugin):
 class CameraNodeDataReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.CameraNodeData'
     reader_name = 'FezEngine.Readers.CameraNodeDataReader'
+    field_class = CameraNodeData
+
+    def fields(self):
+        return [('perspective', 'boolean'), ('pixels_per_trixel', 'int32'), ('sound_name', StringReader)]
 
     def read(self):
         perspective = self.stream.read_boolean()
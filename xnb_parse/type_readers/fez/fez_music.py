@@ -25,6 +25,15 @@ class TrackedSongReader(BaseTypeReader, TypeReaderPlugin):
         custom_ordering = self.stream.read_object(ArrayReader, [Int32Reader])
         return TrackedSong(loops, name, tempo, time_signature, notes, assemble_chord, random_ordering, custom_ordering)
 
+    def skip(self):
+        self.stream.skip_object(ListReader, [LoopReader])
+        self.stream.skip_string()
+        self.stream.skip(8)
+        self.stream.skip_object(ArrayReader, [ShardNotesReader])
+        self.stream.skip_object(AssembleChordsReader)
+        self.stream.skip(1)
+        self.stream.skip_object(ArrayReader, [Int32Reader])
+
 
 class LoopReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Loop'
@@ -48,6 +57,11 @@ class LoopReader(BaseTypeReader, TypeReaderPlugin):
         return Loop(duration, loop_times_from, loop_times_to, name, trigger_from, trigger_to, delay, night, day, dusk,
                     dawn, fractional_time, one_at_a_time, cut_off_tail)
 
+    def skip(self):
+        self.stream.skip(12)
+        self.stream.skip_string()
+        self.stream.skip(19)
+
 
 class ShardNotesReader(EnumTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.ShardNotes'
@@ -0,0 +1,356 @@
+"""
+static map of type readers to the modules defining them, so reader modules are only imported when first needed
+"""
+
+from __future__ import print_function
+
+from importlib import import_module
+
+
+PACKAGE = 'xnb_parse.type_readers.'
+# regenerate with build_manifest when readers are added, readers missing from the manifest still load but every
+# reader module has to be imported to find them
+READER_MODULES = ['xna_primitive', 'xna_system', 'xna_math', 'xna_graphics', 'xna_media', 'fez.fez_basic',
+                  'fez.fez_graphics', 'fez.fez_level', 'fez.fez_music', 'mercury.basic', 'mercury.emitters',
+                  'mercury.modifiers', 'mercury.particle', 'xTile.xTile_graphics']
+# reader name -> module
+READERS = {
+    'FezEngine.FaceOrientationReader': 'fez.fez_basic',
+    'FezEngine.LevelNodeTypeReader': 'fez.fez_basic',
+    'FezEngine.Readers.ActorTypeReader': 'fez.fez_basic',
+    'FezEngine.Readers.AmbienceTrackReader': 'fez.fez_level',
+    'FezEngine.Readers.AnimatedTextureReader': 'fez.fez_graphics',
+    'FezEngine.Readers.ArtObjectActorSettingsReader': 'fez.fez_level',
+    'FezEngine.Readers.ArtObjectInstanceReader': 'fez.fez_level',
+    'FezEngine.Readers.ArtObjectReader': 'fez.fez_graphics',
+    'FezEngine.Readers.AssembleChordsReader': 'fez.fez_music',
+    'FezEngine.Readers.BackgroundPlaneReader': 'fez.fez_level',
+    'FezEngine.Readers.CameraNodeDataReader': 'fez.fez_level',
+    'FezEngine.Readers.CodeInputReader': 'fez.fez_basic',
+    'FezEngine.Readers.CollisionTypeReader': 'fez.fez_basic',
+    'FezEngine.Readers.ComparisonOperatorReader': 'fez.fez_basic',
+    'FezEngine.Readers.DotDialogueLineReader': 'fez.fez_level',
+    'FezEngine.Readers.EntityReader': 'fez.fez_level',
+    'FezEngine.Readers.FrameReader': 'fez.fez_graphics',
+    'FezEngine.Readers.InstanceActorSettingsReader': 'fez.fez_level',
+    'FezEngine.Readers.LevelReader': 'fez.fez_level',
+    'FezEngine.Readers.LiquidTypeReader': 'fez.fez_basic',
+    'FezEngine.Readers.LoopReader': 'fez.fez_music',
+    'FezEngine.Readers.MapNodeConnectionReader': 'fez.fez_level',
+    'FezEngine.Readers.MapNodeReader': 'fez.fez_level',
+    'FezEngine.Readers.MapTreeReader': 'fez.fez_level',
+    'FezEngine.Readers.MovementPathReader': 'fez.fez_level',
+    'FezEngine.Readers.NpcActionContentReader': 'fez.fez_level',
+    'FezEngine.Readers.NpcActionReader': 'fez.fez_basic',
+    'FezEngine.Readers.NpcInstanceReader': 'fez.fez_level',
+    'FezEngine.Readers.NpcMetadataReader': 'fez.fez_graphics',
+    'FezEngine.Readers.PathEndBehaviorReader': 'fez.fez_basic',
+    'FezEngine.Readers.PathSegmentReader': 'fez.fez_level',
+    'FezEngine.Readers.ScriptActionReader': 'fez.fez_level',
+    'FezEngine.Readers.ScriptConditionReader': 'fez.fez_level',
+    'FezEngine.Readers.ScriptReader': 'fez.fez_level',
+    'FezEngine.Readers.ScriptTriggerReader': 'fez.fez_level',
+    'FezEngine.Readers.ShardNotesReader': 'fez.fez_music',
+    'FezEngine.Readers.SkyLayerReader': 'fez.fez_level',
+    'FezEngine.Readers.SkyReader': 'fez.fez_level',
+    'FezEngine.Readers.SpeechLineReader': 'fez.fez_level',
+    'FezEngine.Readers.SurfaceTypeReader': 'fez.fez_basic',
+    'FezEngine.Readers.TrackedSongReader': 'fez.fez_music',
+    'FezEngine.Readers.TrileEmplacementReader': 'fez.fez_level',
+    'FezEngine.Readers.TrileFaceReader': 'fez.fez_level',
+    'FezEngine.Readers.TrileGroupReader': 'fez.fez_level',
+    'FezEngine.Readers.TrileInstanceReader': 'fez.fez_level',
+    'FezEngine.Readers.TrileReader': 'fez.fez_level',
+    'FezEngine.Readers.TrileSetReader': 'fez.fez_level',
+    'FezEngine.Readers.VertexPositionNormalTextureInstanceReader': 'fez.fez_graphics',
+    'FezEngine.Readers.VibrationMotorReader': 'fez.fez_basic',
+    'FezEngine.Readers.ViewpointReader': 'fez.fez_basic',
+    'FezEngine.Readers.VolumeActorSettingsReader': 'fez.fez_level',
+    'FezEngine.Readers.VolumeReader': 'fez.fez_level',
+    'FezEngine.Readers.WinConditionsReader': 'fez.fez_level',
+    'Microsoft.Xna.Framework.Content.BasicEffectReader': 'xna_graphics',
+    'Microsoft.Xna.Framework.Content.BooleanReader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.BoundingBoxReader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.BoundingFrustumReader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.BoundingSphereReader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.ByteReader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.CharReader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.ColorReader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.CurveReader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.DateTimeReader': 'xna_system',
+    'Microsoft.Xna.Framework.Content.DecimalReader': 'xna_system',
+    'Microsoft.Xna.Framework.Content.DoubleReader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.EffectMaterialReader': 'xna_graphics',
+    'Microsoft.Xna.Framework.Content.EffectReader': 'xna_graphics',
+    'Microsoft.Xna.Framework.Content.ExternalReferenceReader': 'xna_system',
+    'Microsoft.Xna.Framework.Content.IndexBufferReader': 'xna_graphics',
+    'Microsoft.Xna.Framework.Content.Int16Reader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.Int32Reader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.Int64Reader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.MatrixReader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.ModelReader': 'xna_graphics',
+    'Microsoft.Xna.Framework.Content.ObjectReader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.PlaneReader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.PointReader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.PrimitiveTypeReader': 'xna_graphics',
+    'Microsoft.Xna.Framework.Content.QuaternionReader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.RayReader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.RectangleReader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Emitters.CircleEmitter]': 'mercury.emitters',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Emitters.ConeEmitter]': 'mercury.emitters',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Emitters.EmitterCollection]': 'mercury.emitters',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Emitters.Emitter]': 'mercury.emitters',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Emitters.LineEmitter]': 'mercury.emitters',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ColourInterpolatorModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ColourMergeModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ColourModifier]': 'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.DampingModifier]': 'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.HueShiftModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.LinearGravityModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ModifierCollection]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.Modifier]': 'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.OpacityInterpolatorModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.OpacityModifier]': 'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.OpacityOscillator]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RadialForceModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RadialGravityModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RectangleConstraintDeflector]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RectangleForceModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RotationModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RotationRateModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ScaleInterpolatorModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ScaleMergeModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ScaleModifier]': 'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ScaleOscillator]': 'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.SineForceModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.TrajectoryRotationModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.VelocityClampModifier]':
+        'mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.ParticleEffect]': 'mercury.particle',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.VariableFloat3]': 'mercury.basic',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.VariableFloat]': 'mercury.basic',
+    'Microsoft.Xna.Framework.Content.SByteReader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.SingleReader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.SongReader': 'xna_media',
+    'Microsoft.Xna.Framework.Content.SoundEffectReader': 'xna_media',
+    'Microsoft.Xna.Framework.Content.SpriteFontReader': 'xna_graphics',
+    'Microsoft.Xna.Framework.Content.StringReader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.Texture2DReader': 'xna_graphics',
+    'Microsoft.Xna.Framework.Content.Texture3DReader': 'xna_graphics',
+    'Microsoft.Xna.Framework.Content.TextureCubeReader': 'xna_graphics',
+    'Microsoft.Xna.Framework.Content.TextureReader': 'xna_graphics',
+    'Microsoft.Xna.Framework.Content.TimeSpanReader': 'xna_system',
+    'Microsoft.Xna.Framework.Content.UInt16Reader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.UInt32Reader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.UInt64Reader': 'xna_primitive',
+    'Microsoft.Xna.Framework.Content.Vector2Reader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.Vector3Reader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.Vector4Reader': 'xna_math',
+    'Microsoft.Xna.Framework.Content.VertexBufferReader': 'xna_graphics',
+    'Microsoft.Xna.Framework.Content.VertexDeclarationReader': 'xna_graphics',
+    'Microsoft.Xna.Framework.Content.VideoReader': 'xna_media',
+    'ProjectMercury.BlendMode': 'mercury.basic',
+    'xTile.Pipeline.TideReader': 'xTile.xTile_graphics',
+}
+# target type -> module
+TARGET_TYPES = {
+    'ExternalReference': 'xna_system',
+    'FezEngine.CollisionType': 'fez.fez_basic',
+    'FezEngine.Content.FrameContent': 'fez.fez_graphics',
+    'FezEngine.FaceOrientation': 'fez.fez_basic',
+    'FezEngine.LevelNodeType': 'fez.fez_basic',
+    'FezEngine.Structure.ActorType': 'fez.fez_basic',
+    'FezEngine.Structure.AmbienceTrack': 'fez.fez_level',
+    'FezEngine.Structure.AnimatedTexture': 'fez.fez_graphics',
+    'FezEngine.Structure.ArtObject': 'fez.fez_graphics',
+    'FezEngine.Structure.ArtObjectActorSettings': 'fez.fez_level',
+    'FezEngine.Structure.ArtObjectInstance': 'fez.fez_level',
+    'FezEngine.Structure.AssembleChords': 'fez.fez_music',
+    'FezEngine.Structure.BackgroundPlane': 'fez.fez_level',
+    'FezEngine.Structure.CameraNodeData': 'fez.fez_level',
+    'FezEngine.Structure.DotDialogueLine': 'fez.fez_level',
+    'FezEngine.Structure.Geometry.VertexPositionNormalTextureInstance': 'fez.fez_graphics',
+    'FezEngine.Structure.Input.CodeInput': 'fez.fez_basic',
+    'FezEngine.Structure.Input.VibrationMotor': 'fez.fez_basic',
+    'FezEngine.Structure.InstanceActorSettings': 'fez.fez_level',
+    'FezEngine.Structure.Level': 'fez.fez_level',
+    'FezEngine.Structure.LiquidType': 'fez.fez_basic',
+    'FezEngine.Structure.Loop': 'fez.fez_music',
+    'FezEngine.Structure.MapNode': 'fez.fez_level',
+    'FezEngine.Structure.MapNode+Connection': 'fez.fez_level',
+    'FezEngine.Structure.MapTree': 'fez.fez_level',
+    'FezEngine.Structure.MovementPath': 'fez.fez_level',
+    'FezEngine.Structure.NpcAction': 'fez.fez_basic',
+    'FezEngine.Structure.NpcActionContent': 'fez.fez_level',
+    'FezEngine.Structure.NpcInstance': 'fez.fez_level',
+    'FezEngine.Structure.NpcMetadata': 'fez.fez_graphics',
+    'FezEngine.Structure.PathEndBehavior': 'fez.fez_basic',
+    'FezEngine.Structure.PathSegment': 'fez.fez_level',
+    'FezEngine.Structure.Scripting.ComparisonOperator': 'fez.fez_basic',
+    'FezEngine.Structure.Scripting.Entity': 'fez.fez_level',
+    'FezEngine.Structure.Scripting.Script': 'fez.fez_level',
+    'FezEngine.Structure.Scripting.ScriptAction': 'fez.fez_level',
+    'FezEngine.Structure.Scripting.ScriptCondition': 'fez.fez_level',
+    'FezEngine.Structure.Scripting.ScriptTrigger': 'fez.fez_level',
+    'FezEngine.Structure.ShardNotes': 'fez.fez_music',
+    'FezEngine.Structure.Sky': 'fez.fez_level',
+    'FezEngine.Structure.SkyLayer': 'fez.fez_level',
+    'FezEngine.Structure.SpeechLine': 'fez.fez_level',
+    'FezEngine.Structure.SurfaceType': 'fez.fez_basic',
+    'FezEngine.Structure.TrackedSong': 'fez.fez_music',
+    'FezEngine.Structure.Trile': 'fez.fez_level',
+    'FezEngine.Structure.TrileEmplacement': 'fez.fez_level',
+    'FezEngine.Structure.TrileFace': 'fez.fez_level',
+    'FezEngine.Structure.TrileGroup': 'fez.fez_level',
+    'FezEngine.Structure.TrileInstance': 'fez.fez_level',
+    'FezEngine.Structure.TrileSet': 'fez.fez_level',
+    'FezEngine.Structure.Volume': 'fez.fez_level',
+    'FezEngine.Structure.VolumeActorSettings': 'fez.fez_level',
+    'FezEngine.Structure.WinConditions': 'fez.fez_level',
+    'FezEngine.Viewpoint': 'fez.fez_basic',
+    'Microsoft.Xna.Framework.Audio.SoundEffect': 'xna_media',
+    'Microsoft.Xna.Framework.BoundingBox': 'xna_math',
+    'Microsoft.Xna.Framework.BoundingFrustum': 'xna_math',
+    'Microsoft.Xna.Framework.BoundingSphere': 'xna_math',
+    'Microsoft.Xna.Framework.Curve': 'xna_math',
+    'Microsoft.Xna.Framework.Graphics.BasicEffect': 'xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.Color': 'xna_math',
+    'Microsoft.Xna.Framework.Graphics.Effect': 'xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.EffectMaterial': 'xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.IndexBuffer': 'xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.Model': 'xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.PrimitiveType': 'xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.SpriteFont': 'xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.Texture': 'xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.Texture2D': 'xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.Texture3D': 'xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.TextureCube': 'xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.VertexBuffer': 'xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.VertexDeclaration': 'xna_graphics',
+    'Microsoft.Xna.Framework.Matrix': 'xna_math',
+    'Microsoft.Xna.Framework.Media.Song': 'xna_media',
+    'Microsoft.Xna.Framework.Media.Video': 'xna_media',
+    'Microsoft.Xna.Framework.Plane': 'xna_math',
+    'Microsoft.Xna.Framework.Point': 'xna_math',
+    'Microsoft.Xna.Framework.Quaternion': 'xna_math',
+    'Microsoft.Xna.Framework.Ray': 'xna_math',
+    'Microsoft.Xna.Framework.Rectangle': 'xna_math',
+    'Microsoft.Xna.Framework.Vector2': 'xna_math',
+    'Microsoft.Xna.Framework.Vector3': 'xna_math',
+    'Microsoft.Xna.Framework.Vector4': 'xna_math',
+    'ProjectMercury.BlendMode': 'mercury.basic',
+    'ProjectMercury.Emitters.CircleEmitter': 'mercury.emitters',
+    'ProjectMercury.Emitters.ConeEmitter': 'mercury.emitters',
+    'ProjectMercury.Emitters.Emitter': 'mercury.emitters',
+    'ProjectMercury.Emitters.EmitterCollection': 'mercury.emitters',
+    'ProjectMercury.Emitters.LineEmitter': 'mercury.emitters',
+    'ProjectMercury.Modifiers.ColourInterpolatorModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.ColourMergeModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.ColourModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.DampingModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.HueShiftModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.LinearGravityModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.Modifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.ModifierCollection': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.OpacityInterpolatorModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.OpacityModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.OpacityOscillator': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.RadialForceModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.RadialGravityModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.RectangleConstraintDeflector': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.RectangleForceModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.RotationModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.RotationRateModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.ScaleInterpolatorModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.ScaleMergeModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.ScaleModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.ScaleOscillator': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.SineForceModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.TrajectoryRotationModifier': 'mercury.modifiers',
+    'ProjectMercury.Modifiers.VelocityClampModifier': 'mercury.modifiers',
+    'ProjectMercury.ParticleEffect': 'mercury.particle',
+    'ProjectMercury.VariableFloat': 'mercury.basic',
+    'ProjectMercury.VariableFloat3': 'mercury.basic',
+    'System.Boolean': 'xna_primitive',
+    'System.Byte': 'xna_primitive',
+    'System.Char': 'xna_primitive',
+    'System.DateTime': 'xna_system',
+    'System.Decimal': 'xna_system',
+    'System.Double': 'xna_primitive',
+    'System.Int16': 'xna_primitive',
+    'System.Int32': 'xna_primitive',
+    'System.Int64': 'xna_primitive',
+    'System.Object': 'xna_primitive',
+    'System.SByte': 'xna_primitive',
+    'System.Single': 'xna_primitive',
+    'System.String': 'xna_primitive',
+    'System.TimeSpan': 'xna_system',
+    'System.UInt16': 'xna_primitive',
+    'System.UInt32': 'xna_primitive',
+    'System.UInt64': 'xna_primitive',
+    'xTile.Map': 'xTile.xTile_graphics',
+}
+# generic reader name -> module
+GENERIC_READERS = {
+    'FezEngine.IEqualityComparerReader`1': 'fez.fez_basic',
+    'FezEngine.Readers.ShaderInstancedIndexedPrimitivesReader`2': 'fez.fez_graphics',
+    'FezEngine.SetReader`1': 'fez.fez_basic',
+    'Microsoft.Xna.Framework.Content.ArrayReader`1': 'xna_system',
+    'Microsoft.Xna.Framework.Content.DictionaryReader`2': 'xna_system',
+    'Microsoft.Xna.Framework.Content.EnumReader`1': 'xna_system',
+    'Microsoft.Xna.Framework.Content.ListReader`1': 'xna_system',
+    'Microsoft.Xna.Framework.Content.NullableReader`1': 'xna_system',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1': 'xna_system',
+}
+# generic target type -> module
+GENERIC_TARGET_TYPES = {
+    'Common.Set`1': 'fez.fez_basic',
+    'FezEngine.Structure.Geometry.ShaderInstancedIndexedPrimitives`2': 'fez.fez_graphics',
+    'Reflective': 'xna_system',
+    'System.Array`1': 'xna_system',
+    'System.Collections.Generic.Dictionary`2': 'xna_system',
+    'System.Collections.Generic.IEqualityComparer`1': 'fez.fez_basic',
+    'System.Collections.Generic.List`1': 'xna_system',
+    'System.Enum`1': 'xna_system',
+    'System.Nullable`1': 'xna_system',
+}
+
+
+def build_manifest():
+    """
+    import every reader module and map the readers found to their modules, returns the manifest dicts in order
+    """
+    # avoid circular import
+    from xnb_parse.type_reader import TypeReaderPlugin, GenericTypeReader
+    for module in READER_MODULES:
+        import_module(PACKAGE + module)
+    readers, target_types, generic_readers, generic_target_types = {}, {}, {}, {}
+    for class_ in TypeReaderPlugin.__subclasses__():
+        if getattr(class_, 'generic_params', None) is not None:
+            # built from a generic reader
+            continue
+        module = class_.__module__[len(PACKAGE):]
+        if issubclass(class_, GenericTypeReader):
+            generic_readers[class_.generic_reader_name] = module
+            generic_target_types[class_.generic_target_type] = module
+        else:
+            readers[class_.reader_name] = module
+            target_types[class_.target_type] = module
+    return readers, target_types, generic_readers, generic_target_types
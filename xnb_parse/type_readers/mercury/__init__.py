@@ -4,7 +4,5 @@ mercury particle engine type readers
 
 from __future__ import print_function
 
-from xnb_parse.type_readers.mercury import basic, emitters, modifiers, particle
-
 
 __all__ = ['particle', 'basic', 'emitters', 'modifiers']
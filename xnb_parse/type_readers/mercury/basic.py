@@ -11,6 +11,7 @@ from xnb_parse.xna_types.mercury.basic import BlendMode, VariableFloat, Variable
 class VariableFloatReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.VariableFloat'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.VariableFloat]'
+    fixed_size = 8
 
     def read(self):
         value = self.stream.read_single()
@@ -21,6 +22,7 @@ class VariableFloatReader(ValueTypeReader, TypeReaderPlugin):
 class VariableFloat3Reader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.VariableFloat3'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.VariableFloat3]'
+    fixed_size = 24
 
     def read(self):
         value = self.stream.read_vector3()
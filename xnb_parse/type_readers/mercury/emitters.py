@@ -20,6 +20,10 @@ class EmitterCollectionReader(BaseTypeReader, TypeReaderPlugin):
         elements = self.stream.read_int32()
         return EmitterCollection(XNAList([self.stream.read_object(EmitterReader) for _ in range(elements)]))
 
+    def skip(self):
+        for _ in range(self.stream.read_int32()):
+            self.stream.skip_object(EmitterReader)
+
 
 class EmitterReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Emitters.Emitter'
@@ -47,6 +51,19 @@ class EmitterReader(BaseTypeReader, TypeReaderPlugin):
                        release_scale, release_rotation, release_impulse, particle_texture_asset_name, modifiers,
                        blend_mode, trigger_offset, minimum_trigger_period)
 
+    def skip(self):
+        self.stream.skip_object(StringReader)
+        self.stream.skip(13)
+        self.stream.skip_value_or_object(VariableFloatReader)
+        self.stream.skip_value_or_object(VariableFloat3Reader)
+        for _ in range(3):
+            self.stream.skip_value_or_object(VariableFloatReader)
+        self.stream.skip(8)
+        self.stream.skip_object(StringReader)
+        self.stream.skip_object(ModifierCollectionReader)
+        self.stream.skip_value_or_object(BlendModeReader)
+        self.stream.skip(12)
+
 
 class CircleEmitterReader(EmitterReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Emitters.CircleEmitter'
@@ -59,6 +76,10 @@ class CircleEmitterReader(EmitterReader, TypeReaderPlugin):
         radiate = self.stream.read_boolean()
         return CircleEmitter.make(emitter, radius, ring, radiate)
 
+    def skip(self):
+        EmitterReader.skip(self)
+        self.stream.skip(6)
+
 
 class ConeEmitterReader(EmitterReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Emitters.ConeEmitter'
@@ -70,6 +91,10 @@ class ConeEmitterReader(EmitterReader, TypeReaderPlugin):
         cone_angle = self.stream.read_single()
         return ConeEmitter.make(emitter, direction, cone_angle)
 
+    def skip(self):
+        EmitterReader.skip(self)
+        self.stream.skip(8)
+
 
 class LineEmitterReader(EmitterReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Emitters.LineEmitter'
@@ -82,3 +107,7 @@ class LineEmitterReader(EmitterReader, TypeReaderPlugin):
         rectilinear = self.stream.read_boolean()
         emit_both_ways = self.stream.read_boolean()
         return LineEmitter.make(emitter, length, angle, rectilinear, emit_both_ways)
+
+    def skip(self):
+        EmitterReader.skip(self)
+        self.stream.skip(10)
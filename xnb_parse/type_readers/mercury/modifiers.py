@@ -25,6 +25,10 @@ class ModifierCollectionReader(BaseTypeReader, TypeReaderPlugin):
         elements = self.stream.read_int32()
         return ModifierCollection(XNAList([self.stream.read_object(ModifierReader) for _ in range(elements)]))
 
+    def skip(self):
+        for _ in range(self.stream.read_int32()):
+            self.stream.skip_object(ModifierReader)
+
 
 class ModifierReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.Modifier'
@@ -33,10 +37,17 @@ class ModifierReader(BaseTypeReader, TypeReaderPlugin):
     def read(self):
         raise ReaderError('ModifierReader invoked for {}'.format(self.target_type))
 
+    def skip(self):
+        # every concrete modifier has a fixed size
+        if self.fixed_size is None:
+            raise ReaderError('ModifierReader invoked for {}'.format(self.target_type))
+        self.stream.skip(self.fixed_size)
+
 
 class OpacityModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.OpacityModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.OpacityModifier]'
+    fixed_size = 8
 
     def read(self):
         initial = self.stream.read_single()
@@ -47,6 +58,7 @@ class OpacityModifierReader(ModifierReader, TypeReaderPlugin):
 class ScaleModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.ScaleModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ScaleModifier]'
+    fixed_size = 8
 
     def read(self):
         initial_scale = self.stream.read_single()
@@ -57,6 +69,7 @@ class ScaleModifierReader(ModifierReader, TypeReaderPlugin):
 class RotationRateModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.RotationRateModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RotationRateModifier]'
+    fixed_size = 8
 
     def read(self):
         initial_rate = self.stream.read_single()
@@ -67,6 +80,7 @@ class RotationRateModifierReader(ModifierReader, TypeReaderPlugin):
 class ColourModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.ColourModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ColourModifier]'
+    fixed_size = 24
 
     def read(self):
         initial_colour = self.stream.read_vector3()
@@ -77,6 +91,7 @@ class ColourModifierReader(ModifierReader, TypeReaderPlugin):
 class LinearGravityModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.LinearGravityModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.LinearGravityModifier]'
+    fixed_size = 8
 
     def read(self):
         gravity = self.stream.read_vector2()
@@ -87,6 +102,7 @@ class ColourInterpolatorModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.ColourInterpolatorModifier'
     reader_name = \
         'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ColourInterpolatorModifier]'
+    fixed_size = 40
 
     def read(self):
         initial_colour = self.stream.read_vector3()
@@ -99,6 +115,7 @@ class ColourInterpolatorModifierReader(ModifierReader, TypeReaderPlugin):
 class ColourMergeModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.ColourMergeModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ColourMergeModifier]'
+    fixed_size = 12
 
     def read(self):
         merge_colour = self.stream.read_vector3()
@@ -108,6 +125,7 @@ class ColourMergeModifierReader(ModifierReader, TypeReaderPlugin):
 class DampingModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.DampingModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.DampingModifier]'
+    fixed_size = 4
 
     def read(self):
         damping_coefficient = self.stream.read_single()
@@ -117,9 +135,10 @@ class DampingModifierReader(ModifierReader, TypeReaderPlugin):
 class HueShiftModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.HueShiftModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.HueShiftModifier]'
+    fixed_size = 4
 
     def read(self):
-        hue_shift = self.stream.single()
+        hue_shift = self.stream.read_single()
         return HueShiftModifier(hue_shift)
 
 
@@ -127,6 +146,7 @@ class OpacityInterpolatorModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.OpacityInterpolatorModifier'
     reader_name = \
         'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.OpacityInterpolatorModifier]'
+    fixed_size = 16
 
     def read(self):
         initial_opacity = self.stream.read_single()
@@ -139,6 +159,7 @@ class OpacityInterpolatorModifierReader(ModifierReader, TypeReaderPlugin):
 class OpacityOscillatorReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.OpacityOscillator'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.OpacityOscillator]'
+    fixed_size = 12
 
     def read(self):
         frequency = self.stream.read_single()
@@ -150,6 +171,7 @@ class OpacityOscillatorReader(ModifierReader, TypeReaderPlugin):
 class RotationModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.RotationModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RotationModifier]'
+    fixed_size = 4
 
     def read(self):
         rotation_rate = self.stream.read_single()
@@ -160,6 +182,7 @@ class TrajectoryRotationModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.TrajectoryRotationModifier'
     reader_name = \
         'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.TrajectoryRotationModifier]'
+    fixed_size = 4
 
     def read(self):
         rotation_offset = self.stream.read_single()
@@ -169,6 +192,7 @@ class TrajectoryRotationModifierReader(ModifierReader, TypeReaderPlugin):
 class RadialForceModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.RadialForceModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RadialForceModifier]'
+    fixed_size = 24
 
     def read(self):
         radius = self.stream.read_single()
@@ -181,6 +205,7 @@ class RadialForceModifierReader(ModifierReader, TypeReaderPlugin):
 class RadialGravityModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.RadialGravityModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RadialGravityModifier]'
+    fixed_size = 12
 
     def read(self):
         radius = self.stream.read_single()
@@ -192,6 +217,7 @@ class RectangleConstraintDeflectorReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.RectangleConstraintDeflector'
     reader_name = \
         'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RectangleConstraintDeflector]'
+    fixed_size = 16
 
     def read(self):
         width = self.stream.read_single()
@@ -203,6 +229,7 @@ class RectangleConstraintDeflectorReader(ModifierReader, TypeReaderPlugin):
 class RectangleForceModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.RectangleForceModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RectangleForceModifier]'
+    fixed_size = 28
 
     def read(self):
         width = self.stream.read_single()
@@ -217,6 +244,7 @@ class ScaleInterpolatorModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.ScaleInterpolatorModifier'
     reader_name = \
         'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ScaleInterpolatorModifier]'
+    fixed_size = 16
 
     def read(self):
         initial_scale = self.stream.read_single()
@@ -229,6 +257,7 @@ class ScaleInterpolatorModifierReader(ModifierReader, TypeReaderPlugin):
 class ScaleMergeModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.ScaleMergeModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ScaleMergeModifier]'
+    fixed_size = 4
 
     def read(self):
         merge_scale = self.stream.read_single()
@@ -238,6 +267,7 @@ class ScaleMergeModifierReader(ModifierReader, TypeReaderPlugin):
 class ScaleOscillatorReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.ScaleOscillator'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ScaleOscillator]'
+    fixed_size = 12
 
     def read(self):
         frequency = self.stream.read_single()
@@ -249,6 +279,7 @@ class ScaleOscillatorReader(ModifierReader, TypeReaderPlugin):
 class SineForceModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.SineForceModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.SineForceModifier]'
+    fixed_size = 12
 
     def read(self):
         rotation = self.stream.read_single()
@@ -260,6 +291,7 @@ class SineForceModifierReader(ModifierReader, TypeReaderPlugin):
 class VelocityClampModifierReader(ModifierReader, TypeReaderPlugin):
     target_type = 'ProjectMercury.Modifiers.VelocityClampModifier'
     reader_name = 'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.VelocityClampModifier]'
+    fixed_size = 4
 
     def read(self):
         maximum_velocity = self.stream.read_single()
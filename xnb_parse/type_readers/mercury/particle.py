@@ -20,3 +20,8 @@ class ParticleEffectReader(EmitterCollectionReader, TypeReaderPlugin):
         author = self.stream.read_object(StringReader)
         description = self.stream.read_object(StringReader)
         return ParticleEffect(emitters, name, author, description)
+
+    def skip(self):
+        EmitterCollectionReader.skip(self)
+        for _ in range(3):
+            self.stream.skip_object(StringReader)
@@ -4,7 +4,5 @@ xTile type readers!
 
 from __future__ import print_function
 
-from xnb_parse.type_readers.xTile import xTile_graphics
-
 
 __all__ = ['xTile_graphics']
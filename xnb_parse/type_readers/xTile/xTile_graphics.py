@@ -33,6 +33,13 @@ class XtileMapReader(BaseTypeReader, TypeReaderPlugin):
         else:
             raise NotImplementedError('Only windows support at this moment')
 
+    def skip(self):
+        if self.file_platform == PLATFORM_WINDOWS:
+            # the map is stored as a length prefixed tBIN file
+            self.stream.skip(self.stream.read_int32())
+        else:
+            raise NotImplementedError('Only windows support at this moment')
+
     def read_properties(self):
         property_count = self.stream.read_int32()
 
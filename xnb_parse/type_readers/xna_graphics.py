@@ -4,13 +4,35 @@ graphics type readers
 
 from __future__ import print_function
 
+from functools import partial
+
 from xnb_parse.type_reader import TypeReaderPlugin, BaseTypeReader, ReaderError, EnumTypeReader
 from xnb_parse.type_readers.xna_math import Vector3Reader, RectangleReader
 from xnb_parse.type_readers.xna_primitive import CharReader, StringReader, ObjectReader
 from xnb_parse.type_readers.xna_system import ListReader, DictionaryReader
 from xnb_parse.xna_types.xna_graphics import (Texture2D, Texture3D, TextureCube, CUBE_SIDES, IndexBuffer, Effect,
                                               get_surface_format, PrimitiveType, SpriteFont, BasicEffect,
-                                              PrimitiveType4)
+                                              PrimitiveType4, Model, ModelBone, ModelMesh, ModelMeshPart, VertexBuffer,
+                                              VertexDeclaration, VertexElementFormat, VertexElementUsage)
+from xnb_parse.xna_types.xna_math import Vector3, BoundingSphere
+
+# avoiding circular import
+VERSION_40 = 5
+
+
+def skip_mip_levels(stream, count):
+    for _ in range(count):
+        stream.skip(stream.read_int32())
+
+
+def read_vertex_declaration(stream):
+    # XNA 4.0 layout, also stored inline in every 4.0 VertexBuffer
+    vertex_stride = stream.read_uint32()
+    element_count = stream.read_uint32()
+    elements = []
+    for offset, v_format, v_usage, usage_index in stream.unpack_array('4i', element_count):
+        elements.append((offset, VertexElementFormat(v_format), VertexElementUsage(v_usage), usage_index))
+    return VertexDeclaration(vertex_stride, elements)
 
 
 class TextureReader(BaseTypeReader, TypeReaderPlugin):
@@ -20,6 +42,9 @@ class TextureReader(BaseTypeReader, TypeReaderPlugin):
     def read(self):
         raise ReaderError("TextureReader should never be invoked directly")
 
+    def skip(self):
+        raise ReaderError("TextureReader should never be invoked directly")
+
 
 class Texture2DReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Graphics.Texture2D'
@@ -34,10 +59,23 @@ class Texture2DReader(BaseTypeReader, TypeReaderPlugin):
         mip_levels = []
         for _ in range(mip_count):
             size = self.stream.read_int32()
-            data = self.stream.read(size)
-            mip_levels.append(data)
+            mip_levels.append(self.stream.read_slice(size))
         return Texture2D(surface_format, width, height, mip_levels, self.stream.needs_swap)
 
+    def skip(self):
+        self.stream.skip(12)
+        skip_mip_levels(self.stream, self.stream.read_int32())
+
+    def read_fields(self, names):
+        # the header is enough for the format and dimensions, mip data is only read if asked for
+        names = self.check_field_names(names, ['surface_format', 'width', 'height', 'mip_levels'])
+        surface_format_raw, width, height, mip_count = self.stream.unpack('4i')
+        values = {'surface_format': get_surface_format(self.stream.file_version, surface_format_raw),
+                  'width': width, 'height': height}
+        if 'mip_levels' in names:
+            values['mip_levels'] = [self.stream.read(self.stream.read_int32()) for _ in range(mip_count)]
+        return {name: values[name] for name in names}
+
 
 class Texture3DReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Graphics.Texture3D'
@@ -53,10 +91,13 @@ class Texture3DReader(BaseTypeReader, TypeReaderPlugin):
         mip_levels = []
         for _ in range(mip_count):
             size = self.stream.read_int32()
-            data = self.stream.read(size)
-            mip_levels.append(data)
+            mip_levels.append(self.stream.read_slice(size))
         return Texture3D(surface_format, width, height, depth, mip_levels, self.stream.needs_swap)
 
+    def skip(self):
+        self.stream.skip(16)
+        skip_mip_levels(self.stream, self.stream.read_int32())
+
 
 class TextureCubeReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Graphics.TextureCube'
@@ -72,11 +113,14 @@ class TextureCubeReader(BaseTypeReader, TypeReaderPlugin):
             mip_levels = []
             for _ in range(mip_count):
                 size = self.stream.read_int32()
-                data = self.stream.read(size)
-                mip_levels.append(data)
+                mip_levels.append(self.stream.read_slice(size))
             sides[side] = mip_levels
         return TextureCube(surface_format, texture_size, sides, self.stream.needs_swap)
 
+    def skip(self):
+        self.stream.skip(8)
+        skip_mip_levels(self.stream, self.stream.read_int32() * len(CUBE_SIDES))
+
 
 class IndexBufferReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Graphics.IndexBuffer'
@@ -85,18 +129,35 @@ class IndexBufferReader(BaseTypeReader, TypeReaderPlugin):
     def read(self):
         index_16 = self.stream.read_boolean()
         size = self.stream.read_int32()
-        data = self.stream.read(size)
+        data = self.stream.read_slice(size)
         return IndexBuffer(index_16, data)
 
+    def skip(self):
+        self.stream.skip(1)
+        self.stream.skip(self.stream.read_int32())
+
 
 class VertexBufferReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Graphics.VertexBuffer'
     reader_name = 'Microsoft.Xna.Framework.Content.VertexBufferReader'
 
     def read(self):
+        if self.file_version == VERSION_40:
+            declaration = read_vertex_declaration(self.stream)
+            vertex_count = self.stream.read_uint32()
+            data = self.stream.read_slice(declaration.vertex_stride * vertex_count)
+            return VertexBuffer(data, declaration, vertex_count)
         size = self.stream.read_int32()
-        data = self.stream.read(size)
-        return data
+        data = self.stream.read_slice(size)
+        return VertexBuffer(data)
+
+    def skip(self):
+        if self.file_version == VERSION_40:
+            vertex_stride = self.stream.read_uint32()
+            self.stream.skip(self.stream.read_uint32() * 16)
+            self.stream.skip(vertex_stride * self.stream.read_uint32())
+        else:
+            self.stream.skip(self.stream.read_int32())
 
 
 class VertexDeclarationReader(BaseTypeReader, TypeReaderPlugin):
@@ -104,6 +165,8 @@ class VertexDeclarationReader(BaseTypeReader, TypeReaderPlugin):
     reader_name = 'Microsoft.Xna.Framework.Content.VertexDeclarationReader'
 
     def read(self):
+        if self.file_version == VERSION_40:
+            return read_vertex_declaration(self.stream)
         element_count = self.stream.read_int32()
         elements = []
         for _ in range(element_count):
@@ -117,6 +180,13 @@ class VertexDeclarationReader(BaseTypeReader, TypeReaderPlugin):
             elements.append(element)
         return elements
 
+    def skip(self):
+        if self.file_version == VERSION_40:
+            self.stream.skip(4)
+            self.stream.skip(self.stream.read_uint32() * 16)
+        else:
+            self.stream.skip(self.stream.read_int32() * 8)
+
 
 class EffectReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Graphics.Effect'
@@ -124,9 +194,12 @@ class EffectReader(BaseTypeReader, TypeReaderPlugin):
 
     def read(self):
         size = self.stream.read_int32()
-        data = self.stream.read(size)
+        data = self.stream.read_slice(size)
         return Effect(data)
 
+    def skip(self):
+        self.stream.skip(self.stream.read_int32())
+
 
 class EffectMaterialReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Graphics.EffectMaterial'
@@ -137,6 +210,10 @@ class EffectMaterialReader(BaseTypeReader, TypeReaderPlugin):
         parameters = self.stream.read_object(DictionaryReader, [StringReader, ObjectReader])
         return effect, parameters
 
+    def skip(self):
+        self.stream.skip_external_reference()
+        self.stream.skip_object(DictionaryReader, [StringReader, ObjectReader])
+
 
 class BasicEffectReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Graphics.BasicEffect'
@@ -152,6 +229,10 @@ class BasicEffectReader(BaseTypeReader, TypeReaderPlugin):
         colour_v = self.stream.read_boolean()
         return BasicEffect(texture, colour_d, colour_e, colour_s, spec, alpha, colour_v)
 
+    def skip(self):
+        self.stream.skip_external_reference()
+        self.stream.skip(45)
+
 
 class SpriteFontReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Graphics.SpriteFont'
@@ -171,11 +252,95 @@ class SpriteFontReader(BaseTypeReader, TypeReaderPlugin):
             default_char = self.stream.read_char()
         return SpriteFont(texture, glyphs, cropping, char_map, v_space, h_space, kerning, default_char)
 
+    def skip(self):
+        self.stream.skip_object(Texture2DReader)
+        self.stream.skip_object(ListReader, [RectangleReader])
+        self.stream.skip_object(ListReader, [RectangleReader])
+        self.stream.skip_object(ListReader, [CharReader])
+        self.stream.skip(8)
+        self.stream.skip_object(ListReader, [Vector3Reader])
+        if self.stream.read_boolean():
+            self.stream.skip_char()
+
 
 class ModelReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Graphics.Model'
     reader_name = 'Microsoft.Xna.Framework.Content.ModelReader'
 
+    def read(self):
+        if self.file_version != VERSION_40:
+            raise ReaderError("Unimplemented type reader for V{}: '{}'".format(self.file_version, self.reader_name))
+        bone_count = self.stream.read_uint32()
+        bones = []
+        for index in range(bone_count):
+            name = self.stream.read_object(StringReader)
+            transform = self.stream.read_matrix()
+            bones.append(ModelBone(index, name, transform))
+        for bone in bones:
+            bone.parent = self.read_bone_reference(bones)
+            child_count = self.stream.read_uint32()
+            bone.children = [self.read_bone_reference(bones) for _ in range(child_count)]
+        mesh_count = self.stream.read_uint32()
+        meshes = []
+        for _ in range(mesh_count):
+            name = self.stream.read_object(StringReader)
+            parent_bone = self.read_bone_reference(bones)
+            values = self.stream.unpack('3f f')
+            bounds = BoundingSphere(Vector3._make(values[0:3]), values[3])
+            tag = self.stream.read_object(ObjectReader)
+            part_count = self.stream.read_uint32()
+            parts = []
+            for _ in range(part_count):
+                (vertex_offset, num_vertices, start_index, primitive_count) = self.stream.unpack('4i')
+                part_tag = self.stream.read_object(ObjectReader)
+                part = ModelMeshPart(vertex_offset, num_vertices, start_index, primitive_count, part_tag)
+                self.stream.read_shared_resource(partial(setattr, part, 'vertex_buffer'))
+                self.stream.read_shared_resource(partial(setattr, part, 'index_buffer'))
+                self.stream.read_shared_resource(partial(setattr, part, 'effect'))
+                parts.append(part)
+            meshes.append(ModelMesh(name, parent_bone, bounds, tag, parts))
+        root_bone = self.read_bone_reference(bones)
+        tag = self.stream.read_object(ObjectReader)
+        return Model(bones, meshes, root_bone, tag)
+
+    def skip(self):
+        if self.file_version != VERSION_40:
+            raise ReaderError("Unimplemented type reader for V{}: '{}'".format(self.file_version, self.reader_name))
+        bone_count = self.stream.read_uint32()
+        for _ in range(bone_count):
+            self.stream.skip_object(StringReader)
+            self.stream.skip(64)
+        bone_size = 1 if bone_count < 255 else 4
+        for _ in range(bone_count):
+            self.stream.skip(bone_size)
+            self.stream.skip(self.stream.read_uint32() * bone_size)
+        mesh_count = self.stream.read_uint32()
+        for _ in range(mesh_count):
+            self.stream.skip_object(StringReader)
+            self.stream.skip(bone_size + 16)
+            self.stream.skip_object(ObjectReader)
+            part_count = self.stream.read_uint32()
+            for _ in range(part_count):
+                self.stream.skip(16)
+                self.stream.skip_object(ObjectReader)
+                # vertex buffer, index buffer and effect shared resource ids
+                for _ in range(3):
+                    self.stream.read_7bit_encoded_int()
+        self.stream.skip(bone_size)
+        self.stream.skip_object(ObjectReader)
+
+    def read_bone_reference(self, bones):
+        # bone ids are one based with 0 for no bone, stored in a byte when there are few enough bones
+        if len(bones) < 255:
+            bone_id = self.stream.read_byte()
+        else:
+            bone_id = self.stream.read_uint32()
+        if bone_id == 0:
+            return None
+        if bone_id > len(bones):
+            raise ReaderError("bone id out of range: {} > {}".format(bone_id, len(bones)))
+        return bones[bone_id - 1]
+
 
 class PrimitiveTypeReader(EnumTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Graphics.PrimitiveType'
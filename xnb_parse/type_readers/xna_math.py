@@ -10,57 +10,90 @@ from xnb_parse.xna_types.xna_math import (Rectangle, Point, Plane, BoundingBox,
 from xnb_parse.xna_types.xna_system import XNAList
 
 
+def read_grouped_array(stream, fmt, width, count):
+    """
+    read count records of width values of type fmt in bulk, returns an iterator of tuples
+    """
+    values = stream.read_array(fmt, count * width)
+    return zip(*[iter(values)] * width)
+
+
 class Vector2Reader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Vector2'
     reader_name = 'Microsoft.Xna.Framework.Content.Vector2Reader'
+    fixed_size = 8
 
     def read(self):
         return Vector2._make(self.stream.unpack('2f'))
 
+    def read_array(self, count):
+        return [Vector2._make(values) for values in read_grouped_array(self.stream, 'f', 2, count)]
+
 
 class Vector3Reader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Vector3'
     reader_name = 'Microsoft.Xna.Framework.Content.Vector3Reader'
+    fixed_size = 12
 
     def read(self):
         return Vector3._make(self.stream.unpack('3f'))
 
+    def read_array(self, count):
+        return [Vector3._make(values) for values in read_grouped_array(self.stream, 'f', 3, count)]
+
 
 class Vector4Reader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Vector4'
     reader_name = 'Microsoft.Xna.Framework.Content.Vector4Reader'
+    fixed_size = 16
 
     def read(self):
         return Vector4._make(self.stream.unpack('4f'))
 
+    def read_array(self, count):
+        return [Vector4._make(values) for values in read_grouped_array(self.stream, 'f', 4, count)]
+
 
 class MatrixReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Matrix'
     reader_name = 'Microsoft.Xna.Framework.Content.MatrixReader'
+    fixed_size = 64
 
     def read(self):
         return Matrix(XNAList(self.stream.unpack('16f')))
 
+    def read_array(self, count):
+        return [Matrix(XNAList(values)) for values in read_grouped_array(self.stream, 'f', 16, count)]
+
 
 class QuaternionReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Quaternion'
     reader_name = 'Microsoft.Xna.Framework.Content.QuaternionReader'
+    fixed_size = 16
 
     def read(self):
         return Quaternion._make(self.stream.unpack('4f'))
 
+    def read_array(self, count):
+        return [Quaternion._make(values) for values in read_grouped_array(self.stream, 'f', 4, count)]
+
 
 class ColorReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Graphics.Color'
     reader_name = 'Microsoft.Xna.Framework.Content.ColorReader'
+    fixed_size = 4
 
     def read(self):
         return Color._make(self.stream.unpack('4B'))
 
+    def read_array(self, count):
+        return [Color._make(values) for values in read_grouped_array(self.stream, 'B', 4, count)]
+
 
 class PlaneReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Plane'
     reader_name = 'Microsoft.Xna.Framework.Content.PlaneReader'
+    fixed_size = 16
 
     def read(self):
         values = self.stream.unpack('3f f')
@@ -72,22 +105,31 @@ class PlaneReader(ValueTypeReader, TypeReaderPlugin):
 class PointReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Point'
     reader_name = 'Microsoft.Xna.Framework.Content.PointReader'
+    fixed_size = 8
 
     def read(self):
         return Point._make(self.stream.unpack('2i'))
 
+    def read_array(self, count):
+        return [Point._make(values) for values in read_grouped_array(self.stream, 'i', 2, count)]
+
 
 class RectangleReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Rectangle'
     reader_name = 'Microsoft.Xna.Framework.Content.RectangleReader'
+    fixed_size = 16
 
     def read(self):
         return Rectangle._make(self.stream.unpack('4i'))
 
+    def read_array(self, count):
+        return [Rectangle._make(values) for values in read_grouped_array(self.stream, 'i', 4, count)]
+
 
 class BoundingBoxReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.BoundingBox'
     reader_name = 'Microsoft.Xna.Framework.Content.BoundingBoxReader'
+    fixed_size = 24
 
     def read(self):
         values = self.stream.unpack('3f 3f')
@@ -99,6 +141,7 @@ class BoundingBoxReader(ValueTypeReader, TypeReaderPlugin):
 class BoundingSphereReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.BoundingSphere'
     reader_name = 'Microsoft.Xna.Framework.Content.BoundingSphereReader'
+    fixed_size = 16
 
     def read(self):
         values = self.stream.unpack('3f f')
@@ -110,6 +153,7 @@ class BoundingSphereReader(ValueTypeReader, TypeReaderPlugin):
 class BoundingFrustumReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.BoundingFrustum'
     reader_name = 'Microsoft.Xna.Framework.Content.BoundingFrustumReader'
+    fixed_size = 64
 
     def read(self):
         return BoundingFrustum._make(Matrix(XNAList(self.stream.unpack('16f'))))
@@ -118,6 +162,7 @@ class BoundingFrustumReader(BaseTypeReader, TypeReaderPlugin):
 class RayReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Ray'
     reader_name = 'Microsoft.Xna.Framework.Content.RayReader'
+    fixed_size = 24
 
     def read(self):
         values = self.stream.unpack('3f 3f')
@@ -138,3 +183,8 @@ class CurveReader(BaseTypeReader, TypeReaderPlugin):
             key = (v_pos, v_value, v_tangent_in, v_tangent_out, v_cont)
             keys.append(key)
         return pre_loop, post_loop, keys
+
+    def skip(self):
+        self.stream.skip(8)
+        key_count = self.stream.read_int32()
+        self.stream.skip(self.stream.calc_size('ffffi') * key_count)
@@ -17,12 +17,17 @@ class SoundEffectReader(BaseTypeReader, TypeReaderPlugin):
         format_size = self.stream.read_int32()
         wave_format = self.stream.read(format_size)
         data_size = self.stream.read_int32()
-        wave_data = self.stream.read(data_size)
+        wave_data = self.stream.read_slice(data_size)
         loop_start = self.stream.read_int32()
         loop_length = self.stream.read_int32()
         duration = self.stream.read_int32()
         return SoundEffect(wave_format, wave_data, loop_start, loop_length, duration, self.stream.needs_swap)
 
+    def skip(self):
+        self.stream.skip(self.stream.read_int32())
+        self.stream.skip(self.stream.read_int32())
+        self.stream.skip(12)
+
 
 class SongReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Media.Song'
@@ -33,6 +38,10 @@ class SongReader(BaseTypeReader, TypeReaderPlugin):
         duration = self.stream.read_int32()
         return Song(filename, duration)
 
+    def skip(self):
+        self.stream.skip_string()
+        self.stream.skip(4)
+
 
 class VideoReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'Microsoft.Xna.Framework.Media.Video'
@@ -46,3 +55,10 @@ class VideoReader(BaseTypeReader, TypeReaderPlugin):
         fps = self.stream.read_object(SingleReader)
         video_soundtrack_type = VideoSoundtrackType(self.stream.read_object(Int32Reader))
         return Video(filename, duration, width, height, fps, video_soundtrack_type)
+
+    def skip(self):
+        self.stream.skip_object(StringReader)
+        for _ in range(3):
+            self.stream.skip_object(Int32Reader)
+        self.stream.skip_object(SingleReader)
+        self.stream.skip_object(Int32Reader)
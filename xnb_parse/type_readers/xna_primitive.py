@@ -10,6 +10,7 @@ from xnb_parse.type_reader import TypeReaderPlugin, BaseTypeReader, ValueTypeRea
 class ByteReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.Byte'
     reader_name = 'Microsoft.Xna.Framework.Content.ByteReader'
+    array_fmt = 'B'
 
     def read(self):
         return self.stream.read_byte()
@@ -18,6 +19,7 @@ class ByteReader(ValueTypeReader, TypeReaderPlugin):
 class SByteReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.SByte'
     reader_name = 'Microsoft.Xna.Framework.Content.SByteReader'
+    array_fmt = 'b'
 
     def read(self):
         return self.stream.read_sbyte()
@@ -26,6 +28,7 @@ class SByteReader(ValueTypeReader, TypeReaderPlugin):
 class Int16Reader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.Int16'
     reader_name = 'Microsoft.Xna.Framework.Content.Int16Reader'
+    array_fmt = 'h'
 
     def read(self):
         return self.stream.read_int16()
@@ -34,6 +37,7 @@ class Int16Reader(ValueTypeReader, TypeReaderPlugin):
 class UInt16Reader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.UInt16'
     reader_name = 'Microsoft.Xna.Framework.Content.UInt16Reader'
+    array_fmt = 'H'
 
     def read(self):
         return self.stream.read_uint16()
@@ -42,6 +46,7 @@ class UInt16Reader(ValueTypeReader, TypeReaderPlugin):
 class Int32Reader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.Int32'
     reader_name = 'Microsoft.Xna.Framework.Content.Int32Reader'
+    array_fmt = 'i'
 
     def read(self):
         return self.stream.read_int32()
@@ -50,6 +55,7 @@ class Int32Reader(ValueTypeReader, TypeReaderPlugin):
 class UInt32Reader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.UInt32'
     reader_name = 'Microsoft.Xna.Framework.Content.UInt32Reader'
+    array_fmt = 'I'
 
     def read(self):
         return self.stream.read_uint32()
@@ -58,6 +64,7 @@ class UInt32Reader(ValueTypeReader, TypeReaderPlugin):
 class Int64Reader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.Int64'
     reader_name = 'Microsoft.Xna.Framework.Content.Int64Reader'
+    array_fmt = 'q'
 
     def read(self):
         return self.stream.read_int64()
@@ -66,6 +73,7 @@ class Int64Reader(ValueTypeReader, TypeReaderPlugin):
 class UInt64Reader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.UInt64'
     reader_name = 'Microsoft.Xna.Framework.Content.UInt64Reader'
+    array_fmt = 'Q'
 
     def read(self):
         return self.stream.read_uint64()
@@ -74,6 +82,7 @@ class UInt64Reader(ValueTypeReader, TypeReaderPlugin):
 class SingleReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.Single'
     reader_name = 'Microsoft.Xna.Framework.Content.SingleReader'
+    array_fmt = 'f'
 
     def read(self):
         return self.stream.read_single()
@@ -82,6 +91,7 @@ class SingleReader(ValueTypeReader, TypeReaderPlugin):
 class DoubleReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.Double'
     reader_name = 'Microsoft.Xna.Framework.Content.DoubleReader'
+    array_fmt = 'd'
 
     def read(self):
         return self.stream.read_double()
@@ -90,10 +100,14 @@ class DoubleReader(ValueTypeReader, TypeReaderPlugin):
 class BooleanReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.Boolean'
     reader_name = 'Microsoft.Xna.Framework.Content.BooleanReader'
+    fixed_size = 1
 
     def read(self):
         return self.stream.read_boolean()
 
+    def read_array(self, count):
+        return [bool(value) for value in self.stream.read_array('B', count)]
+
 
 class CharReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.Char'
@@ -102,6 +116,9 @@ class CharReader(ValueTypeReader, TypeReaderPlugin):
     def read(self):
         return self.stream.read_char()
 
+    def skip(self):
+        self.stream.skip_char()
+
 
 class StringReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'System.String'
@@ -110,6 +127,9 @@ class StringReader(BaseTypeReader, TypeReaderPlugin):
     def read(self):
         return self.stream.read_string()
 
+    def skip(self):
+        self.stream.skip_string()
+
 
 class ObjectReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'System.Object'
@@ -117,3 +137,7 @@ class ObjectReader(BaseTypeReader, TypeReaderPlugin):
 
     def read(self):
         raise ReaderError('ObjectReader invoked for {}'.format(self.target_type))
+
+    def skip(self):
+        # objects are skipped by the reader for their actual type, see XNBReader.skip_object
+        raise ReaderError('ObjectReader invoked for {}'.format(self.target_type))
@@ -21,6 +21,9 @@ class EnumReader(GenericValueTypeReader, TypeReaderPlugin):
     def read(self):
         return self.readers[0].read()
 
+    def skip(self):
+        self.readers[0].skip()
+
 
 class NullableReader(GenericValueTypeReader, TypeReaderPlugin):
     generic_target_type = 'System.Nullable`1'
@@ -33,6 +36,22 @@ class NullableReader(GenericValueTypeReader, TypeReaderPlugin):
         else:
             return None
 
+    def skip(self):
+        if self.stream.read_boolean():
+            self.readers[0].skip()
+
+
+def skip_elements(reader):
+    """
+    skip the int32 counted elements read by the array and list readers
+    """
+    elements = reader.stream.read_int32()
+    if reader.readers[0].is_value_type:
+        reader.readers[0].skip_array(elements)
+    else:
+        for _ in range(elements):
+            reader.stream.skip_object(reader.readers[0])
+
 
 class ArrayReader(GenericTypeReader, TypeReaderPlugin):
     generic_target_type = 'System.Array`1'
@@ -41,10 +60,13 @@ class ArrayReader(GenericTypeReader, TypeReaderPlugin):
     def read(self):
         elements = self.stream.read_int32()
         if self.readers[0].is_value_type:
-            return XNAList([self.readers[0].read() for _ in range(elements)])
+            return XNAList(self.readers[0].read_array(elements))
         else:
             return XNAList([self.stream.read_object(self.readers[0]) for _ in range(elements)])
 
+    def skip(self):
+        skip_elements(self)
+
 
 class ListReader(GenericTypeReader, TypeReaderPlugin):
     generic_target_type = 'System.Collections.Generic.List`1'
@@ -53,10 +75,13 @@ class ListReader(GenericTypeReader, TypeReaderPlugin):
     def read(self):
         elements = self.stream.read_int32()
         if self.readers[0].is_value_type:
-            return XNAList([self.readers[0].read() for _ in range(elements)])
+            return XNAList(self.readers[0].read_array(elements))
         else:
             return XNAList([self.stream.read_object(self.readers[0]) for _ in range(elements)])
 
+    def skip(self):
+        skip_elements(self)
+
 
 class DictionaryReader(GenericTypeReader, TypeReaderPlugin):
     generic_target_type = 'System.Collections.Generic.Dictionary`2'
@@ -79,10 +104,24 @@ class DictionaryReader(GenericTypeReader, TypeReaderPlugin):
                 return XNADict([(self.stream.read_object(self.readers[0]), self.stream.read_object(self.readers[1]))
                                 for _ in range(elements)])
 
+    def skip(self):
+        elements = self.stream.read_int32()
+        key_reader, value_reader = self.readers
+        for _ in range(elements):
+            if key_reader.is_value_type:
+                key_reader.skip()
+            else:
+                self.stream.skip_object(key_reader)
+            if value_reader.is_value_type:
+                value_reader.skip()
+            else:
+                self.stream.skip_object(value_reader)
+
 
 class TimeSpanReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.TimeSpan'
     reader_name = 'Microsoft.Xna.Framework.Content.TimeSpanReader'
+    array_fmt = 'q'
 
     def read(self):
         return self.stream.read_int64()
@@ -91,6 +130,7 @@ class TimeSpanReader(ValueTypeReader, TypeReaderPlugin):
 class DateTimeReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.DateTime'
     reader_name = 'Microsoft.Xna.Framework.Content.DateTimeReader'
+    array_fmt = 'q'
 
     def read(self):
         return self.stream.read_int64()
@@ -99,6 +139,7 @@ class DateTimeReader(ValueTypeReader, TypeReaderPlugin):
 class DecimalReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.Decimal'
     reader_name = 'Microsoft.Xna.Framework.Content.DecimalReader'
+    fixed_size = 16
 
     def read(self):
         return self.stream.unpack('4i')
@@ -111,6 +152,9 @@ class ExternalReferenceReader(ValueTypeReader, TypeReaderPlugin):
     def read(self):
         return self.stream.read_external_reference()
 
+    def skip(self):
+        self.stream.skip_external_reference()
+
 
 class ReflectiveReader(GenericTypeReader, TypeReaderPlugin):
     generic_target_type = 'Reflective'
@@ -118,3 +162,6 @@ class ReflectiveReader(GenericTypeReader, TypeReaderPlugin):
 
     def read(self):
         return self.readers[0].read()
+
+    def skip(self):
+        self.readers[0].skip()
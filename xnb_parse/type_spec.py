@@ -95,8 +95,8 @@ class TypeSpec(object):
         res, pos = TypeSpec._parse(type_name)
         if pos < len(type_name):
             raise TypeSpecError("Could not parse the whole type name: {} < {}".format(pos, len(type_name)))
-        _CACHED_TYPES[type_name] = res
-        return res
+        # threads racing on the same name all get the first result
+        return _CACHED_TYPES.setdefault(type_name, res)
 
     def add_name(self, type_name):
         if self.name is None:
@@ -9,7 +9,7 @@ from collections import OrderedDict
 
 from xnb_parse.type_reader import ReaderError
 from xnb_parse.xact.xwb import filetime_to_datetime
-from xnb_parse.binstream import BinaryStream
+from xnb_parse.binstream import BinaryStream, WindowedBinaryStream
 
 
 SB_L_SIGNATURE = b'SDBK'
@@ -47,8 +47,18 @@ class XSB(object):
         self.audio_engine = audio_engine
 
         # open in little endian initially
-        stream = BinaryStream(data=data, filename=filename)
+        if data is None and filename is not None:
+            stream = WindowedBinaryStream(filename=filename)
+        else:
+            stream = BinaryStream(data=data)
         del data
+        try:
+            self._parse(stream)
+        finally:
+            if isinstance(stream, WindowedBinaryStream):
+                stream.close()
+
+    def _parse(self, stream):
 
         # check sig to find actual endianess
         h_sig = stream.peek(len(SB_L_SIGNATURE))
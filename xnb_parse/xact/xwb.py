@@ -12,7 +12,7 @@ from struct import Struct
 from xnb_parse.file_formats.wav import (PyWavWriter, WAVE_FORMAT_WMAUDIO2, WAVE_FORMAT_WMAUDIO3, WAVE_FORMAT_PCM,
                                         WAVE_FORMAT_ADPCM, WAVE_FORMAT_XMA2)
 from xnb_parse.type_reader import ReaderError
-from xnb_parse.binstream import BinaryStream
+from xnb_parse.binstream import BinaryStream, WindowedBinaryStream
 
 
 WB_L_SIGNATURE = b'WBND'
@@ -108,10 +108,22 @@ class XWB(object):
     def __init__(self, data=None, filename=None, audio_engine=None):
         self.audio_engine = audio_engine
 
-        # open in little endian initially
-        stream = BinaryStream(data=data, filename=filename)
+        # open in little endian initially, files are read through a window so wave data is only loaded on demand
+        if data is None and filename is not None:
+            stream = WindowedBinaryStream(filename=filename)
+        else:
+            stream = BinaryStream(data=data)
         del data
+        self._stream = stream
+        self._big_endian = False
+        try:
+            self._parse(stream)
+        except BaseException:
+            # the caller never gets a bank to close
+            self.close()
+            raise
 
+    def _parse(self, stream):
         # check sig to find actual endianess
         h_sig = stream.peek(len(WB_L_SIGNATURE))
         if h_sig == WB_L_SIGNATURE:
@@ -123,6 +135,7 @@ class XWB(object):
 
         # switch stream to correct endianess
         stream.set_endian(big_endian)
+        self._big_endian = big_endian
         (h_sig, self.h_version, self.h_header_version) = stream.unpack(_WB_HEADER)
         regions = {k: XWBRegion._make(stream.unpack(_WB_REGION)) for k in _REGIONS}
 
@@ -184,6 +197,7 @@ class XWB(object):
                     entry_seektables.append(None)
 
         self.entries = []
+        self._entry_data = []
         for i, cur_meta in enumerate(entry_metadata):
             c_entry_flags = cur_meta.flags_duration & WB_ENTRY_FLAGS_MASK
             c_duration = (cur_meta.flags_duration & WB_ENTRY_DURATION_MASK) >> 4
@@ -260,15 +274,29 @@ class XWB(object):
             entry_header = _WAVEFORMATEX.pack(c_format_tag, c_channels, c_samples_per_sec, c_avg_bytes_per_sec,
                                               c_block_align, c_bits_per_sample, cx_size)
             entry_header += extra_header
-            # read entry wave data
-            stream.seek(regions['ENTRYWAVEDATA'].offset + cur_meta.play_offset)
-            # manually swap PCM data if needed
-            entry_data = stream.read(cur_meta.play_length)
-            if big_endian and c_format_tag == WAVE_FORMAT_PCM and c_bits_per_sample == 16:
-                entry_data = bytearray(entry_data)
-                entry_data[1::2], entry_data[0::2] = entry_data[0::2], entry_data[1::2]
+            # wave data for file backed banks is only read by entry_data when needed
+            swap = c_format_tag == WAVE_FORMAT_PCM and c_bits_per_sample == 16
+            self._entry_data.append((regions['ENTRYWAVEDATA'].offset + cur_meta.play_offset, cur_meta.play_length,
+                                     swap))
+            entry_data = None
+            if not isinstance(stream, WindowedBinaryStream):
+                entry_data = self.entry_data(i)
             self.entries.append(Entry(entry_name, entry_header, entry_data, entry_dpds, entry_seek))
 
+    def entry_data(self, index):
+        offset, length, swap = self._entry_data[index]
+        self._stream.seek(offset)
+        data = self._stream.read(length)
+        # manually swap PCM data if needed
+        if self._big_endian and swap:
+            data = bytearray(data)
+            data[1::2], data[0::2] = data[0::2], data[1::2]
+        return data
+
+    def close(self):
+        if isinstance(self._stream, WindowedBinaryStream):
+            self._stream.close()
+
     @property
     def is_buffer(self):
         return self.flags & WB_TYPE_MASK == WB_TYPE_BUFFER
@@ -303,4 +331,7 @@ class XWB(object):
                 out_filename = os.path.join(out_dir, entry.name)
             else:
                 out_filename = os.path.join(out_dir, str(i))
-            PyWavWriter(header=entry.header, data=entry.data, dpds=entry.dpds, seek=entry.seek).write(out_filename)
+            entry_data = entry.data
+            if entry_data is None:
+                entry_data = self.entry_data(i)
+            PyWavWriter(header=entry.header, data=entry_data, dpds=entry.dpds, seek=entry.seek).write(out_filename)
@@ -6,38 +6,141 @@ from __future__ import print_function
 
 import fnmatch
 import os
+import shutil
+import struct
+import tempfile
 from collections import OrderedDict
+from multiprocessing import Pool, cpu_count
 
+from xnb_parse.asset_cache import AssetCache
+from xnb_parse.asset_index import AssetIndex
+from xnb_parse.binstream import replace_file
 from xnb_parse.type_reader import ReaderError
-from xnb_parse.xnb_reader import XNBReader
+from xnb_parse.xnb_reader import XNBReader, XNB_HEAD_SIZE
 from xnb_parse.file_formats.xml_utils import output_xml
 
 
+# manager used by the pool worker processes, set by _init_worker
+_worker_manager = None
+# prefix of the directories export stages its outputs in
+STAGING_PREFIX = '.export-'
+
+
 class ContentManager(object):
     content_extension = '.xnb'
 
-    def __init__(self, root_dir):
+    def __init__(self, root_dir, compiled=False, index_file=None, cache_size=0, drop_raw=True):
+        """
+        with index_file the directory listings, .pak contents and asset headers are kept in that file between runs
+        and only what changed since is read again.
+
+        with cache_size load keeps up to that many bytes of parsed assets and returns the same object each time.
+        drop_raw copies texture, sound and effect data out of the XNB buffer so the cache doesn't keep it alive,
+        for .pak assets that buffer is the memory map of the whole .pak. turn it off to share the buffer when most
+        of it is cached anyway
+        """
+        self.compiled = compiled
+        self.cache = None
+        if cache_size:
+            self.cache = AssetCache(cache_size, drop_raw=drop_raw)
         root_dir = os.path.normpath(root_dir)
         if not os.path.isdir(root_dir):
             raise ReaderError("Content root directory not found: '%s'" % root_dir)
         self.root_dir = root_dir
+        self.index = None
+        if index_file is not None:
+            self.index = AssetIndex(index_file, root_dir)
         self._asset_dict = OrderedDict()
         for k, v in self.find_assets():
             if k not in self._asset_dict:
                 self._asset_dict[k] = v
         self.assets = self._asset_dict.keys()
+        if self.index is not None:
+            self.index.prune_headers(self._asset_dict)
+        self.save_index()
+
+    def __getstate__(self):
+        # sent to pool workers, they don't share the cache or write the index
+        state = self.__dict__.copy()
+        del state['assets']
+        state['cache'] = None
+        state['index'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.assets = self._asset_dict.keys()
 
-    def xnb(self, asset_name, expected_type=None, parse=True):
+    def save_index(self):
+        """
+        write any changes to the index file, headers read since the manager was created are only kept once saved
+        """
+        if self.index is not None:
+            self.index.save()
+
+    def xnb(self, asset_name, expected_type=None, parse=True, fields=None):
         asset_name = asset_name.replace('\\', '/')
         asset_name = asset_name.lower()
         asset_filename = os.path.join(self.root_dir, self._asset_dict[asset_name])
-        return XNBReader.load(filename=asset_filename, expected_type=expected_type, parse=parse)
+        return XNBReader.load(filename=asset_filename, expected_type=expected_type, parse=parse,
+                              compiled=self.compiled, fields=fields)
 
-    def load(self, asset_name, expected_type=None):
-        return self.xnb(asset_name, expected_type).content
+    def load(self, asset_name, expected_type=None, fields=None):
+        """
+        load an asset, with fields only a dict of the named fields is returned and the rest of the asset is skipped
+        """
+        if self.cache is None or fields is not None:
+            return self.xnb(asset_name, expected_type, fields=fields).content
+        asset_name = asset_name.replace('\\', '/')
+        asset_name = asset_name.lower()
+        return self.cache.get((asset_name, expected_type), lambda: self.xnb(asset_name, expected_type).content)
+
+    def header(self, asset_name):
+        """
+        XNBHeader of an asset without parsing it, taken from the index while the asset is unchanged
+        """
+        asset_name = asset_name.replace('\\', '/')
+        asset_name = asset_name.lower()
+        if self.index is None:
+            return self.scan_header(asset_name)
+        stamp = self.asset_stamp(asset_name)
+        header = self.index.get_header(asset_name, stamp)
+        if header is None:
+            header = self.scan_header(asset_name)
+            self.index.set_header(asset_name, stamp, header)
+        return header
+
+    def asset_data(self, asset_name):
+        """
+        stored data of an asset
+        """
+        with open(os.path.join(self.root_dir, self._asset_dict[asset_name]), 'rb') as asset_file:
+            return asset_file.read()
+
+    def asset_head(self, asset_name, size):
+        """
+        first size bytes of the stored data of an asset
+        """
+        with open(os.path.join(self.root_dir, self._asset_dict[asset_name]), 'rb') as asset_file:
+            return asset_file.read(size)
+
+    def scan_header(self, asset_name):
+        return XNBReader.scan_header(filename=os.path.join(self.root_dir, self._asset_dict[asset_name]))
+
+    def asset_stamp(self, asset_name):
+        """
+        values that change whenever the data of an asset does
+        """
+        stat = os.stat(os.path.join(self.root_dir, self._asset_dict[asset_name]))
+        return [stat.st_mtime, stat.st_size]
+
+    def walk(self):
+        if self.index is not None:
+            return self.index.walk()
+        return os.walk(self.root_dir, followlinks=True)
 
     def find_assets(self):
-        for path, _, filelist in os.walk(self.root_dir, followlinks=True):
+        for path, _, filelist in self.walk():
             sub_dir = os.path.relpath(path, self.root_dir)
             for asset_filename in fnmatch.filter(filelist, '*' + self.content_extension):
                 if sub_dir != '.':
@@ -50,13 +153,204 @@ class ContentManager(object):
     def filter(self, search='*'):
         return fnmatch.filter(self.assets, search)
 
+    def load_many(self, asset_names, expected_type=None, fields=None, workers=None, largest_first=False):
+        """
+        load assets in a pool of worker processes, yields (asset_name, asset, error) in the order of asset_names.
+        error is a FAILED line for assets that couldn't be read, workers=1 loads them in this process.
+
+        with largest_first the assets are read and yielded largest first, and the pool is sent batches of about the
+        same estimated cost rather than one asset at a time
+        """
+        return self._map(_load_asset, [(asset_name, expected_type, fields) for asset_name in asset_names], workers,
+                         largest_first)
+
+    def export_many(self, asset_names, export_dir, export_file=True, export_xml=True, workers=None,
+                    largest_first=False):
+        """
+        load and export assets in a pool of worker processes, yields (asset_name, error) in the order of asset_names,
+        or largest first as for load_many. with export_dir None the assets are only loaded
+        """
+        if export_dir is not None:
+            remove_staging_dirs(export_dir)
+        return self._map(_export_asset, [(asset_name, export_dir, export_file, export_xml)
+                                         for asset_name in asset_names], workers, largest_first)
+
+    def decompress_many(self, asset_names, out_dir, workers=None, largest_first=False):
+        """
+        save assets as uncompressed XNBs in a pool of worker processes, yields (asset_name, error) as export_many
+        """
+        return self._map(_decompress_asset, [(asset_name, out_dir) for asset_name in asset_names], workers,
+                         largest_first)
+
+    def data_size(self, asset_name):
+        """
+        size of the stored asset
+        """
+        return os.path.getsize(os.path.join(self.root_dir, self._asset_dict[asset_name]))
+
+    def asset_size(self, asset_name):
+        """
+        estimated cost of reading an asset, the decompressed size from the start of its header, or the stored size
+        if that can't be read
+        """
+        asset_name = asset_name.replace('\\', '/')
+        asset_name = asset_name.lower()
+        if asset_name not in self._asset_dict:
+            return 0
+        try:
+            return XNBReader.content_size(self.asset_head(asset_name, XNB_HEAD_SIZE))
+        except (ReaderError, struct.error):
+            return self.data_size(asset_name)
+
+    def _map(self, function, tasks, workers, largest_first=False):
+        if workers is None:
+            workers = cpu_count()
+        if largest_first:
+            costs = [self.asset_size(task[0]) for task in tasks]
+            # sorted is stable so assets of the same size stay in the order given
+            order = sorted(range(len(tasks)), key=lambda i: -costs[i])
+            tasks = [tasks[i] for i in order]
+            costs = [costs[i] for i in order]
+            self.save_index()
+        if workers <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield function(task, self)
+            return
+        if largest_first:
+            batches = _cost_batches(tasks, costs, workers)
+        else:
+            batches = [[task] for task in tasks]
+        pool = Pool(min(workers, len(batches)), initializer=_init_worker, initargs=(self,))
+        try:
+            for results in pool.imap(_run_batch, [(function, batch) for batch in batches]):
+                for result in results:
+                    yield result
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
     @staticmethod
     def export(asset, asset_name, export_dir, export_file=True, export_xml=True):
-        filename = os.path.join(export_dir, os.path.normpath(asset_name))
-        dirname = os.path.dirname(filename)
-        if not os.path.isdir(dirname):
+        """
+        export into a staging directory in export_dir then move the outputs into place, so an output is either
+        complete or missing. returns the paths of the outputs relative to export_dir
+        """
+        make_dirs(export_dir)
+        staging_dir = tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=export_dir)
+        outputs = []
+        try:
+            filename = os.path.join(staging_dir, os.path.normpath(asset_name))
+            make_dirs(os.path.dirname(filename))
+            if export_file and hasattr(asset, 'export'):
+                asset.export(filename)
+            if export_xml and hasattr(asset, 'xml'):
+                output_xml(asset.xml(), filename + '.xml')
+            for path, _, filelist in os.walk(staging_dir):
+                for output_filename in filelist:
+                    staged_filename = os.path.join(path, output_filename)
+                    output = os.path.relpath(staged_filename, staging_dir)
+                    out_filename = os.path.join(export_dir, output)
+                    make_dirs(os.path.dirname(out_filename))
+                    replace_file(staged_filename, out_filename)
+                    outputs.append(output.replace(os.sep, '/'))
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        return sorted(outputs)
+
+
+def make_dirs(dirname):
+    """
+    create dirname and its parents if they don't exist, safe against another process creating them at the same time
+    """
+    if not os.path.isdir(dirname):
+        try:
             os.makedirs(dirname)
-        if export_file and hasattr(asset, 'export'):
-            asset.export(filename)
-        if export_xml and hasattr(asset, 'xml'):
-            output_xml(asset.xml(), filename + '.xml')
+        except OSError:
+            if not os.path.isdir(dirname):
+                raise
+
+
+def remove_staging_dirs(export_dir):
+    """
+    remove the staging directories left in export_dir by exports that were killed, no export into export_dir may
+    be running
+    """
+    try:
+        names = os.listdir(export_dir)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(export_dir, name)
+        if name.startswith(STAGING_PREFIX) and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _init_worker(content_manager):
+    global _worker_manager
+    _worker_manager = content_manager
+    # import every reader module once up front rather than in the middle of the first asset of each type
+    XNBReader.get_type_reader_manager().import_all_readers()
+
+
+def _cost_batches(tasks, costs, workers):
+    """
+    split tasks sorted largest first into batches of roughly equal cost, large assets get a batch of their own and
+    small ones are grouped so each batch is worth sending to a worker
+    """
+    # many more batches than workers so the last batches to finish are small
+    target = max(sum(costs) // (workers * 8), 1)
+    batches = []
+    batch = []
+    batch_cost = 0
+    for task, cost in zip(tasks, costs):
+        batch.append(task)
+        batch_cost += cost
+        if batch_cost >= target:
+            batches.append(batch)
+            batch = []
+            batch_cost = 0
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _run_batch(batch):
+    function, tasks = batch
+    return [function(task) for task in tasks]
+
+
+# every error is reported for the asset that raised it, an exception out of a pool worker would end the whole map
+def _load_asset(task, content_manager=None):
+    if content_manager is None:
+        content_manager = _worker_manager
+    asset_name, expected_type, fields = task
+    try:
+        return asset_name, content_manager.load(asset_name, expected_type, fields=fields), None
+    except Exception as ex:
+        return asset_name, None, "FAILED: '{}' {}: {}".format(asset_name, type(ex).__name__, ex)
+
+
+def _export_asset(task, content_manager=None):
+    if content_manager is None:
+        content_manager = _worker_manager
+    asset_name, export_dir, export_file, export_xml = task
+    try:
+        asset = content_manager.load(asset_name)
+        if export_dir is not None:
+            content_manager.export(asset, asset_name, export_dir, export_file=export_file, export_xml=export_xml)
+    except Exception as ex:
+        return asset_name, "FAILED: '{}' {}: {}".format(asset_name, type(ex).__name__, ex)
+    return asset_name, None
+
+
+def _decompress_asset(task, content_manager=None):
+    if content_manager is None:
+        content_manager = _worker_manager
+    asset_name, out_dir = task
+    try:
+        xnb = content_manager.xnb(asset_name, parse=False)
+        xnb.save(filename=os.path.join(out_dir, os.path.normpath(asset_name)))
+    except Exception as ex:
+        return asset_name, "FAILED: '{}' {}: {}".format(asset_name, type(ex).__name__, ex)
+    return asset_name, None
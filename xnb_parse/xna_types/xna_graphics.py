@@ -6,6 +6,7 @@ from __future__ import print_function
 
 import os
 
+from xnb_parse.binstream import slice_data
 from xnb_parse.type_reader import ReaderError
 from xnb_parse.xna_types.xna_primitive import Enum
 from xnb_parse.file_formats.png import write_png
@@ -131,12 +132,26 @@ class Texture2D(object):
         self.surface_format = surface_format
         self.width = width
         self.height = height
-        self.mip_levels = mip_levels
+        # mip levels may be BufferSlices, copied out on first access
+        self._mip_levels = mip_levels
+        self._copied = False
         self.needs_swap = needs_swap
 
     def __str__(self):
         return "Texture2D f:{} d:{}x{} m:{} s:{}".format(self.surface_format, self.width, self.height,
-                                                         len(self.mip_levels), len(self.mip_levels[0]))
+                                                         len(self._mip_levels), len(self._mip_levels[0]))
+
+    @property
+    def mip_levels(self):
+        if not self._copied:
+            self._mip_levels = [slice_data(level) for level in self._mip_levels]
+            self._copied = True
+        return self._mip_levels
+
+    @mip_levels.setter
+    def mip_levels(self, value):
+        self._mip_levels = value
+        self._copied = False
 
     def export(self, filename):
         if not self.surface_format.reader:
@@ -172,41 +187,214 @@ class Texture3D(object):
         self.width = width
         self.height = height
         self.depth = depth
-        self.mip_levels = mip_levels
+        self._mip_levels = mip_levels
+        self._copied = False
         self.needs_swap = needs_swap
 
     def __str__(self):
         return "Texture3D f:{} d:{}x{}x{} m:{} s:{}".format(self.surface_format, self.width, self.height, self.depth,
-                                                            len(self.mip_levels), len(self.mip_levels[0]))
+                                                            len(self._mip_levels), len(self._mip_levels[0]))
+
+    @property
+    def mip_levels(self):
+        if not self._copied:
+            self._mip_levels = [slice_data(level) for level in self._mip_levels]
+            self._copied = True
+        return self._mip_levels
+
+    @mip_levels.setter
+    def mip_levels(self, value):
+        self._mip_levels = value
+        self._copied = False
 
 
 class TextureCube(object):
     def __init__(self, surface_format, texture_size, sides, needs_swap=False):
         self.surface_format = surface_format
         self.texture_size = texture_size
-        self.sides = sides
+        self._sides = sides
+        self._copied = False
         self.needs_swap = needs_swap
 
     def __str__(self):
-        return "TextureCube f:{} d:{} m:{} s:{}".format(self.surface_format, self.texture_size, len(self.sides['+x']),
-                                                        len(self.sides['+x'][0]))
+        return "TextureCube f:{} d:{} m:{} s:{}".format(self.surface_format, self.texture_size,
+                                                        len(self._sides['+x']), len(self._sides['+x'][0]))
+
+    @property
+    def sides(self):
+        if not self._copied:
+            for side, mip_levels in self._sides.items():
+                self._sides[side] = [slice_data(level) for level in mip_levels]
+            self._copied = True
+        return self._sides
+
+    @sides.setter
+    def sides(self, value):
+        self._sides = value
+        self._copied = False
 
 
 class IndexBuffer(object):
     def __init__(self, index_16, index_data):
         self.index_16 = index_16
-        self.index_data = index_data
+        self._index_data = index_data
+
+    def __str__(self):
+        return "IndexBuffer t:{} s:{}".format(16 if self.index_16 else 32, len(self._index_data))
+
+    @property
+    def index_data(self):
+        self._index_data = slice_data(self._index_data)
+        return self._index_data
+
+    @index_data.setter
+    def index_data(self, value):
+        self._index_data = value
+
+
+class VertexDeclaration(object):
+    def __init__(self, vertex_stride, elements):
+        self.vertex_stride = vertex_stride
+        # (offset, VertexElementFormat, VertexElementUsage, usage_index) for each element
+        self.elements = elements
+
+    def __str__(self):
+        return "VertexDeclaration s:{} e:{}".format(self.vertex_stride, len(self.elements))
+
+
+class VertexBuffer(object):
+    def __init__(self, vertex_data, declaration=None, vertex_count=None):
+        self._vertex_data = vertex_data
+        # only stored with the vertices in XNA 4.0
+        self.declaration = declaration
+        self.vertex_count = vertex_count
+
+    def __str__(self):
+        return "VertexBuffer s:{}".format(len(self._vertex_data))
+
+    @property
+    def vertex_data(self):
+        self._vertex_data = slice_data(self._vertex_data)
+        return self._vertex_data
+
+    @vertex_data.setter
+    def vertex_data(self, value):
+        self._vertex_data = value
+
+
+class ModelBone(object):
+    def __init__(self, index, name, transform):
+        self.index = index
+        self.name = name
+        self.transform = transform
+        self.parent = None
+        self.children = []
+
+    def __str__(self):
+        return "ModelBone {} '{}' c:{}".format(self.index, self.name, len(self.children))
+
+    def xml(self, parent):
+        root = ET.SubElement(parent, 'Bone')
+        root.set('index', str(self.index))
+        if self.name is not None:
+            root.set('name', self.name)
+        if self.parent is not None:
+            root.set('parent', str(self.parent.index))
+        self.transform.xml(root)
+        return root
+
+
+class ModelMeshPart(object):
+    def __init__(self, vertex_offset, num_vertices, start_index, primitive_count, tag):
+        self.vertex_offset = vertex_offset
+        self.num_vertices = num_vertices
+        self.start_index = start_index
+        self.primitive_count = primitive_count
+        self.tag = tag
+        # shared resources, filled in once all shared resources are read
+        self.vertex_buffer = None
+        self.index_buffer = None
+        self.effect = None
+
+    def __str__(self):
+        return "ModelMeshPart v:{} p:{}".format(self.num_vertices, self.primitive_count)
+
+    def xml(self, parent):
+        root = ET.SubElement(parent, 'Part')
+        root.set('vertexOffset', str(self.vertex_offset))
+        root.set('numVertices', str(self.num_vertices))
+        root.set('startIndex', str(self.start_index))
+        root.set('primitiveCount', str(self.primitive_count))
+        if self.effect is not None and hasattr(self.effect, 'xml'):
+            self.effect.xml(root)
+        return root
+
+
+class ModelMesh(object):
+    def __init__(self, name, parent_bone, bounds, tag, parts):
+        self.name = name
+        self.parent_bone = parent_bone
+        self.bounds = bounds
+        self.tag = tag
+        self.parts = parts
 
     def __str__(self):
-        return "IndexBuffer t:{} s:{}".format(16 if self.index_16 else 32, len(self.index_data))
+        return "ModelMesh '{}' p:{}".format(self.name, len(self.parts))
+
+    def xml(self, parent):
+        root = ET.SubElement(parent, 'Mesh')
+        if self.name is not None:
+            root.set('name', self.name)
+        if self.parent_bone is not None:
+            root.set('parentBone', str(self.parent_bone.index))
+        self.bounds.xml(root)
+        parts = ET.SubElement(root, 'Parts')
+        for part in self.parts:
+            part.xml(parts)
+        return root
+
+
+class Model(object):
+    def __init__(self, bones, meshes, root_bone, tag):
+        self.bones = bones
+        self.meshes = meshes
+        self.root_bone = root_bone
+        self.tag = tag
+
+    def __str__(self):
+        return "Model b:{} m:{}".format(len(self.bones), len(self.meshes))
+
+    def xml(self, parent=None):
+        if parent is None:
+            root = ET.Element('Model')
+        else:
+            root = ET.SubElement(parent, 'Model')
+        if self.root_bone is not None:
+            root.set('rootBone', str(self.root_bone.index))
+        bones = ET.SubElement(root, 'Bones')
+        for bone in self.bones:
+            bone.xml(bones)
+        meshes = ET.SubElement(root, 'Meshes')
+        for mesh in self.meshes:
+            mesh.xml(meshes)
+        return root
 
 
 class Effect(object):
     def __init__(self, effect_data):
-        self.effect_data = effect_data
+        self._effect_data = effect_data
 
     def __str__(self):
-        return "Effect s:{}".format(len(self.effect_data))
+        return "Effect s:{}".format(len(self._effect_data))
+
+    @property
+    def effect_data(self):
+        self._effect_data = slice_data(self._effect_data)
+        return self._effect_data
+
+    @effect_data.setter
+    def effect_data(self, value):
+        self._effect_data = value
 
     def export(self, filename):
         out_dir = os.path.dirname(filename)
@@ -294,3 +482,16 @@ class PrimitiveType(Enum):
 class PrimitiveType4(Enum):
     __slots__ = ()
     enum_values = {0: 'TriangleList', 1: 'TriangleStrip', 2: 'LineList', 3: 'LineStrip'}
+
+
+class VertexElementFormat(Enum):
+    __slots__ = ()
+    enum_values = {0: 'Single', 1: 'Vector2', 2: 'Vector3', 3: 'Vector4', 4: 'Color', 5: 'Byte4', 6: 'Short2',
+                   7: 'Short4', 8: 'NormalizedShort2', 9: 'NormalizedShort4', 10: 'HalfVector2', 11: 'HalfVector4'}
+
+
+class VertexElementUsage(Enum):
+    __slots__ = ()
+    enum_values = {0: 'Position', 1: 'Color', 2: 'TextureCoordinate', 3: 'Normal', 4: 'Binormal', 5: 'Tangent',
+                   6: 'BlendIndices', 7: 'BlendWeight', 8: 'Depth', 9: 'Fog', 10: 'PointSize', 11: 'Sample',
+                   12: 'TessellateFactor'}
@@ -4,6 +4,7 @@ media types
 
 from __future__ import print_function
 
+from xnb_parse.binstream import slice_data
 from xnb_parse.file_formats.wav import write_wav
 from xnb_parse.file_formats.xml_utils import ET
 from xnb_parse.xna_types.xna_primitive import Enum
@@ -12,16 +13,26 @@ from xnb_parse.xna_types.xna_primitive import Enum
 class SoundEffect(object):
     def __init__(self, sound_format, sound_data, loop_start, loop_length, duration, needs_swap=False):
         self.sound_format = sound_format
-        self.sound_data = sound_data
+        # may be a BufferSlice, copied out on first access
+        self._sound_data = sound_data
         self.loop_start = loop_start
         self.loop_length = loop_length
         self.duration = duration
         self.needs_swap = needs_swap
 
     def __str__(self):
-        return "SoundEffect fs:{} ds:{} d:{}ms ls:{} ll:{}".format(len(self.sound_format), len(self.sound_data),
+        return "SoundEffect fs:{} ds:{} d:{}ms ls:{} ll:{}".format(len(self.sound_format), len(self._sound_data),
                                                                    self.duration, self.loop_start, self.loop_length)
 
+    @property
+    def sound_data(self):
+        self._sound_data = slice_data(self._sound_data)
+        return self._sound_data
+
+    @sound_data.setter
+    def sound_data(self, value):
+        self._sound_data = value
+
     def export(self, filename):
         write_wav(filename, self.sound_format, self.sound_data, self.needs_swap)
 
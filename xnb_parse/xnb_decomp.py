@@ -1,6 +1,5 @@
 """
 Decompress XNB files.
-Requires win32
 """
 
 from __future__ import print_function
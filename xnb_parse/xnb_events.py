@@ -0,0 +1,109 @@
+"""
+event stream parsing of XNB content
+"""
+
+from __future__ import print_function
+
+from xnb_parse.type_readers.xna_system import (ListReader, ArrayReader, DictionaryReader, NullableReader, EnumReader,
+                                               ReflectiveReader)
+
+
+# events are (event, name, value) tuples, value is the target type for START_OBJECT and END_OBJECT
+START_OBJECT = 'start'
+FIELD = 'field'
+END_OBJECT = 'end'
+# name of the shared resources that follow the asset
+SHARED_RESOURCE = 'shared_resource'
+
+_LIST_READERS = (ListReader.generic_reader_name, ArrayReader.generic_reader_name)
+_WRAPPER_READERS = (NullableReader.generic_reader_name, EnumReader.generic_reader_name,
+                    ReflectiveReader.generic_reader_name)
+
+
+def content_events(stream, expected_type=None, name=None):
+    """
+    events for the asset and shared resources of an XNBReader positioned after its type reader table, nothing but
+    the value being read is kept so memory use doesn't grow with the asset.
+
+    readers described by fields and the generic containers produce START_OBJECT, FIELD and END_OBJECT events, other
+    readers produce a FIELD with the object they read
+    """
+    shared_count = stream.read_7bit_encoded_int()
+    # readers that reference shared resources still register their fixups, the shared objects are sent as events
+    stream.shared_fixups = [[] for _ in range(shared_count)]
+    for event in object_events(stream, name, expected_type=expected_type):
+        yield event
+    for _ in range(shared_count):
+        for event in object_events(stream, SHARED_RESOURCE):
+            yield event
+    stream.shared_fixups = []
+
+
+def object_events(stream, name, expected_type_reader=None, type_params=None, expected_type=None):
+    """
+    events for an object read with read_object
+    """
+    type_reader = stream.read_object_reader(expected_type_reader, type_params, expected_type)
+    if type_reader is None:
+        # null object
+        yield FIELD, name, None
+        return
+    for event in reader_events(type_reader, name):
+        yield event
+
+
+def reader_events(reader, name):
+    """
+    events for a value read directly with reader
+    """
+    stream = reader.stream
+    generic_name = getattr(reader, 'generic_reader_name', None)
+    if generic_name in _LIST_READERS:
+        yield START_OBJECT, name, reader.target_type
+        element = reader.readers[0]
+        for _ in range(stream.read_int32()):
+            for event in _element_events(element, None):
+                yield event
+        yield END_OBJECT, name, reader.target_type
+        return
+    if generic_name == DictionaryReader.generic_reader_name:
+        yield START_OBJECT, name, reader.target_type
+        key, value = reader.readers
+        for _ in range(stream.read_int32()):
+            for event in _element_events(key, 'key'):
+                yield event
+            for event in _element_events(value, 'value'):
+                yield event
+        yield END_OBJECT, name, reader.target_type
+        return
+    if generic_name == NullableReader.generic_reader_name:
+        if stream.read_boolean():
+            for event in reader_events(reader.readers[0], name):
+                yield event
+        else:
+            yield FIELD, name, None
+        return
+    if generic_name in _WRAPPER_READERS:
+        for event in reader_events(reader.readers[0], name):
+            yield event
+        return
+    fields = reader.fields()
+    if fields is None:
+        yield FIELD, name, reader.read()
+        return
+    yield START_OBJECT, name, reader.target_type
+    for field in fields:
+        field_name, kind = field[0], field[1]
+        if isinstance(kind, str):
+            yield FIELD, field_name, getattr(stream, 'read_' + kind)()
+        else:
+            for event in object_events(stream, field_name, kind, field[2] if len(field) > 2 else None):
+                yield event
+    yield END_OBJECT, name, reader.target_type
+
+
+def _element_events(reader, name):
+    # container elements are read the way the container readers read them
+    if reader.is_value_type:
+        return reader_events(reader, name)
+    return object_events(reader.stream, name, reader)
@@ -5,17 +5,21 @@ XNB parser
 from __future__ import print_function
 
 import os
+import struct
 
 import sys
+import threading
+from collections import namedtuple
 
-from xnb_parse.binstream import BinaryStream
+from xnb_parse.binstream import BinaryStream, WindowedBinaryStream, write_file
 from xnb_parse.type_reader_manager import TypeReaderManager
-from xnb_parse.xna_native import decompress
 from xnb_parse.type_reader import ReaderError, generic_reader_type
 from xnb_parse.type_readers.xna_system import EnumReader
+from xnb_parse.xnb_events import content_events
 from xnb_parse.xna_types.xna_math import Color, Vector2, Vector3, Vector4, Quaternion, Matrix
 from xnb_parse.xna_types.xna_system import XNAList, ExternalReference
 from xnb_parse.file_formats.xml_utils import output_xml
+from xnb_parse.file_formats import lzx, lz4
 
 
 XNB_EXTENSION = '.xnb'
@@ -23,66 +27,153 @@ XNB_SIGNATURE = b'XNB'
 PLATFORM_WINDOWS = b'w'
 PLATFORM_XBOX = b'x'
 PLATFORM_MOBILE = b'm'
+# MonoGame target platforms
+PLATFORM_IOS = b'i'
+PLATFORM_ANDROID = b'a'
+PLATFORM_DESKTOPGL = b'd'
+PLATFORM_MACOSX = b'X'
+PLATFORM_WINDOWS_STORE = b'W'
+PLATFORM_NATIVE_CLIENT = b'n'
+PLATFORM_PLAYSTATION_MOBILE = b'u'
+PLATFORM_WINDOWS_PHONE_8 = b'M'
+PLATFORM_RASPBERRY_PI = b'r'
+PLATFORM_PLAYSTATION_4 = b'p'
+PLATFORM_PSVITA = b'v'
+PLATFORM_XBOX_ONE = b'O'
+PLATFORM_SWITCH = b'S'
+PLATFORM_STADIA = b'G'
+PLATFORM_WEB = b'b'
 PROFILE_REACH = 0
 PROFILE_HIDEF = 1
 VERSION_30 = 3
 VERSION_31 = 4
 VERSION_40 = 5
-XNB_PLATFORMS = {PLATFORM_WINDOWS: 'W', PLATFORM_XBOX: 'X', PLATFORM_MOBILE: 'M'}
+COMPRESSION_LZX = 'lzx'
+COMPRESSION_LZ4 = 'lz4'
+XNB_PLATFORMS = {PLATFORM_WINDOWS: 'W', PLATFORM_XBOX: 'X', PLATFORM_MOBILE: 'M', PLATFORM_IOS: 'iOS',
+                 PLATFORM_ANDROID: 'Android', PLATFORM_DESKTOPGL: 'DesktopGL', PLATFORM_MACOSX: 'MacOSX',
+                 PLATFORM_WINDOWS_STORE: 'WindowsStore', PLATFORM_NATIVE_CLIENT: 'NativeClient',
+                 PLATFORM_PLAYSTATION_MOBILE: 'PlayStationMobile', PLATFORM_WINDOWS_PHONE_8: 'WindowsPhone8',
+                 PLATFORM_RASPBERRY_PI: 'RaspberryPi', PLATFORM_PLAYSTATION_4: 'PS4', PLATFORM_PSVITA: 'PSVita',
+                 PLATFORM_XBOX_ONE: 'XboxOne', PLATFORM_SWITCH: 'Switch', PLATFORM_STADIA: 'Stadia',
+                 PLATFORM_WEB: 'Web'}
 XNB_VERSIONS = {VERSION_30: '30', VERSION_31: '31', VERSION_40: '40'}
 XNB_PROFILES = {PROFILE_REACH: 'r', PROFILE_HIDEF: 'h'}
+# the header and the decompressed size of compressed XNBs, all content_size needs
+XNB_HEAD_SIZE = 14
 
-_PROFILE_MASK = 0x7f
+_PROFILE_MASK = 0x3f
 _COMPRESS_MASK = 0x80
+_COMPRESS_LZ4_MASK = 0x40
 _XNB_HEADER = '3s c B B I'
+# small window for scan_header, reader tables are usually only a few hundred bytes
+_SCAN_READ_AHEAD = 0x400
+_MANAGER_LOCK = threading.Lock()
+
+XNBHeader = namedtuple('XNBHeader', ['platform', 'version', 'profile', 'compressed', 'size', 'uncompressed_size',
+                                     'type_readers'])
+
+
+class ParsePlan(object):
+    """
+    initialised type readers for one reader table, reused by every file with the same table. a plan is only
+    used by one stream at a time
+    """
+
+    def __init__(self, key, type_readers, compiled=False):
+        self.key = key
+        self.type_readers = type_readers
+        self.compiled = compiled
+        # every reader instance including generic arguments, so they can all be pointed at a new stream
+        self.readers = []
+        pending = list(type_readers)
+        while pending:
+            reader = pending.pop()
+            self.readers.append(reader)
+            if reader.is_generic_type and reader.readers:
+                pending.extend(reader.readers)
+        # target types each table entry can be read as, from the reader and its parent classes
+        self.compatible_types = [frozenset(cls.target_type for cls in reader.__class__.__mro__
+                                           if getattr(cls, 'target_type', None) is not None)
+                                 for reader in type_readers]
+
+    def compile(self):
+        # avoid circular import
+        from xnb_parse.reader_compiler import compile_readers
+        compile_readers(self.readers)
+
+    def bind(self, stream):
+        for reader in self.readers:
+            reader.stream = stream
 
 
 class XNBReader(BinaryStream):
     _type_reader_manager = None
+    # idle parse plans keyed by platform, version and reader table
+    _parse_plans = {}
+    # expected target types keyed by expected reader class and generic argument types
+    _expected_types = {}
+
+    @staticmethod
+    def get_type_reader_manager():
+        """
+        TypeReaderManager shared by all readers
+        """
+        if XNBReader._type_reader_manager is None:
+            with _MANAGER_LOCK:
+                if XNBReader._type_reader_manager is None:
+                    XNBReader._type_reader_manager = TypeReaderManager()
+        return XNBReader._type_reader_manager
 
     def __init__(self, data, file_platform=PLATFORM_WINDOWS, file_version=VERSION_40, graphics_profile=PROFILE_REACH,
-                 compressed=False, parse=True, expected_type=None):
+                 compressed=False, parse=True, expected_type=None, compiled=False, fields=None):
         BinaryStream.__init__(self, data=data)
         del data
-        if XNBReader._type_reader_manager is None:
-            XNBReader._type_reader_manager = TypeReaderManager()
-        self.type_reader_manager = XNBReader._type_reader_manager
+        self.type_reader_manager = XNBReader.get_type_reader_manager()
         self.file_platform = file_platform
         self.file_version = file_version
         self.graphics_profile = graphics_profile
         self.compressed = compressed
+        self.compiled = compiled
         self.needs_swap = self.file_platform == PLATFORM_XBOX
         self.type_readers = []
+        self.compatible_types = []
         self.shared_objects = []
+        self.shared_fixups = []
         self.content = None
         if parse:
-            self.parse(expected_type=expected_type)
+            self.parse(expected_type=expected_type, fields=fields)
 
     def __str__(self):
         return 'XNB {}{}{} s:{}'.format(XNB_PLATFORMS[self.file_platform], XNB_VERSIONS[self.file_version],
                                         XNB_PROFILES[self.graphics_profile], self.length())
 
-    def parse(self, expected_type=None, verbose=False):
+    def parse(self, expected_type=None, verbose=False, fields=None):
+        """
+        parse the asset, with fields only the named fields of the asset are read into a dict and the rest is skipped
+        """
         if self.content is not None:
             return self.content
 
-        reader_count = self.read_7bit_encoded_int()
-        for _ in range(reader_count):
-            reader_name = self.read_string()
-            reader_version = self.read_int32()
-            reader = self.get_type_reader(reader_name, reader_version)
-            self.type_readers.append(reader)
+        plan = self._read_parse_plan()
+        try:
+            return self._parse_content(expected_type, verbose, fields)
+        finally:
+            self.release_parse_plan(plan)
 
+    def _parse_content(self, expected_type, verbose, fields):
         if verbose:
             print("Type: {!s}".format(self.type_readers[0]))
 
-        for reader in self.type_readers:
-            reader.init_reader(self.file_platform, self.file_version)
-
         shared_count = self.read_7bit_encoded_int()
+        # fixups registered by read_shared_resource, shared objects come after the asset
+        self.shared_fixups = [[] for _ in range(shared_count)]
 
-        if shared_count:
-            raise ReaderError("Shared resources present")
+        if fields is not None:
+            # shared resources and anything after the last field are never looked at
+            self.content = self.read_object_fields(fields, expected_type=expected_type)
+            self.shared_fixups = []
+            return self.content
 
         self.content = self.read_object(expected_type=expected_type)
         if verbose:
@@ -94,11 +185,60 @@ class XNBReader(BinaryStream):
             if verbose:
                 print("Shared resource {}: {!s}".format(i, obj))
 
+        # every reference gets the same object, each shared resource is only parsed once
+        for obj, fixups in zip(self.shared_objects, self.shared_fixups):
+            for fixup in fixups:
+                fixup(obj)
+        self.shared_fixups = []
+
         remaining = self.read()
         if len(remaining):
             print("remaining bytes: {}".format(len(remaining)), file=sys.stderr)
         return self.content
 
+    def iter_events(self, expected_type=None):
+        """
+        parse the content as a stream of (event, name, value) events instead of building it, see xnb_events
+        """
+        plan = self._read_parse_plan()
+        try:
+            for event in content_events(self, expected_type=expected_type):
+                yield event
+        finally:
+            self.release_parse_plan(plan)
+
+    def _read_parse_plan(self):
+        plan = self.get_parse_plan(self._read_type_reader_table(self))
+        self.type_readers = plan.type_readers
+        self.compatible_types = plan.compatible_types
+        return plan
+
+    def get_parse_plan(self, reader_table):
+        """
+        take an idle plan for the reader table, or build one. the plan's readers are bound to this stream until it
+        is given back with release_parse_plan, so each thread parses with its own reader instances
+        """
+        key = (self.file_platform, self.file_version, self.compiled, tuple(reader_table))
+        idle = XNBReader._parse_plans.setdefault(key, [])
+        try:
+            plan = idle.pop()
+        except IndexError:
+            type_readers = [self.get_type_reader(reader_name, reader_version)
+                            for reader_name, reader_version in reader_table]
+            for reader in type_readers:
+                reader.init_reader(self.file_platform, self.file_version)
+            plan = ParsePlan(key, type_readers, self.compiled)
+            if self.compiled:
+                plan.compile()
+        plan.bind(self)
+        return plan
+
+    @staticmethod
+    def release_parse_plan(plan):
+        # unbind so an idle plan doesn't keep the last file's buffer alive
+        plan.bind(None)
+        XNBReader._parse_plans[plan.key].append(plan)
+
     def get_type_reader(self, type_reader, version=None):
         reader_type_class = self.type_reader_manager.get_type_reader(type_reader)
         return reader_type_class(self, version)
@@ -108,11 +248,94 @@ class XNBReader(BinaryStream):
         return reader_type_class(self, version)
 
     @classmethod
-    def load(cls, data=None, filename=None, parse=True, expected_type=None):
+    def load(cls, data=None, filename=None, parse=True, expected_type=None, compiled=False, fields=None):
         if filename is not None:
             filename = os.path.normpath(filename)
         stream = BinaryStream(data=data, filename=filename)
         del data
+        (platform, version, profile, compressed, size) = cls._read_header(stream)
+        if compressed:
+            uncomp = stream.read_int32()
+            size -= 4
+            content_comp = stream.read_view(size)
+            if compressed == COMPRESSION_LZ4:
+                content = lz4.decompress(content_comp, uncomp)
+            else:
+                content = lzx.decompress(content_comp, uncomp)
+        else:
+            content = stream.read_view(size)
+        return cls(content, platform, version, profile, compressed, parse=parse, expected_type=expected_type,
+                   compiled=compiled, fields=fields)
+
+    @classmethod
+    def scan_header(cls, data=None, filename=None):
+        """
+        read the XNB header and type reader table without decompressing or parsing the rest of the content
+        """
+        if data is None and filename is not None:
+            stream = WindowedBinaryStream(filename=os.path.normpath(filename), read_ahead=_SCAN_READ_AHEAD)
+        else:
+            stream = BinaryStream(data=data)
+        del data
+        try:
+            (platform, version, profile, compressed, size) = cls._read_header(stream)
+            file_size = stream.length()
+            if compressed:
+                uncomp = stream.read_int32()
+                size -= 4
+                if compressed == COMPRESSION_LZ4:
+                    frames = lz4.iter_decompress(stream, size, uncomp)
+                else:
+                    frames = lzx.iter_decompress(stream, size, uncomp)
+                type_readers = cls._scan_type_readers(frames)
+            else:
+                uncomp = size
+                try:
+                    type_readers = cls._read_type_reader_table(stream)
+                except struct.error:
+                    raise ReaderError("Type reader table truncated")
+        finally:
+            if isinstance(stream, WindowedBinaryStream):
+                stream.close()
+        return XNBHeader(platform, version, profile, compressed, file_size, uncomp, type_readers)
+
+    @classmethod
+    def _scan_type_readers(cls, frames):
+        content = bytearray()
+        for frame in frames:
+            content += frame
+            try:
+                return cls._read_type_reader_table(BinaryStream(data=content))
+            except struct.error:
+                pass
+        raise ReaderError("Type reader table truncated")
+
+    @staticmethod
+    def _read_type_reader_table(stream):
+        type_readers = []
+        reader_count = stream.read_7bit_encoded_int()
+        for _ in range(reader_count):
+            name_size = stream.read_7bit_encoded_int()
+            raw_name = stream.read(name_size)
+            if len(raw_name) != name_size:
+                raise struct.error("type reader name past end of stream")
+            reader_version = stream.read_int32()
+            type_readers.append((raw_name.decode('utf-8'), reader_version))
+        return type_readers
+
+    @classmethod
+    def content_size(cls, head):
+        """
+        size of the content once decompressed, from the first XNB_HEAD_SIZE bytes of an XNB
+        """
+        stream = BinaryStream(data=head)
+        (_, _, _, compressed, size) = cls._read_header(stream, check_size=False)
+        if compressed:
+            return stream.read_int32()
+        return size
+
+    @staticmethod
+    def _read_header(stream, check_size=True):
         (sig, platform, version, attribs, size) = stream.unpack(_XNB_HEADER)
         if sig != XNB_SIGNATURE:
             raise ReaderError("bad sig: '{!r}'".format(sig))
@@ -121,7 +344,7 @@ class XNBReader(BinaryStream):
         if version not in XNB_VERSIONS:
             raise ReaderError("bad version: {}".format(version))
         stream_length = stream.length()
-        if stream_length != size:
+        if check_size and stream_length != size:
             raise ReaderError("bad size: {} != {}".format(stream_length, size))
         compressed = False
         profile = 0
@@ -130,18 +353,16 @@ class XNBReader(BinaryStream):
             if profile not in XNB_PROFILES:
                 raise ReaderError("bad profile: {}".format(profile))
         if version >= VERSION_30:
-            compressed = bool(attribs & _COMPRESS_MASK)
+            if attribs & _COMPRESS_MASK and attribs & _COMPRESS_LZ4_MASK:
+                raise ReaderError("bad compression flags: {:#x}".format(attribs))
+            elif attribs & _COMPRESS_MASK:
+                compressed = COMPRESSION_LZX
+            elif attribs & _COMPRESS_LZ4_MASK:
+                compressed = COMPRESSION_LZ4
             size -= stream.calc_size(_XNB_HEADER)
-        if compressed:
-            uncomp = stream.read_int32()
-            size -= 4
-            content_comp = stream.read(size)
-            content = decompress(content_comp, uncomp)
-        else:
-            content = stream.read(size)
-        return cls(content, platform, version, profile, compressed, parse=parse, expected_type=expected_type)
+        return platform, version, profile, compressed, size
 
-    def save(self, filename=None, compress=False):
+    def save(self, filename=None, compress=False, level=None):
         if self.file_platform not in XNB_PLATFORMS:
             raise ReaderError("bad platform: '{!r}'".format(self.file_platform))
         if self.file_version not in XNB_VERSIONS:
@@ -151,30 +372,68 @@ class XNBReader(BinaryStream):
             if self.graphics_profile not in XNB_PROFILES:
                 raise ReaderError("bad profile: {}".format(self.graphics_profile))
             attribs |= self.graphics_profile & _PROFILE_MASK
-        do_compress = False
-        if self.file_version >= VERSION_30:
-            if compress:
-                do_compress = True
+        codec = None
+        if self.file_version >= VERSION_30 and compress:
+            if compress is True or compress == COMPRESSION_LZX:
+                codec = COMPRESSION_LZX
                 attribs |= _COMPRESS_MASK
-        stream = BinaryStream()
-        if do_compress:
-            raise ReaderError("Recompression not supported")
+            elif compress == COMPRESSION_LZ4:
+                codec = COMPRESSION_LZ4
+                attribs |= _COMPRESS_LZ4_MASK
+            else:
+                raise ReaderError("bad compression: '{}'".format(compress))
+        if codec is None:
+            data = self.getbuffer()
         else:
             data = self.getvalue()
-            size = len(data) + stream.calc_size(_XNB_HEADER)
-        stream.pack(_XNB_HEADER, XNB_SIGNATURE, self.file_platform, self.file_version, attribs, size)
-        stream.write(data)
         if filename is not None:
             filename = os.path.normpath(filename)
             dirname = os.path.dirname(filename)
             if not os.path.isdir(dirname):
-                os.makedirs(dirname)
+                try:
+                    os.makedirs(dirname)
+                except OSError:
+                    # created by another process since the check
+                    if not os.path.isdir(dirname):
+                        raise
             if not filename.endswith(XNB_EXTENSION):
                 filename += XNB_EXTENSION
-            stream.write_file(filename)
+            write_file(filename, lambda file_handle: self._write_xnb(file_handle, data, attribs, codec, level))
         else:
+            stream = BinaryStream()
+            self._write_xnb(stream, data, attribs, codec, level)
             return stream.getvalue()
 
+    def _write_xnb(self, file_handle, data, attribs, codec, level):
+        header = BinaryStream()
+        start = file_handle.tell()
+        if codec is None:
+            size = len(data) + header.calc_size(_XNB_HEADER)
+            header.pack(_XNB_HEADER, XNB_SIGNATURE, self.file_platform, self.file_version, attribs, size)
+            file_handle.write(header.getvalue())
+            file_handle.write(data)
+            return
+        # compressed size is not known until all frames are written, patch the header afterwards
+        header.pack(_XNB_HEADER, XNB_SIGNATURE, self.file_platform, self.file_version, attribs, 0)
+        header.write_int32(len(data))
+        file_handle.write(header.getvalue())
+        if codec == COMPRESSION_LZ4:
+            if level is None:
+                level = lz4.LZ4_DEFAULT_LEVEL
+            frames = lz4.compress_frames(data, level)
+        else:
+            if level is None:
+                level = lzx.LZX_DEFAULT_LEVEL
+            frames = lzx.compress_frames(data, level)
+        for frame in frames:
+            file_handle.write(frame)
+        end = file_handle.tell()
+        header.seek(0)
+        header.pack(_XNB_HEADER, XNB_SIGNATURE, self.file_platform, self.file_version, attribs, end - start)
+        file_handle.seek(start)
+        file_handle.write(header.getvalue())
+        file_handle.seek(end)
+
     def read_object(self, expected_type_reader=None, type_params=None, expected_type=None):
         type_id = self.read_7bit_encoded_int()
         if type_id == 0:
@@ -185,28 +444,85 @@ class XNBReader(BinaryStream):
         except IndexError:
             raise ReaderError("type id out of range: {} > {}".format(type_id, len(self.type_readers)))
         if expected_type_reader is not None:
-            try:
-                if expected_type_reader.is_generic_type and expected_type_reader.target_type is None:
-                    expected_type = generic_reader_type(expected_type_reader, type_params)
-                elif expected_type_reader.is_enum_type:
-                    expected_type = generic_reader_type(EnumReader, [expected_type_reader.target_type])
-                else:
-                    expected_type = expected_type_reader.target_type
-            except AttributeError:
-                raise ReaderError("bad expected_type_reader: '{}'".format(expected_type_reader))
-        if expected_type is not None:
-            if expected_type != 'System.Object':
-                if type_reader.target_type != expected_type:
-                    # check parent type readers
-                    for cls in type_reader.__class__.__mro__:
-                        if hasattr(cls, 'target_type'):
-                            if cls.target_type == expected_type:
-                                break
-                    else:
-                        raise ReaderError("Unexpected type: '{}' != '{}'".format(type_reader.target_type,
-                                                                                 expected_type))
+            expected_type = self._expected_type(expected_type_reader, type_params)
+        if expected_type is not None and expected_type != 'System.Object':
+            if expected_type not in self.compatible_types[type_id - 1]:
+                raise ReaderError("Unexpected type: '{}' != '{}'".format(type_reader.target_type, expected_type))
         return type_reader.read()
 
+    def skip_object(self, expected_type_reader=None, type_params=None, expected_type=None):
+        type_reader = self.read_object_reader(expected_type_reader, type_params, expected_type)
+        if type_reader is not None:
+            type_reader.skip()
+
+    def read_object_fields(self, names, expected_type_reader=None, type_params=None, expected_type=None):
+        """
+        read only the named fields of an object into a dict, None for a null object
+        """
+        type_reader = self.read_object_reader(expected_type_reader, type_params, expected_type)
+        if type_reader is None:
+            return None
+        return type_reader.read_fields(names)
+
+    def read_object_reader(self, expected_type_reader, type_params, expected_type):
+        """
+        read a type id and check it like read_object, returns the type reader or None for a null object
+        """
+        type_id = self.read_7bit_encoded_int()
+        if type_id == 0:
+            # null object
+            return None
+        try:
+            type_reader = self.type_readers[type_id - 1]
+        except IndexError:
+            raise ReaderError("type id out of range: {} > {}".format(type_id, len(self.type_readers)))
+        if expected_type_reader is not None:
+            expected_type = self._expected_type(expected_type_reader, type_params)
+        if expected_type is not None and expected_type != 'System.Object':
+            if expected_type not in self.compatible_types[type_id - 1]:
+                raise ReaderError("Unexpected type: '{}' != '{}'".format(type_reader.target_type, expected_type))
+        return type_reader
+
+    @staticmethod
+    def _expected_type(expected_type_reader, type_params=None):
+        # key on the reader class, instances from different plans share the result
+        if isinstance(expected_type_reader, type):
+            reader_class = expected_type_reader
+        else:
+            reader_class = expected_type_reader.__class__
+        if type_params:
+            key = (reader_class, tuple(getattr(arg, 'target_type', arg) for arg in type_params))
+        else:
+            key = (reader_class, ())
+        try:
+            return XNBReader._expected_types[key]
+        except KeyError:
+            pass
+        try:
+            if expected_type_reader.is_generic_type and expected_type_reader.target_type is None:
+                expected_type = generic_reader_type(expected_type_reader, type_params)
+            elif expected_type_reader.is_enum_type:
+                expected_type = generic_reader_type(EnumReader, [expected_type_reader.target_type])
+            else:
+                expected_type = expected_type_reader.target_type
+        except AttributeError:
+            raise ReaderError("bad expected_type_reader: '{}'".format(expected_type_reader))
+        XNBReader._expected_types[key] = expected_type
+        return expected_type
+
+    def read_shared_resource(self, fixup):
+        """
+        read a shared resource id, fixup is called with the shared object once all shared resources are read
+        """
+        shared_id = self.read_7bit_encoded_int()
+        if shared_id == 0:
+            # null resource
+            return
+        try:
+            self.shared_fixups[shared_id - 1].append(fixup)
+        except IndexError:
+            raise ReaderError("shared resource id out of range: {} > {}".format(shared_id, len(self.shared_fixups)))
+
     def read_value_or_object(self, expected_type):
         if expected_type.is_value_type:
             type_reader = self.get_type_reader(expected_type)
@@ -214,6 +530,12 @@ class XNBReader(BinaryStream):
         else:
             return self.read_object(expected_type=expected_type)
 
+    def skip_value_or_object(self, expected_type):
+        if expected_type.is_value_type:
+            self.get_type_reader(expected_type).skip()
+        else:
+            self.skip_object(expected_type=expected_type)
+
     def read_type_id(self):
         type_id = self.read_7bit_encoded_int()
         if type_id == 0:
@@ -245,6 +567,9 @@ class XNBReader(BinaryStream):
         filename = self.read_string()
         return ExternalReference(filename, expected_type)
 
+    def skip_external_reference(self):
+        self.skip_string()
+
     def read_matrix(self):
         return Matrix(XNAList(self.unpack('16f')))
 